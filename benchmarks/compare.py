@@ -0,0 +1,85 @@
+"""Compares the results of two runs of run.py, for example of two commits,
+and reports the benchmarks whose time or peak memory grew by more than a
+threshold. The exit status is 1 if there is any such regression.
+
+    python benchmarks/compare.py before.json after.json --threshold 1.2
+"""
+
+import argparse
+import json
+import sys
+
+
+def load_results(path):
+    """Loads the results of a run, indexed by benchmark and data.
+
+    :param path: The path of the JSON file written by run.py.
+    :type path: String
+    :return: The measured results.
+    :rtype: dict
+    """
+    with open(path) as file:
+        results = json.load(file)['results']
+    return {
+        (result['benchmark'], result['rows'], result['columns'],
+         result['missing_rate'], result['pattern']): result
+        for result in results if result['skipped'] is None}
+
+
+def get_ratio(before, after, key):
+    """Computes the ratio of a measurement after and before.
+
+    :param before: The result before.
+    :type before: dict
+    :param after: The result after.
+    :type after: dict
+    :param key: The measurement, 'time' or 'peak_memory'.
+    :type key: String
+    :return: The ratio, or None if it cannot be computed.
+    :rtype: float or None
+    """
+    if before[key] is None or after[key] is None or before[key] == 0:
+        return None
+    return after[key] / before[key]
+
+
+def main(argv=None):
+    """Compares two runs and prints the ratios of their measurements.
+
+    :param argv: The command line arguments. If None, those of the process
+        are used.
+    :type argv: list, optional
+    :return: The exit status.
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('before', help='results of the reference run')
+    parser.add_argument('after', help='results of the run to compare')
+    parser.add_argument(
+        '--threshold', type=float, default=1.2,
+        help='ratio above which a measurement is a regression')
+    args = parser.parse_args(argv)
+    before = load_results(args.before)
+    after = load_results(args.after)
+    regressions = 0
+    print('{:>28} {:>10} {:>8} {:>8}'.format(
+        'benchmark', 'rows', 'time', 'memory'))
+    for key in sorted(set(before) & set(after)):
+        ratios = [
+            get_ratio(before[key], after[key], measurement)
+            for measurement in ['time', 'peak_memory']]
+        regression = any(
+            ratio is not None and ratio > args.threshold for ratio in ratios)
+        regressions += regression
+        print('{:>28} {:>10} {:>8} {:>8}{}'.format(
+            key[0], key[1], *[
+                'n/a' if ratio is None else '{:.2f}x'.format(ratio)
+                for ratio in ratios],
+            '  REGRESSION' if regression else ''))
+    print(str(regressions) + ' regression(s) above ' + str(args.threshold)
+          + 'x')
+    return 1 if regressions > 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
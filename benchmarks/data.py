@@ -0,0 +1,103 @@
+"""Generators of synthetic data with missing values for the benchmarks."""
+
+import numpy as np
+import pandas as pd
+
+
+# First timestamp of the hourly index of seasonal data, as early as pandas
+# allows so that the index can be as long as possible:
+SEASONAL_START = pd.Timestamp('1680-01-01')
+
+# Levels of the categorical columns:
+LEVELS = ['a', 'b', 'c', 'd']
+
+
+def get_max_seasonal_rows():
+    """Computes the maximum number of rows of seasonal data, whose hourly
+    index has to fit in the range of pandas timestamps.
+
+    :return: The maximum number of rows.
+    :rtype: int
+    """
+    return (pd.Timestamp.max.value - SEASONAL_START.value) // (
+        pd.Timedelta(hours=1).value)
+
+
+def generate_data(
+        rows, columns=10, missing_rate=0.1, pattern='MCAR',
+        categorical_share=0., seasonal=False, random_state=0):
+    """Generates a data frame with missing values. The numeric columns x0,
+    x1, ... depend linearly on a common latent variable, so that they can
+    be predicted from each other, and the categorical columns c0, c1, ...
+    are that variable plus noise, cut into four levels. Column x0 is always
+    complete. If the pattern is 'MCAR', each cell of the other columns is
+    missing with probability missing_rate. If it is 'MAR', the probability
+    grows linearly with the rank of x0, from 0 to twice missing_rate, so
+    that the rate over the whole column is still missing_rate. If seasonal
+    is True, the data has an hourly DatetimeIndex and the numeric columns
+    are positive series with a daily period.
+
+    :param rows: The number of rows.
+    :type rows: int
+    :param columns: The number of columns.
+    :type columns: int, default 10
+    :param missing_rate: The share of missing values in each column except
+        x0. It has to be at most 0.5 if pattern='MAR'.
+    :type missing_rate: scalar, default 0.1
+    :param pattern: The pattern of the missing values.
+    :type pattern: {'MCAR', 'MAR'}, default 'MCAR'
+    :param categorical_share: The share of the columns that are categorical.
+        At least x0 is numeric.
+    :type categorical_share: scalar, default 0
+    :param seasonal: Whether to generate seasonal time series.
+    :type seasonal: bool, default False
+    :param random_state: The seed of the random number generator.
+    :type random_state: int, default 0
+    :return: The data.
+    :rtype: pandas.DataFrame
+    :raises: ValueError
+    """
+    # Check the arguments:
+    if pattern not in ['MCAR', 'MAR']:
+        raise ValueError(pattern + ' is not a supported pattern.')
+    if pattern == 'MAR' and missing_rate > .5:
+        raise ValueError(
+            'The missing rate of the MAR pattern has to be at most 0.5.')
+    if seasonal and rows > get_max_seasonal_rows():
+        raise ValueError(
+            'Seasonal data can have at most ' + str(get_max_seasonal_rows())
+            + ' rows.')
+    rng = np.random.default_rng(random_state)
+    num_categorical = min(int(round(columns * categorical_share)), columns - 1)
+    num_numeric = columns - num_categorical
+    # Latent variable on which all columns depend:
+    latent = rng.standard_normal(rows)
+    data = {}
+    if seasonal:
+        index = pd.date_range(SEASONAL_START, periods=rows, freq='H')
+        season = np.sin(2 * np.pi * np.arange(rows) / 24)
+        trend = np.linspace(0, 10, rows)
+        for j in range(num_numeric):
+            data['x' + str(j)] = (
+                100 + trend + 10 * (1 + j % 3) * season + latent
+                + rng.standard_normal(rows))
+    else:
+        index = pd.RangeIndex(rows)
+        for j in range(num_numeric):
+            data['x' + str(j)] = (
+                (1 + j % 3) * latent + rng.standard_normal(rows))
+    for j in range(num_categorical):
+        codes = np.digitize(
+            latent + rng.standard_normal(rows), [-1, 0, 1]).astype(np.int8)
+        data['c' + str(j)] = pd.Categorical.from_codes(codes, LEVELS)
+    res = pd.DataFrame(data, index=index)
+    # Probability of each row to be missing in each column except x0:
+    if pattern == 'MCAR':
+        probability = np.full(rows, missing_rate)
+    else:
+        ranks = res['x0'].rank(method='first').to_numpy()
+        probability = 2 * missing_rate * (ranks - 1) / max(rows - 1, 1)
+    for column in res.columns[1:]:
+        missing = rng.random(rows) < probability
+        res.loc[missing, column] = np.nan
+    return res
@@ -0,0 +1,270 @@
+"""Measures the time and the peak memory of the public functions of imputena
+on synthetic data of growing size, and writes the results to a JSON file
+that can be compared with the results of another commit by compare.py.
+
+Run it from the project root directory, for example:
+
+    python benchmarks/run.py --rows 1000 100000 --output before.json
+
+Each benchmark is first timed, as the best of --repeat runs, and then run
+once more under tracemalloc to measure the peak memory it allocates. The
+generation of the data is not measured. Benchmarks whose cost grows faster
+than linearly are skipped above a number of rows (see BENCHMARKS), unless
+--no-limits is passed.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+# Import the package from the project root, not from an installed copy:
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+import imputena  # noqa: E402
+from data import generate_data, get_max_seasonal_rows  # noqa: E402
+
+
+def run_impute_chunked(data):
+    """Runs impute_chunked() on the data written to a CSV file. The file is
+    written by prepare_impute_chunked(), outside of the measurement.
+
+    :param data: The path of the CSV file.
+    :type data: String
+    """
+    destination = data[:-len('.csv')] + '_imputed.csv'
+    imputena.impute_chunked(data, destination, method='mean')
+
+
+def prepare_impute_chunked(data, directory):
+    """Writes the data to a CSV file in a directory.
+
+    :param data: The data.
+    :type data: pandas.DataFrame
+    :param directory: The directory.
+    :type directory: String
+    :return: The path of the file.
+    :rtype: String
+    """
+    path = os.path.join(directory, 'data.csv')
+    data.to_csv(path, index=False)
+    return path
+
+
+# Benchmarks: the kind of data on which each one runs ('numeric', 'mixed'
+# or 'seasonal'), the function that runs it on the data, and the maximum
+# number of rows on which it is run (None for no limit). The recommendation
+# functions are called without a missingness profile:
+BENCHMARKS = {
+    'delete_listwise': (
+        'mixed', lambda data: imputena.delete_listwise(data), None),
+    'delete_pairwise': (
+        'mixed', lambda data: imputena.delete_pairwise(data, ['x1']), None),
+    'delete_columns': (
+        'mixed', lambda data: imputena.delete_columns(data), None),
+    'locf': ('mixed', lambda data: imputena.locf(data), None),
+    'nocb': ('mixed', lambda data: imputena.nocb(data), None),
+    'random_sample_imputation': (
+        'mixed', lambda data: imputena.random_sample_imputation(
+            data, random_state=0), None),
+    'random_hot_deck_imputation': (
+        'mixed', lambda data: imputena.random_hot_deck_imputation(
+            data, 'x1', ['c0'], random_state=0), None),
+    'most_frequent': (
+        'mixed', lambda data: imputena.most_frequent(data), None),
+    'mean_substitution': (
+        'numeric', lambda data: imputena.mean_substitution(data), None),
+    'median_substitution': (
+        'numeric', lambda data: imputena.mean_substitution(
+            data, method='median'), None),
+    'constant_value_imputation': (
+        'numeric', lambda data: imputena.constant_value_imputation(data),
+        None),
+    'random_value_imputation': (
+        'numeric', lambda data: imputena.random_value_imputation(
+            data, random_state=0), None),
+    'interpolation': (
+        'numeric', lambda data: imputena.interpolation(data), None),
+    'seasonal_interpolation': (
+        'seasonal', lambda data: imputena.seasonal_interpolation(data),
+        None),
+    'linear_regression': (
+        'numeric', lambda data: imputena.linear_regression(data), 1000000),
+    'linear_regression_gram': (
+        'numeric', lambda data: imputena.linear_regression(
+            data, solver='gram'), None),
+    'logistic_regression': (
+        'mixed', lambda data: imputena.logistic_regression(
+            data, 'c0', ['x0']), 1000000),
+    'knn': ('numeric', lambda data: imputena.knn(data), 10000),
+    'knn_columns': (
+        'numeric', lambda data: imputena.knn(data, columns=['x1']), 50000),
+    'srmi': (
+        'numeric', lambda data: imputena.srmi(data, random_state=0),
+        1000000),
+    'mice': (
+        'numeric', lambda data: imputena.mice(data, random_state=0), 100000),
+    'get_applicable_methods': (
+        'mixed', lambda data: imputena.get_applicable_methods(data), None),
+    'recommend_method': (
+        'mixed', lambda data: imputena.recommend_method(data), None),
+    'recommend_method_column': (
+        'mixed', lambda data: imputena.recommend_method(data, 'x1'), None),
+    'impute_by_recommended': (
+        'mixed', lambda data: imputena.impute_by_recommended(data), 1000000),
+    'impute_chunked': ('numeric', run_impute_chunked, None),
+    'MeanImputer': (
+        'numeric', lambda data: imputena.MeanImputer().fit_transform(data),
+        None),
+    'LinearRegressionImputer': (
+        'numeric',
+        lambda data: imputena.LinearRegressionImputer().fit_transform(data),
+        None),
+}
+
+
+def measure(function, data, repeat, memory):
+    """Measures the time and the peak memory of a function on the data.
+
+    :param function: The function.
+    :type function: callable
+    :param data: The data, copied before each run.
+    :param repeat: The number of timed runs.
+    :type repeat: int
+    :param memory: Whether to measure the peak memory.
+    :type memory: bool
+    :return: The best time in seconds and the peak memory in bytes, or
+        None if not measured.
+    :rtype: (float, int or None)
+    """
+    times = []
+    for _ in range(repeat):
+        run_data = data.copy() if isinstance(data, pd.DataFrame) else data
+        start = time.perf_counter()
+        function(run_data)
+        times.append(time.perf_counter() - start)
+    peak = None
+    if memory:
+        run_data = data.copy() if isinstance(data, pd.DataFrame) else data
+        tracemalloc.start()
+        try:
+            function(run_data)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return min(times), peak
+
+
+def get_metadata():
+    """Collects the commit and the versions under which the benchmarks run.
+
+    :return: The metadata.
+    :rtype: dict
+    """
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+
+
+def main(argv=None):
+    """Runs the benchmarks and writes their results.
+
+    :param argv: The command line arguments. If None, those of the process
+        are used.
+    :type argv: list, optional
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument(
+        '--rows', type=int, nargs='+',
+        default=[1000, 10000, 100000, 1000000, 10000000],
+        help='numbers of rows of the data')
+    parser.add_argument(
+        '--columns', type=int, default=10, help='number of columns')
+    parser.add_argument(
+        '--missing-rate', type=float, default=.1,
+        help='share of missing values per column')
+    parser.add_argument(
+        '--pattern', choices=['MCAR', 'MAR'], default='MCAR',
+        help='pattern of the missing values')
+    parser.add_argument(
+        '--categorical-share', type=float, default=.3,
+        help='share of categorical columns of the mixed data')
+    parser.add_argument(
+        '--benchmarks', nargs='+', choices=sorted(BENCHMARKS),
+        default=list(BENCHMARKS), help='benchmarks to run')
+    parser.add_argument(
+        '--repeat', type=int, default=3, help='number of timed runs')
+    parser.add_argument(
+        '--no-memory', action='store_true',
+        help='do not measure the peak memory')
+    parser.add_argument(
+        '--no-limits', action='store_true',
+        help='run every benchmark on every number of rows')
+    parser.add_argument(
+        '--output', default='benchmarks.json',
+        help='path of the JSON file with the results')
+    args = parser.parse_args(argv)
+    results = []
+    for rows in args.rows:
+        datasets = {}
+        for name in args.benchmarks:
+            kind, function, max_rows = BENCHMARKS[name]
+            result = {
+                'benchmark': name, 'rows': rows, 'columns': args.columns,
+                'missing_rate': args.missing_rate, 'pattern': args.pattern,
+                'time': None, 'peak_memory': None, 'skipped': None}
+            if not args.no_limits and max_rows is not None \
+                    and rows > max_rows:
+                result['skipped'] = 'more than ' + str(max_rows) + ' rows'
+            elif kind == 'seasonal' and rows > get_max_seasonal_rows():
+                result['skipped'] = 'hourly index out of bounds'
+            if result['skipped'] is None:
+                if kind not in datasets:
+                    datasets[kind] = generate_data(
+                        rows, args.columns, args.missing_rate, args.pattern,
+                        args.categorical_share if kind == 'mixed' else 0.,
+                        kind == 'seasonal')
+                with tempfile.TemporaryDirectory() as directory:
+                    data = datasets[kind]
+                    if function is run_impute_chunked:
+                        data = prepare_impute_chunked(data, directory)
+                    result['time'], result['peak_memory'] = measure(
+                        function, data, args.repeat, not args.no_memory)
+            results.append(result)
+            if result['skipped'] is None:
+                memory = 'n/a' if result['peak_memory'] is None else \
+                    '{:.1f}'.format(result['peak_memory'] / 2 ** 20)
+                outcome = '{:.4f} s, {} MB'.format(result['time'], memory)
+            else:
+                outcome = result['skipped']
+            print('{:>28} {:>10} rows: {}'.format(name, rows, outcome),
+                  flush=True)
+    with open(args.output, 'w') as file:
+        json.dump(
+            {'metadata': get_metadata(), 'results': results}, file,
+            indent=2)
+
+
+if __name__ == '__main__':
+    main()
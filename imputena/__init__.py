@@ -1,25 +1,80 @@
-from .deletion.delete_listwise import delete_listwise
-from .deletion.delete_pairwise import delete_pairwise
-from .deletion.delete_columns import delete_columns
-from .simple_imputation.locf import locf
-from .simple_imputation.nocb import nocb
-from .simple_imputation.random_sample_imputation import \
-    random_sample_imputation
-from .simple_imputation.random_hot_deck_imputation import \
-    random_hot_deck_imputation
-from .simple_imputation.most_frequent import most_frequent
-from .simple_imputation.mean_substitution import mean_substitution
-from .simple_imputation.constant_value_imputation import \
-    constant_value_imputation
-from .simple_imputation.random_value_imputation import random_value_imputation
-from .simple_imputation.interpolation import interpolation
-from .simple_imputation.seasonal_interpolation import seasonal_interpolation
-from .simple_imputation.linear_regression import linear_regression
-from .simple_imputation.logistic_regression import logistic_regression
-from .simple_imputation.knn import knn
-from .multiple_imputation.mice import mice
-from .multiple_imputation.srmi import srmi
-from .recommendation.get_applicable_methods import get_applicable_methods
-from .recommendation.recommend_method import recommend_method
-from .recommendation.impute_by_recommended import impute_by_recommended
+"""The public functions and classes of imputena are resolved lazily: the
+module that defines each of them is only imported when the name is first
+accessed, so that ``import imputena`` does not load heavy dependencies such
+as scikit-learn or statsmodels until a method that needs them is used.
+"""
 
+import importlib
+
+# Module that defines each public name, relative to this package:
+_modules = {
+    'delete_listwise': '.deletion.delete_listwise',
+    'delete_pairwise': '.deletion.delete_pairwise',
+    'delete_columns': '.deletion.delete_columns',
+    'locf': '.simple_imputation.locf',
+    'nocb': '.simple_imputation.nocb',
+    'random_sample_imputation':
+        '.simple_imputation.random_sample_imputation',
+    'random_hot_deck_imputation':
+        '.simple_imputation.random_hot_deck_imputation',
+    'most_frequent': '.simple_imputation.most_frequent',
+    'mean_substitution': '.simple_imputation.mean_substitution',
+    'constant_value_imputation':
+        '.simple_imputation.constant_value_imputation',
+    'random_value_imputation': '.simple_imputation.random_value_imputation',
+    'interpolation': '.simple_imputation.interpolation',
+    'seasonal_interpolation': '.simple_imputation.seasonal_interpolation',
+    'linear_regression': '.simple_imputation.linear_regression',
+    'logistic_regression': '.simple_imputation.logistic_regression',
+    'knn': '.simple_imputation.knn',
+    'mice': '.multiple_imputation.mice',
+    'srmi': '.multiple_imputation.srmi',
+    'get_applicable_methods': '.recommendation.get_applicable_methods',
+    'recommend_method': '.recommendation.recommend_method',
+    'impute_by_recommended': '.recommendation.impute_by_recommended',
+    'impute_chunked': '.streaming.impute_chunked',
+    'profiling': '.instrumentation',
+
+    'Imputer': '.imputers.imputer',
+    'MeanImputer': '.imputers.mean_imputer',
+    'MostFrequentImputer': '.imputers.most_frequent_imputer',
+    'LinearRegressionImputer': '.imputers.linear_regression_imputer',
+    'LogisticRegressionImputer': '.imputers.logistic_regression_imputer',
+    'KNNImputer': '.imputers.knn_imputer',
+
+    'MeanState': '.statistics',
+    'ModeState': '.statistics',
+    'QuantileSketch': '.statistics',
+
+    'RegressionReport': '.simple_imputation.regression_report',
+    'ProfilingReport': '.instrumentation',
+    'MissingnessProfile': '.recommendation.missingness_profile',
+}
+
+__all__ = list(_modules)
+
+
+def __getattr__(name):
+    """Imports the module that defines a public name the first time the
+    name is accessed, and keeps the name in the namespace of the package.
+
+    :param name: The name being accessed.
+    :type name: str
+    :return: The function or class.
+    :raises: AttributeError
+    """
+    if name not in _modules:
+        raise AttributeError(
+            'module \'' + __name__ + '\' has no attribute \'' + name + '\'')
+    value = getattr(importlib.import_module(_modules[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Lists the public names together with the names already loaded.
+
+    :return: The names of the package.
+    :rtype: list
+    """
+    return sorted(set(globals()) | set(__all__))
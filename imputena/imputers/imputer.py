@@ -0,0 +1,89 @@
+import pickle
+
+
+class Imputer:
+    """Base class of the imputers that learn their parameters from some
+    training data with fit() and impute other data with transform(). This
+    allows imputing small batches of data, e.g. in a serving process,
+    without refitting the parameters on each batch. The fitted imputer can
+    be saved to disk with save() and loaded with Imputer.load().
+    """
+
+    def fit(self, data):
+        """Learns the parameters of the imputation from the data.
+
+        :param data: The training data.
+        :type data: pandas.Series or pandas.DataFrame
+        :return: The imputer itself.
+        :rtype: Imputer
+        """
+        raise NotImplementedError
+
+    def transform(self, data, inplace=False):
+        """Imputes the missing values of the data using the parameters
+        learned by fit().
+
+        :param data: The data on which to perform the imputation.
+        :type data: pandas.Series or pandas.DataFrame
+        :param inplace: If True, do operation inplace and return None.
+        :type inplace: bool, default False
+        :return: The data with NA values imputed, or None if inplace=True.
+        :rtype: pandas.Series, pandas.DataFrame, or None
+        """
+        raise NotImplementedError
+
+    def fit_transform(self, data, inplace=False):
+        """Learns the parameters of the imputation from the data and imputes
+        its missing values.
+
+        :param data: The data on which to perform the imputation.
+        :type data: pandas.Series or pandas.DataFrame
+        :param inplace: If True, do operation inplace and return None.
+        :type inplace: bool, default False
+        :return: The data with NA values imputed, or None if inplace=True.
+        :rtype: pandas.Series, pandas.DataFrame, or None
+        """
+        return self.fit(data).transform(data, inplace=inplace)
+
+    def is_fitted(self):
+        """Checks whether the imputer has been fitted.
+
+        :return: Whether fit() has been called.
+        :rtype: bool
+        """
+        return getattr(self, 'fitted_', False)
+
+    def check_fitted(self):
+        """Raises a ValueError if the imputer has not been fitted.
+
+        :raises: ValueError
+        """
+        if not self.is_fitted():
+            raise ValueError(
+                'The imputer has to be fitted before transforming data.')
+
+    def save(self, path):
+        """Saves the imputer, including its fitted parameters, to a file.
+
+        :param path: The path of the file.
+        :type path: str or path-like
+        """
+        with open(path, 'wb') as file:
+            pickle.dump(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        """Loads an imputer saved with save().
+
+        :param path: The path of the file.
+        :type path: str or path-like
+        :return: The loaded imputer.
+        :rtype: Imputer
+        :raises: TypeError
+        """
+        with open(path, 'rb') as file:
+            imputer = pickle.load(file)
+        if not isinstance(imputer, cls):
+            raise TypeError(
+                'The file does not contain a {}.'.format(cls.__name__))
+        return imputer
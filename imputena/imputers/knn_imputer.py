@@ -0,0 +1,94 @@
+import pandas as pd
+from sklearn import impute
+
+from imputena.imputers.imputer import Imputer
+
+
+class KNNImputer(Imputer):
+    """Imputer that performs k-nearest neighbors imputation. It performs
+    the same operation as knn(), but the neighbors of each subject with
+    missing data are searched in the training data, which fit() keeps as
+    the reference set, instead of in the data being imputed.
+
+    :param columns: Columns on which to apply the operation.
+    :type columns: array-like, optional
+    :param k: The number of neighbors to which the subject with missing
+        values should be compared
+    :type k: int, default 3
+    """
+
+    def __init__(self, columns=None, k=3):
+        self.columns = columns
+        self.k = k
+
+    def fit(self, data):
+        """Keeps the training data as the reference set of the neighbors.
+
+        :param data: The training data.
+        :type data: pandas.DataFrame
+        :return: The imputer itself.
+        :rtype: KNNImputer
+        :raises: TypeError, ValueError
+        """
+        # Check if data is a dataframe:
+        if not isinstance(data, pd.DataFrame):
+            raise TypeError('The data has to be a DataFrame.')
+        if self.columns is not None:
+            for column in self.columns:
+                if column not in data.columns:
+                    raise ValueError(
+                        '\'' + column + '\' is not a column of the data.')
+        # The KNNImputer removes all columns that contain only empty values,
+        # so they are excluded from the reference set:
+        self.reference_columns_ = list(data.columns[data.notna().any()])
+        self.imputer_ = impute.KNNImputer(n_neighbors=self.k).fit(
+            data[self.reference_columns_])
+        self.fitted_ = True
+        return self
+
+    def transform(self, data, inplace=False):
+        """Imputes the missing values of the data with the average of the
+        values of the k nearest neighbors in the reference set.
+
+        :param data: The data on which to perform the k-nearest neighbors
+            imputation.
+        :type data: pandas.DataFrame
+        :param inplace: If True, do operation inplace and return None.
+        :type inplace: bool, default False
+        :return: The dataframe with NA values imputed, or None if
+            inplace=True.
+        :rtype: pandas.DataFrame or None
+        :raises: TypeError, ValueError
+        """
+        self.check_fitted()
+        # Check if data is a dataframe:
+        if not isinstance(data, pd.DataFrame):
+            raise TypeError('The data has to be a DataFrame.')
+        for column in self.reference_columns_:
+            if column not in data.columns:
+                raise ValueError(
+                    '\'' + column + '\' is not a column of the data.')
+        # Assign a reference or copy to res, depending on inplace:
+        if inplace:
+            res = data
+        else:
+            res = data.copy()
+        # Perform KNN:
+        knn_out = self.imputer_.transform(data[self.reference_columns_])
+        # Write back the imputed cells of the selected columns:
+        if self.columns is None:
+            columns = self.reference_columns_
+        else:
+            columns = [
+                column for column in self.columns
+                if column in self.reference_columns_]
+        for column in columns:
+            na_mask = data[column].isna().to_numpy()
+            if na_mask.any():
+                col_loc = self.reference_columns_.index(column)
+                res.loc[na_mask, column] = knn_out[na_mask, col_loc]
+        # Return the imputed data, or None if inplace:
+        if inplace:
+            return None
+        else:
+            return res
@@ -0,0 +1,177 @@
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+from imputena.imputers.imputer import Imputer
+from imputena.simple_imputation.linear_regression import get_imputed_values
+from imputena.simple_imputation.utils import (
+    get_predictor_patterns, compute_regression_statistics, solve_regression,
+    get_random_generator)
+
+
+class LinearRegressionImputer(Imputer):
+    """Imputer that performs linear (or stochastic) regression imputation.
+    It performs the same operation as linear_regression(), but the
+    regression models are learned from the training data by fit() and
+    reused by every call to transform(). fit() accumulates, for each
+    dependent variable, the cross-product matrices of the variables, from
+    which the regression for any combination of available predictors is
+    solved when it is first needed and then kept for later calls.
+
+    :param dependent: The dependent variable in which the missing values
+        should be imputed. If omitted, all numeric columns of the training
+        data are used as dependent variables.
+    :type dependent: String, optional
+    :param predictors: The predictor variables on which the dependent variable
+        is dependent. If omitted, all other numeric columns are used.
+    :type predictors: array-like, optional
+    :param regressions: If 'available': Impute missing values by modeling a
+        regression based on all available predictors if some predictors have
+        missing values themselves. If 'complete': Only impute with a
+        regression model based on all predictors and leave missing values in
+        rows in which some predictor value is missing itself unimputed.
+    :type regressions: {'available', 'complete'}, default 'available'
+    :param noise: Whether to add noise to the imputed values (stochastic
+        regression imputation)
+    :type noise: bool, default False
+    :param solver: If 'gram': Accumulate the cross-product matrices over the
+        rows of the training data in which the dependent variable and all
+        predictors are available. If 'pairwise': Accumulate each entry over
+        all rows in which both variables are available.
+    :type solver: {'gram', 'pairwise'}, default 'gram'
+    :param random_state: The seed or generator from which to draw the noise
+        if noise=True. The generator is created by fit() and advanced by
+        every call to transform(). If None, it is seeded from numpy's global
+        random state.
+    :type random_state: int, numpy.random.SeedSequence or
+        numpy.random.Generator, optional
+    :raises: ValueError
+    """
+
+    def __init__(
+            self, dependent=None, predictors=None, regressions='available',
+            noise=False, solver='gram', random_state=None):
+        # Check the value of regressions:
+        if regressions not in ['available', 'complete']:
+            raise ValueError(regressions + 'could not be understood')
+        # Check if the solver has a valid value:
+        if solver not in ['gram', 'pairwise']:
+            raise ValueError(solver + ' is not a supported solver.')
+        self.dependent = dependent
+        self.predictors = predictors
+        self.regressions = regressions
+        self.noise = noise
+        self.solver = solver
+        self.random_state = random_state
+
+    def fit(self, data):
+        """Accumulates the statistics of the regressions from the training
+        data.
+
+        :param data: The training data.
+        :type data: pandas.DataFrame
+        :return: The imputer itself.
+        :rtype: LinearRegressionImputer
+        :raises: TypeError, ValueError
+        """
+        # Check if data is a dataframe:
+        if not isinstance(data, pd.DataFrame):
+            raise TypeError('The data has to be a DataFrame.')
+        # Check if the dependent variable is actually a column of the
+        # dataframe:
+        if self.dependent is not None and self.dependent not in data.columns:
+            raise ValueError(
+                '\'' + self.dependent + '\' is not a column of the data.')
+        # Check if each of the predictor variables is actually a column of
+        # the dataframe:
+        if self.predictors is not None:
+            for column in self.predictors:
+                if column not in data.columns:
+                    raise ValueError(
+                        '\'' + column + '\' is not a column of the data.')
+        # Determine the dependent variables:
+        numerics = [
+            column for column in data.columns
+            if is_numeric_dtype(data[column])]
+        if self.dependent is None:
+            dependents = numerics
+        else:
+            dependents = [self.dependent]
+        # Accumulate the statistics for each dependent variable:
+        self.predictors_ = {}
+        self.statistics_ = {}
+        self.models_ = {}
+        self.rng_ = get_random_generator(self.random_state) \
+            if self.noise else None
+        for dependent in dependents:
+            if self.predictors is None:
+                predictors = [
+                    column for column in numerics if column != dependent]
+            else:
+                predictors = list(self.predictors)
+            self.predictors_[dependent] = predictors
+            self.statistics_[dependent] = compute_regression_statistics(
+                data, dependent, predictors, self.solver == 'pairwise')
+        self.fitted_ = True
+        return self
+
+    def get_model(self, dependent, predictors):
+        """Returns the intercept, coefficients and standard error of the
+        regression of the dependent variable on the predictors, solving it
+        from the statistics learned by fit() the first time it is needed.
+
+        :param dependent: The dependent variable.
+        :type dependent: String
+        :param predictors: The predictor variables.
+        :type predictors: tuple
+        :return: The intercept, the coefficients in the same order as the
+            predictors, and the standard error of the regression.
+        :rtype: (scalar, numpy.ndarray, scalar)
+        """
+        key = (dependent, tuple(predictors))
+        if key not in self.models_:
+            self.models_[key] = solve_regression(
+                self.statistics_[dependent], dependent, predictors)
+        return self.models_[key]
+
+    def transform(self, data, inplace=False):
+        """Imputes the missing values of the dependent variable(s) with the
+        regression models learned by fit().
+
+        :param data: The data on which to perform the linear regression
+            imputation.
+        :type data: pandas.DataFrame
+        :param inplace: If True, do operation inplace and return None.
+        :type inplace: bool, default False
+        :return: The dataframe with linear regression imputation performed
+            for the incomplete variable(s) or None if inplace=True.
+        :rtype: pandas.DataFrame or None
+        :raises: TypeError, ValueError
+        """
+        self.check_fitted()
+        # Check if data is a dataframe:
+        if not isinstance(data, pd.DataFrame):
+            raise TypeError('The data has to be a DataFrame.')
+        # Assign a reference or copy to res, depending on inplace:
+        if inplace:
+            res = data
+        else:
+            res = data.copy()
+        for dependent, predictors in self.predictors_.items():
+            # Check if the variables are actually columns of the dataframe:
+            for column in [dependent] + predictors:
+                if column not in data.columns:
+                    raise ValueError(
+                        '\'' + column + '\' is not a column of the data.')
+            # Impute the rows of each pattern of missing predictors:
+            patterns = get_predictor_patterns(
+                res, dependent, predictors, self.regressions == 'available')
+            dependent_loc = res.columns.get_loc(dependent)
+            for it_predictors, rows in patterns:
+                intercept, coefs, std_error = self.get_model(
+                    dependent, it_predictors)
+                res.iloc[rows, dependent_loc] = get_imputed_values(
+                    res, list(it_predictors), intercept, coefs, self.noise,
+                    std_error, rows, self.rng_)
+        # Return dataframe if the operation is not to be performed inplace:
+        if not inplace:
+            return res
@@ -0,0 +1,156 @@
+import itertools
+
+import pandas as pd
+
+from imputena.imputers.imputer import Imputer
+from imputena.simple_imputation.logistic_regression import (
+    fit_logistic_regression, predict_classes)
+from imputena.simple_imputation.utils import (
+    get_predictor_patterns, get_random_generator)
+
+
+class LogisticRegressionImputer(Imputer):
+    """Imputer that performs logistic regression imputation. It performs
+    the same operation as logistic_regression(), but the regression models
+    are learned from the training data by fit() and reused by every call to
+    transform(), which fits nothing and does not need the training data.
+    If regressions='available', fit() learns a model for every combination
+    of predictors that the training data supports, i.e. for which the
+    rows in which all of them and the dependent variable are available
+    contain at least two classes. As there are 2^p - 1 combinations of p
+    predictors, regressions='complete' is preferable with many predictors.
+    Rows whose combination of available predictors has no model are left
+    unimputed.
+
+    :param dependent: The dependent variable in which the missing values
+        should be imputed.
+    :type dependent: String
+    :param predictors: The predictor variables on which the dependent variable
+        is dependent. If omitted, all other columns are used.
+    :type predictors: array-like, optional
+    :param regressions: If 'available': Impute missing values by modeling a
+        regression based on all available predictors if some predictors have
+        missing values themselves. If 'complete': Only impute with a
+        regression model based on all predictors and leave missing values in
+        rows in which some predictor value is missing itself unimputed.
+    :type regressions: {'available', 'complete'}, default 'available'
+    :param noise: Whether to draw the imputed classes from the predicted
+        probabilities instead of imputing the most probable class.
+    :type noise: bool, default False
+    :param random_state: The seed or generator from which to draw the
+        classes if noise=True. The generator is created by fit() and
+        advanced by every call to transform(). If None, it is seeded from
+        numpy's global random state.
+    :type random_state: int, numpy.random.SeedSequence or
+        numpy.random.Generator, optional
+    :raises: ValueError
+    """
+
+    def __init__(self, dependent=None, predictors=None,
+                 regressions='available', noise=False, random_state=None):
+        # Check the value of regressions:
+        if regressions not in ['available', 'complete']:
+            raise ValueError(regressions + 'could not be understood')
+        self.dependent = dependent
+        self.predictors = predictors
+        self.regressions = regressions
+        self.noise = noise
+        self.random_state = random_state
+
+    def fit(self, data):
+        """Learns the regression models from the training data.
+
+        :param data: The training data.
+        :type data: pandas.DataFrame
+        :return: The imputer itself.
+        :rtype: LogisticRegressionImputer
+        :raises: TypeError, ValueError
+        """
+        # Check if data is a dataframe:
+        if not isinstance(data, pd.DataFrame):
+            raise TypeError('The data has to be a DataFrame.')
+        # Check if the dependent variable is actually a column of the
+        # dataframe:
+        if self.dependent not in data.columns:
+            raise ValueError(
+                '\'' + str(self.dependent) + '\' is not a column of the data.')
+        # If predictors is None, all variables except for the dependent one
+        # are considered predictors:
+        if self.predictors is None:
+            predictors = list(data.columns)
+            predictors.remove(self.dependent)
+        else:
+            predictors = list(self.predictors)
+        # Check if each of the predictor variables is actually a column of
+        # the dataframe:
+        for column in predictors:
+            if column not in data.columns:
+                raise ValueError(
+                    '\'' + column + '\' is not a column of the data.')
+        self.predictors_ = predictors
+        # Rows in which the dependent variable is available:
+        training_data = data.loc[
+            data[self.dependent].notna(), predictors + [self.dependent]]
+        # Combinations of predictors for which to learn a model:
+        if self.regressions == 'available':
+            combinations = itertools.chain.from_iterable(
+                itertools.combinations(predictors, size)
+                for size in range(len(predictors), 0, -1))
+        else:
+            combinations = [tuple(predictors)]
+        # Learn a model for each combination supported by the data:
+        self.models_ = {}
+        for combination in combinations:
+            complete = training_data[list(combination)].notna().all(axis=1)
+            if training_data.loc[complete, self.dependent].nunique() > 1:
+                self.models_[combination] = fit_logistic_regression(
+                    training_data, self.dependent, list(combination))
+        self.rng_ = get_random_generator(self.random_state) \
+            if self.noise else None
+        self.fitted_ = True
+        return self
+
+    def transform(self, data, inplace=False):
+        """Imputes the missing values of the dependent variable with the
+        regression models learned from the training data.
+
+        :param data: The data on which to perform the logistic regression
+            imputation.
+        :type data: pandas.DataFrame
+        :param inplace: If True, do operation inplace and return None.
+        :type inplace: bool, default False
+        :return: The dataframe with logistic regression imputation performed
+            for the incomplete variable or None if inplace=True.
+        :rtype: pandas.DataFrame or None
+        :raises: TypeError, ValueError
+        """
+        self.check_fitted()
+        # Check if data is a dataframe:
+        if not isinstance(data, pd.DataFrame):
+            raise TypeError('The data has to be a DataFrame.')
+        # Check if the variables are actually columns of the dataframe:
+        for column in [self.dependent] + self.predictors_:
+            if column not in data.columns:
+                raise ValueError(
+                    '\'' + column + '\' is not a column of the data.')
+        # Assign a reference or copy to res, depending on inplace:
+        if inplace:
+            res = data
+        else:
+            res = data.copy()
+        # Impute the rows of each pattern of missing predictors:
+        patterns = get_predictor_patterns(
+            data, self.dependent, self.predictors_,
+            self.regressions == 'available')
+        dependent_loc = res.columns.get_loc(self.dependent)
+        for it_predictors, rows in patterns:
+            # Leave the rows unimputed if no model was learned for their
+            # predictors:
+            if it_predictors not in self.models_:
+                continue
+            res.iloc[rows, dependent_loc] = predict_classes(
+                self.models_[it_predictors],
+                data.iloc[rows][list(it_predictors)], self.noise, self.rng_)
+        # Return dataframe is the operation is not to be performed inplace:
+        if not inplace:
+            return res
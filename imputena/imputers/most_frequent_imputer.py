@@ -0,0 +1,85 @@
+import pandas as pd
+
+from imputena.imputers.imputer import Imputer
+from imputena.simple_imputation.utils import get_most_frequent_value
+
+
+class MostFrequentImputer(Imputer):
+    """Imputer that fills in missing values with the most frequent value
+    (mode) of the same column (or of the series) in the training data. It
+    performs the same operation as most_frequent(), but the modes are
+    computed once by fit() and reused by every call to transform().
+
+    :param columns: Columns on which to apply the operation.
+    :type columns: array-like, optional
+    """
+
+    def __init__(self, columns=None):
+        self.columns = columns
+
+    def fit(self, data):
+        """Computes the modes of the training data.
+
+        :param data: The training data.
+        :type data: pandas.Series or pandas.DataFrame
+        :return: The imputer itself.
+        :rtype: MostFrequentImputer
+        :raises: TypeError, ValueError
+        """
+        # Check if data is a series or dataframe:
+        if not (isinstance(data, pd.Series)
+                or isinstance(data, pd.DataFrame)):
+            raise TypeError('The data has to be a Series or DataFrame.')
+        # Raise a ValueError if columns are selected for a series:
+        if isinstance(data, pd.Series) and self.columns is not None:
+            raise ValueError('Columns can only be selected if the data is a '
+                             'DataFrame.')
+        # Select the columns on which to compute the modes:
+        if self.columns is not None:
+            for column in self.columns:
+                # Raise error if the column name doesn't exist in the data:
+                if column not in data.columns:
+                    raise ValueError(
+                        '\'' + column + '\' is not a column of the data.')
+            data = data[list(self.columns)]
+        # Compute the modes, taking the smallest one in case of ties:
+        if isinstance(data, pd.Series):
+            self.statistics_ = get_most_frequent_value(data)
+        else:
+            self.statistics_ = pd.Series(
+                [get_most_frequent_value(data[column])
+                 for column in data.columns],
+                index=data.columns, dtype=object)
+        self.fitted_ = True
+        return self
+
+    def transform(self, data, inplace=False):
+        """Fills in the missing values of the data with the modes computed
+        by fit().
+
+        :param data: The data on which to perform the most frequent
+            imputation.
+        :type data: pandas.Series or pandas.DataFrame
+        :param inplace: If True, do operation inplace and return None.
+        :type inplace: bool, default False
+        :return: The series or dataframe with NA values filled in, or
+            None if inplace=True.
+        :rtype: pandas.Series, pandas.DataFrame, or None
+        :raises: TypeError, ValueError
+        """
+        self.check_fitted()
+        # Check if data is a series or dataframe:
+        if not (isinstance(data, pd.Series)
+                or isinstance(data, pd.DataFrame)):
+            raise TypeError('The data has to be a Series or DataFrame.')
+        # Assign a reference or copy to res, depending on inplace:
+        if inplace:
+            res = data
+        else:
+            res = data.copy()
+        res.fillna(self.statistics_, inplace=True)
+        # Return the imputed data, or None if inplace:
+        if inplace:
+            return None
+        else:
+            return res
@@ -0,0 +1,155 @@
+"""Opt-in profiling of the internal stages of the imputation methods. The
+methods mark their stages with stage(), which does nothing unless a
+profiling() block is active.
+"""
+
+import contextlib
+import time
+import tracemalloc
+
+import pandas as pd
+
+
+# Report of the active profiling() block, or None:
+_active_report = None
+# Whether the active profiling() block measures the memory:
+_measure_memory = False
+# Records of the stages that have started but not ended yet, innermost
+# last:
+_open_stages = []
+
+
+class ProfilingReport:
+    """Report of the stages run inside a profiling() block. For each stage,
+    it records its name, the stage in which it ran, the wall and CPU time,
+    the change of the allocated memory and the peak of the memory allocated
+    during the stage, both relative to the allocated memory at its start,
+    and the number of rows and cells it processed, if known. The memory is
+    only measured if the block was opened with memory=True.
+    """
+
+    def __init__(self):
+        self.stages = []
+
+    def to_records(self):
+        """Returns the recorded stages, in the order in which they ended,
+        as a list of dicts that can be exported as they are.
+
+        :return: The recorded stages.
+        :rtype: list of dict
+        """
+        return [dict(record) for record in self.stages]
+
+    def to_frame(self):
+        """Returns the recorded stages as a dataframe, with one row per run
+        of a stage and the columns stage, parent, wall_time, cpu_time,
+        memory_delta, peak_memory, rows and cells.
+
+        :return: The recorded stages.
+        :rtype: pandas.DataFrame
+        """
+        return pd.DataFrame(self.stages, columns=[
+            'stage', 'parent', 'wall_time', 'cpu_time', 'memory_delta',
+            'peak_memory', 'rows', 'cells'])
+
+    def summary(self):
+        """Aggregates the runs of each stage: their number, their total wall
+        and CPU time, rows and cells, and their maximum peak memory.
+
+        :return: The summary of each stage, indexed by stage.
+        :rtype: pandas.DataFrame
+        """
+        return self.to_frame().groupby('stage', sort=False).agg(
+            runs=('wall_time', 'size'), wall_time=('wall_time', 'sum'),
+            cpu_time=('cpu_time', 'sum'), peak_memory=('peak_memory', 'max'),
+            rows=('rows', 'sum'), cells=('cells', 'sum'))
+
+
+@contextlib.contextmanager
+def profiling(memory=True):
+    """Context manager that records the stages of the imputation methods
+    called inside the block, and yields the report in which they are
+    recorded. Stages run in worker processes (n_jobs other than 1) are not
+    recorded.
+
+    :param memory: Whether to measure the memory of the stages with
+        tracemalloc, which slows down the methods.
+    :type memory: bool, default True
+    :return: The report.
+    :rtype: ProfilingReport
+    :raises: RuntimeError
+    """
+    global _active_report, _measure_memory
+    if _active_report is not None:
+        raise RuntimeError('A profiling block is already active.')
+    report = ProfilingReport()
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    _active_report = report
+    _measure_memory = memory
+    try:
+        yield report
+    finally:
+        _active_report = None
+        _measure_memory = False
+        del _open_stages[:]
+        if started_tracing:
+            tracemalloc.stop()
+
+
+@contextlib.contextmanager
+def stage(name, rows=None, cells=None):
+    """Context manager that marks a stage of an imputation method. If a
+    profiling() block is active, the stage is recorded in its report.
+    Otherwise, it does nothing.
+
+    :param name: The name of the stage.
+    :type name: String
+    :param rows: The number of rows processed by the stage.
+    :type rows: int, optional
+    :param cells: The number of cells processed by the stage.
+    :type cells: int, optional
+    """
+    report = _active_report
+    if report is None:
+        yield
+        return
+    # Keep the peak of the enclosing stage before resetting it for this one:
+    measure_memory = _measure_memory and tracemalloc.is_tracing()
+    start_memory = None
+    if measure_memory:
+        current, peak = tracemalloc.get_traced_memory()
+        if _open_stages:
+            parent = _open_stages[-1]
+            parent['max_peak'] = max(parent['max_peak'], peak)
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        start_memory = current
+    record = {
+        'stage': name,
+        'parent': _open_stages[-1]['stage'] if _open_stages else None,
+        'max_peak': start_memory}
+    _open_stages.append(record)
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    try:
+        yield
+    finally:
+        record['wall_time'] = time.perf_counter() - start_wall
+        record['cpu_time'] = time.process_time() - start_cpu
+        record['memory_delta'] = None
+        record['peak_memory'] = None
+        if measure_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(record['max_peak'], peak)
+            record['memory_delta'] = current - start_memory
+            record['peak_memory'] = peak - start_memory
+            if len(_open_stages) > 1:
+                parent = _open_stages[-2]
+                parent['max_peak'] = max(parent['max_peak'], peak)
+        record['rows'] = rows
+        record['cells'] = cells
+        del record['max_peak']
+        _open_stages.pop()
+        report.stages.append(record)
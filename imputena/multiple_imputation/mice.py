@@ -1,14 +1,18 @@
 import pandas as pd
 from pandas.api.types import is_numeric_dtype
 import numpy as np
-from random import shuffle
+from sklearn import linear_model
 
-from imputena import (
-    mean_substitution, linear_regression, logistic_regression,
-    random_sample_imputation)
+from imputena import mean_substitution, random_sample_imputation
+from imputena.parallel import run_imputations
+from imputena.instrumentation import stage
+from imputena.simple_imputation.logistic_regression import (
+    fit_logistic_regression)
+from imputena.simple_imputation.utils import get_random_generator
 
 
-def mice(data=None, imputations=3):
+def mice(data=None, imputations=3, n_jobs=1, random_state=None, max_iter=1,
+         tol=1e-3):
     """Performs multiple imputation by chained equations (MICE) on the data.
     Several (parameter imputations) linear regression imputations are
     performed on the dataset. For each one, the a random order of imputation of
@@ -17,12 +21,39 @@ def mice(data=None, imputations=3):
     generated order, (1) the missing values imputed with the mean are set
     missing again, (2) a linear regression model is calculated based on the
     available data and (3) the predictions from the model are used to impute
-    the missing values.
+    the missing values. This sweep over the columns is repeated up to
+    max_iter times, until the imputed values converge. The linear
+    regressions are solved from cross-product matrices of the numeric
+    columns that are kept for the whole imputation and only updated in the
+    rows whose imputed values change, and the logistic regression models of
+    the categorical columns are warm-started from the previous sweep. The
+    imputations are independent of each other and can be run on a pool of
+    processes by setting n_jobs. Each imputation draws its random choices
+    from its own random number generator, spawned from random_state, so
+    that the results are reproducible and do not depend on n_jobs.
 
     :param data: The data on which to perform the MICE imputation.
     :type data: pandas.DataFrame
     :param imputations: Number of imputations to perform
     :type imputations: scalar, default 3
+    :param n_jobs: The number of processes on which to run the imputations.
+        If -1, the number of CPUs is used. The data is shared with the
+        processes instead of being copied for each imputation.
+    :type n_jobs: int, default 1
+    :param random_state: The seed or generator from which the generators of
+        the imputations are spawned. If None, a seed is drawn from numpy's
+        global random state.
+    :type random_state: int, numpy.random.SeedSequence or
+        numpy.random.Generator, optional
+    :param max_iter: Maximum number of sweeps over the columns with missing
+        values.
+    :type max_iter: int, default 1
+    :param tol: The sweeps stop when, for every numeric column, the mean
+        and the variance of its imputed values change by less than tol
+        (relative to the standard deviation and the variance of its
+        observed values), and for every categorical column, the share of
+        imputed values that change is less than tol.
+    :type tol: scalar, default 1e-3
     :return: A list of MICE imputations performed with randomly chosen
         orders of column imputations.
     :rtype: list of pandas.DataFrame
@@ -31,26 +62,39 @@ def mice(data=None, imputations=3):
     # Check if data is a dataframe:
     if not isinstance(data, pd.DataFrame):
         raise TypeError('The data has to be a DataFrame.')
-    # Create the list that will be returned
-    imputed_datasets = []
-    # Impute several times and add the results to the list:
-    for _ in range(imputations):
-        imputed_datasets.append(mice_one_imputation(data))
-    # Return the imputed datasets:
-    return imputed_datasets
+    # Check if max_iter has a valid value:
+    if not isinstance(max_iter, int) or max_iter < 1:
+        raise ValueError(
+            'max_iter has to be a positive integer, but is {}.'.format(
+                max_iter))
+    # Impute several times and return the list of imputed datasets:
+    return run_imputations(
+        mice_one_imputation, data, imputations, n_jobs, random_state,
+        max_iter=max_iter, tol=tol)
 
 
-def mice_one_imputation(data):
+def mice_one_imputation(data, random_state=None, max_iter=1, tol=1e-3):
     """Auxiliary function that performs one MICE imputation, choosing the
     order in which the columns are imputed at random.
 
     :param data: The data on which to perform the imputation.
     :type data: pandas.DataFrame
+    :param random_state: The seed or generator from which to draw the order
+        of the columns and the initial values of categorical columns.
+    :type random_state: int, numpy.random.SeedSequence or
+        numpy.random.Generator, optional
+    :param max_iter: Maximum number of sweeps over the columns.
+    :type max_iter: int, default 1
+    :param tol: The tolerance of the convergence criterion (see mice()).
+    :type tol: scalar, default 1e-3
     :return: The dataframe with one MICE imputation performed.
     :rtype: pandas.DataFrame
     """
+    # Random number generator from which to draw the random choices:
+    rng = get_random_generator(random_state)
     # This auxiliary function always returns a copy:
-    res = data.copy()
+    with stage('mice.copy', len(data), data.size):
+        res = data.copy()
     # Save the mask of missing values:
     na_mask = pd.isna(data)
     # Compute the list of columns with missing values
@@ -59,22 +103,213 @@ def mice_one_imputation(data):
         if data[column].isna().any():
             columns_with_na.append(column)
     # Shuffle the list of columns to impute:
-    shuffle(columns_with_na)
+    columns_with_na = [
+        columns_with_na[i] for i in rng.permutation(len(columns_with_na))]
     # Impute with mean substitution:
-    for column in columns_with_na:
-        if is_numeric_dtype(data[column]):
-            mean_substitution(res, columns=[column], inplace=True)
-        else:
-            random_sample_imputation(res, columns=[column], inplace=True)
+    with stage('mice.initial_imputation', len(data), int(na_mask.sum().sum())):
+        for column in columns_with_na:
+            if is_numeric_dtype(data[column]):
+                mean_substitution(res, columns=[column], inplace=True)
+            else:
+                random_sample_imputation(
+                    res, columns=[column], random_state=rng, inplace=True)
     # Compute which columns are numeric in order to use them as predictors:
     numerics = [col for col in data.columns if is_numeric_dtype(data[col])]
-    # Impute each column:
+    # Cross-product matrices of the numeric columns, kept for all sweeps:
+    with stage('mice.cross_products', len(data), len(data) * len(numerics)):
+        cache = NumericCache(res, numerics, na_mask, columns_with_na)
+    # Logistic regression models of the categorical columns, warm-started
+    # from one sweep to the next:
+    models = {}
+    # Perform the sweeps until convergence:
+    previous = None
+    for _ in range(max_iter):
+        for column in columns_with_na:
+            rows = np.flatnonzero(na_mask[column].to_numpy())
+            column_loc = res.columns.get_loc(column)
+            if is_numeric_dtype(data[column]):
+                with stage('mice.linear_regression', len(rows), len(rows)):
+                    res.iloc[rows, column_loc] = cache.impute(column, rows)
+            else:
+                with stage('mice.logistic_regression', len(rows), len(rows)):
+                    res.iloc[rows, column_loc] = mice_logistic_step(
+                        res, column, rows, na_mask, models)
+        with stage('mice.convergence'):
+            current = get_imputation_summary(
+                res, data, na_mask, columns_with_na)
+        if previous is not None and has_converged(previous, current, tol):
+            break
+        previous = current
+    return res
+
+
+class NumericCache:
+    """Auxiliary class that keeps, for each numeric column with missing
+    values, the cross-product matrix of the numeric columns (with a leading
+    column of ones for the intercept) over the rows in which that column is
+    observed. When the imputed values of a column change, the matrices are
+    updated only in the rows that changed, so that the linear regressions
+    of later sweeps are solved without reading the whole data again.
+
+    :param data: The data, with all missing values initially imputed.
+    :type data: pandas.DataFrame
+    :param numerics: The numeric columns, used as predictors.
+    :type numerics: list
+    :param na_mask: The mask of originally missing values.
+    :type na_mask: pandas.DataFrame
+    :param columns_with_na: The columns with missing values.
+    :type columns_with_na: list
+    """
+
+    def __init__(self, data, numerics, na_mask, columns_with_na):
+        self.numerics = numerics
+        self.locs = {column: i for i, column in enumerate(numerics)}
+        values = data[numerics].to_numpy(dtype=float)
+        # Columns without any value cannot be used as predictors:
+        self.available = ~np.isnan(values).all(axis=0)
+        # Shift the columns by their means to keep the products accurate:
+        self.shift = np.zeros(len(numerics))
+        self.shift[self.available] = np.nanmean(
+            values[:, self.available], axis=0)
+        self.values = values - self.shift
+        self.observed = {}
+        self.grams = {}
+        for column in columns_with_na:
+            if column in self.locs:
+                observed = ~na_mask[column].to_numpy()
+                self.observed[column] = observed
+                augmented = self.augment(np.flatnonzero(observed))
+                self.grams[column] = augmented.T @ augmented
+
+    def augment(self, rows):
+        """Returns the values of the given rows with a leading column of
+        ones.
+
+        :param rows: Positions of the rows.
+        :type rows: numpy.ndarray
+        :return: The augmented values.
+        :rtype: numpy.ndarray
+        """
+        return np.hstack([np.ones((len(rows), 1)), self.values[rows]])
+
+    def impute(self, column, rows):
+        """Computes the linear regression of the column on the other
+        numeric columns from its cross-product matrix, updates the values of
+        the column in the given rows with its predictions and the matrices
+        of the other columns accordingly, and returns the predictions.
+
+        :param column: The column to impute.
+        :type column: String
+        :param rows: Positions of the rows in which the column is missing.
+        :type rows: numpy.ndarray
+        :return: The imputed values, in the same order as rows.
+        :rtype: numpy.ndarray
+        """
+        loc = self.locs[column]
+        predictors = [0] + [
+            i + 1 for i in range(len(self.numerics))
+            if i != loc and self.available[i]]
+        # Without predictors or observed values, the rows cannot be imputed:
+        if len(predictors) == 1 or not self.available[loc]:
+            values = np.full(len(rows), np.nan)
+        else:
+            gram = self.grams[column]
+            coefs = np.linalg.lstsq(
+                gram[np.ix_(predictors, predictors)],
+                gram[predictors, loc + 1], rcond=None)[0]
+            values = self.augment(rows)[:, predictors] @ coefs
+        # Update the cross-product matrices of the other columns over the
+        # rows that change:
+        for other, observed in self.observed.items():
+            if other != column:
+                changed = rows[observed[rows]]
+                if len(changed) > 0:
+                    old = self.augment(changed)
+                    new = old.copy()
+                    new[:, loc + 1] = values[observed[rows]]
+                    self.grams[other] += new.T @ new - old.T @ old
+        self.values[rows, loc] = values
+        return values + self.shift[loc]
+
+
+def mice_logistic_step(data, column, rows, na_mask, models):
+    """Auxiliary function that imputes a categorical column with a logistic
+    regression on all other columns, fitted on the rows in which the column
+    is observed. The model of the column is kept in models and
+    warm-started from its previous solution.
+
+    :param data: The data, with all missing values imputed.
+    :type data: pandas.DataFrame
+    :param column: The column to impute.
+    :type column: String
+    :param rows: Positions of the rows in which the column is missing.
+    :type rows: numpy.ndarray
+    :param na_mask: The mask of originally missing values.
+    :type na_mask: pandas.DataFrame
+    :param models: The models of the categorical columns.
+    :type models: dict
+    :return: The imputed values, in the same order as rows.
+    :rtype: numpy.ndarray
+    """
+    predictors = [other for other in data.columns if other != column]
+    if column not in models:
+        models[column] = linear_model.LogisticRegression(warm_start=True)
+    model = fit_logistic_regression(
+        data, column, predictors, ~na_mask[column].to_numpy(),
+        models[column])
+    return model.predict(data.iloc[rows, data.columns.get_indexer(predictors)])
+
+
+def get_imputation_summary(res, data, na_mask, columns_with_na):
+    """Auxiliary function that summarizes the imputed values of each column
+    in order to check the convergence of the sweeps: the mean and the
+    variance of the imputed values of numeric columns, relative to the
+    standard deviation and the variance of the observed values, and the
+    imputed values themselves of categorical columns.
+
+    :param res: The imputed data.
+    :type res: pandas.DataFrame
+    :param data: The original data.
+    :type data: pandas.DataFrame
+    :param na_mask: The mask of originally missing values.
+    :type na_mask: pandas.DataFrame
+    :param columns_with_na: The columns with missing values.
+    :type columns_with_na: list
+    :return: The summary of each column.
+    :rtype: dict
+    """
+    summary = {}
     for column in columns_with_na:
+        imputed = res.loc[na_mask[column], column]
         if is_numeric_dtype(data[column]):
-            res.loc[na_mask[column], column] = np.nan
-            linear_regression(res, column, predictors=numerics, inplace=True)
+            scale = data[column].std()
+            if not scale > 0:
+                scale = 1.
+            summary[column] = np.array([
+                imputed.mean() / scale, imputed.var(ddof=0) / scale ** 2])
         else:
-            res.loc[na_mask[column], column] = None
-            logistic_regression(res, column, inplace=True)
-    return res
+            summary[column] = imputed.to_numpy()
+    return summary
+
 
+def has_converged(previous, current, tol):
+    """Auxiliary function that checks whether the imputed values of all
+    columns changed by less than tol between two sweeps.
+
+    :param previous: The summary of the previous sweep.
+    :type previous: dict
+    :param current: The summary of the current sweep.
+    :type current: dict
+    :param tol: The tolerance.
+    :type tol: scalar
+    :return: Whether the sweeps have converged.
+    :rtype: bool
+    """
+    for column, values in current.items():
+        if values.dtype == object:
+            change = np.mean(values != previous[column])
+        else:
+            change = np.nanmax(np.abs(values - previous[column]))
+        if change >= tol:
+            return False
+    return True
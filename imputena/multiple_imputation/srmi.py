@@ -1,10 +1,23 @@
 import pandas as pd
 from sklearn import linear_model
-from imputena.simple_imputation.linear_regression import get_imputed_row
+from imputena.simple_imputation.linear_regression import (
+    get_imputed_values, get_equation)
+from imputena.simple_imputation.utils import (
+    get_predictor_patterns, compute_regression_statistics, solve_regression,
+    get_random_generator)
 import logging
 
+from imputena.parallel import run_imputations
+from imputena.instrumentation import stage
 
-def srmi(data=None, sample_size=10, imputations=3, regressions='available'):
+# Logger of the regressions, whose messages are only formatted if INFO is
+# enabled:
+logger = logging.getLogger(__name__)
+
+
+def srmi(
+        data=None, sample_size=10, imputations=3, regressions='available',
+        solver='sklearn', n_jobs=1, random_state=None):
     """Performs sequential regression multiple imputation on the data.
     Several (parameter imputations) imputations are performed and the
     resulting dataframes returned as a list. For each one, a regression
@@ -15,7 +28,14 @@ def srmi(data=None, sample_size=10, imputations=3, regressions='available'):
     predictors in calculated just to impute those values where the
     predictor(s) are missing. This behavior can be changed by assigning to
     the parameter regressions the value 'complete'. In this case, rows in
-    which a predictor variable is missing do not get imputed.
+    which a predictor variable is missing do not get imputed. With
+    solver='gram' or solver='pairwise', a single sample is drawn for each
+    column and the regressions for all predictor combinations are solved
+    from its cross-product matrices. The imputations are independent of
+    each other and can be run on a pool of processes by setting n_jobs.
+    Each imputation draws its samples from its own random number generator,
+    spawned from random_state, so that the results are reproducible and do
+    not depend on n_jobs.
 
     :param data: The data on which to perform the SRMI.
     :type data: pandas.DataFrame
@@ -30,6 +50,24 @@ def srmi(data=None, sample_size=10, imputations=3, regressions='available'):
         regression model based on all predictors and leave missing values in
         rows in which some predictor value is missing itself unimputed.
     :type regressions: {'available', 'complete'}, default 'available'
+    :param solver: If 'sklearn': Fit a regression model on a sample of the
+        rows in which the dependent variable and the predictors in use are
+        available, for each combination of predictors. If 'gram': Sample
+        the rows in which the dependent variable and all predictors are
+        available and solve each combination from their cross-product
+        matrices. If 'pairwise': Sample the rows in which the dependent
+        variable is available and accumulate the cross-product matrices
+        over pairwise-available observations.
+    :type solver: {'sklearn', 'gram', 'pairwise'}, default 'sklearn'
+    :param n_jobs: The number of processes on which to run the imputations.
+        If -1, the number of CPUs is used. The data is shared with the
+        processes instead of being copied for each imputation.
+    :type n_jobs: int, default 1
+    :param random_state: The seed or generator from which the generators of
+        the imputations are spawned. If None, a seed is drawn from numpy's
+        global random state.
+    :type random_state: int, numpy.random.SeedSequence or
+        numpy.random.Generator, optional
     :return: A list of linear regression imputations performed based on
         regression models calculated from different samples.
     :rtype: list of pandas.DataFrame
@@ -45,17 +83,19 @@ def srmi(data=None, sample_size=10, imputations=3, regressions='available'):
         do_available_regressions = False
     else:
         raise ValueError(regressions + 'could not be understood')
-    # Create the list that will be returned
-    imputed_datasets = []
-    # Impute several times and add the results to the list:
-    for _ in range(imputations):
-        imputed_datasets.append(
-            srmi_one_imputation(data, sample_size, do_available_regressions))
-    # Return the imputed datasets:
-    return imputed_datasets
+    # Check if the solver has a valid value:
+    if solver not in ['sklearn', 'gram', 'pairwise']:
+        raise ValueError(solver + ' is not a supported solver.')
+    # Impute several times and return the list of imputed datasets:
+    return run_imputations(
+        srmi_one_imputation, data, imputations, n_jobs, random_state,
+        sample_size=sample_size,
+        do_available_regressions=do_available_regressions, solver=solver)
 
 
-def srmi_one_imputation(data, sample_size, do_available_regressions):
+def srmi_one_imputation(
+        data, sample_size, do_available_regressions, solver='sklearn',
+        random_state=None):
     """Auxiliary function that performs one linear regression imputation,
     creating the regression model based on a sample.
 
@@ -67,28 +107,41 @@ def srmi_one_imputation(data, sample_size, do_available_regressions):
     :param do_available_regressions: Whether to do regressions for all
         available predictor combinations or only on complete ones
     :type do_available_regressions: bool
+    :param solver: How to fit the regression models (see srmi()).
+    :type solver: {'sklearn', 'gram', 'pairwise'}, default 'sklearn'
+    :param random_state: The seed or generator from which to draw the
+        samples.
+    :type random_state: int, numpy.random.SeedSequence or
+        numpy.random.Generator, optional
     :return: The dataframe with one linear regression imputation performed
         for all columns with missing values, based on a model created from a
         sample.
     :rtype: pandas.DataFrame
     """
+    # Random number generator from which to draw the samples:
+    rng = get_random_generator(random_state)
     # This auxiliary function always returns a copy:
     res = data.copy()
     # Impute each column that contains missing values:
     for column in data.columns:
         if data[column].isna().any():
-            res.loc[:, :] = srmi_one_dependent(
-                res, column, None, do_available_regressions, sample_size)
+            srmi_one_dependent(
+                res, column, None, do_available_regressions, sample_size,
+                solver, rng)
     # Return the result:
     return res
 
 
 def srmi_one_dependent(
-        data, dependent, predictors, do_available_regressions, sample_size):
+        data, dependent, predictors, do_available_regressions, sample_size,
+        solver='sklearn', rng=None):
     """Auxiliary function that performs linear regression imputation for the
     dependent column. The difference with srmi_step() is that in
     that function dependent can be None, in which case this function is
-    called for each column containing missing values,
+    called for each column containing missing values. The operation is
+    performed inplace: only the imputed cells of the dependent column are
+    written, and the models are fitted only on the rows in which the
+    dependent variable was available before the operation.
 
     :param data: The data on which to perform the linear regression imputation.
     :type data: pandas.DataFrame
@@ -104,55 +157,59 @@ def srmi_one_dependent(
     :param sample_size: Maximum size of the set of rows used to compute the
         regression model.
     :type sample_size: scalar
-    :return: The dataframe with linear regression imputation performed for the
-        incomplete variable.
-    :rtype: pandas.DataFrame
+    :param solver: How to fit the regression models (see srmi()).
+    :type solver: {'sklearn', 'gram', 'pairwise'}, default 'sklearn'
+    :param rng: The random number generator from which to draw the samples.
+    :type rng: numpy.random.Generator, optional
     """
-    # THis auxiliary function always returns a copy:
-    res = data.copy()
     # If predictors is None, all variables except for the dependent one are
     # considered predictors:
     if predictors is None:
         predictors = list(data.columns)
         predictors.remove(dependent)
-    # Predictor combination sets and lists
-    limited_predictors_combs = set()
-    predictors_combs_done = []
-    predictors_combs_todo = [tuple(predictors)]
+    # Compute the predictor combinations and the rows to impute with each:
+    patterns = get_predictor_patterns(
+        data, dependent, predictors, do_available_regressions)
+    dependent_loc = data.columns.get_loc(dependent)
+    # Rows in which the dependent variable is available:
+    observed = data[dependent].notna().to_numpy()
+    # Accumulate the statistics of all regressions from a single sample if
+    # requested:
+    statistics = None
+    if solver != 'sklearn' and len(patterns) > 0:
+        variables = list(predictors) + [dependent]
+        if solver == 'gram':
+            data_observed = data[variables].dropna()
+        else:
+            data_observed = data.loc[observed, variables]
+        if len(data_observed) > sample_size:
+            data_observed = data_observed.sample(
+                sample_size, random_state=rng)
+        with stage('srmi.statistics', len(data_observed)):
+            statistics = compute_regression_statistics(
+                data_observed, dependent, predictors, solver == 'pairwise')
     # Perform the operation:
-    while len(predictors_combs_todo) > 0:
-        # Select iteration predictors
-        it_predictors = predictors_combs_todo.pop(0)
+    for it_predictors, rows in patterns:
         # Log iteration beginning:
-        logging.info('Applying regression imputation with predictors: ' + str(
-            it_predictors))
-        # Perform iteration:
-        res.loc[:, :] = srmi_iter(
-            res, dependent, list(it_predictors), sample_size,
-            limited_predictors_combs)
-        # Update predictor combinations done and to do
-        predictors_combs_done.append(it_predictors)
-        if do_available_regressions:
-            predictors_combs_todo = list(
-                set(limited_predictors_combs) - set(predictors_combs_done))
-        # Log iteration end:
-        logging.info('Predictor combinations done: ' + str(
-            predictors_combs_done))
-        logging.info('Predictor combinations to do: ' + str(
-            predictors_combs_todo))
-    # Return the result:
-    return res
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                'Applying regression imputation with predictors: %s on %s '
+                'rows', it_predictors, len(rows))
+        # Perform iteration, writing only the imputed cells:
+        data.iloc[rows, dependent_loc] = srmi_iter(
+            data, dependent, list(it_predictors), sample_size, rows,
+            statistics, rng, observed)
 
 
 def srmi_iter(
-        data, dependent, predictors, sample_size, limited_predictors_combs):
-    """Auxiliary function that performs (simple or multiple) linear
-    regression imputation on the data, for the dependent column only. The
-    regression model is based on a subset of all available rows that has the
-    maximum size sample_size. In rows that contain a missing value for any
-    predictor variable, the value of the dependent variable does not get
-    imputed. The operation is always performed on a copy of the data,
-    which is returned.
+        data, dependent, predictors, sample_size, rows, statistics=None,
+        rng=None, observed=None):
+    """Auxiliary function that computes the (simple or multiple) linear
+    regression of the dependent variable on the predictors and returns the
+    imputed values for the given rows, in which the dependent variable is
+    missing and all predictors are available. The regression model is based
+    on a subset of all available rows that has the maximum size sample_size.
+    If statistics are given, the regression is solved from them instead.
 
     :param data: The data on which to perform the linear regression imputation.
     :type data: pandas.DataFrame
@@ -165,42 +222,54 @@ def srmi_iter(
     :param sample_size: Maximum size of the set of rows used to compute the
         regression model.
     :type sample_size: scalar
-    :param limited_predictors_combs: Reference to the set which contains all
-        limited predictor combinations that are necessary to use because
-        some predictor had a missing value in some row.
-    :type limited_predictors_combs: set
-    :return: A copy of the dataframe with linear regression imputation
-        performed for the incomplete variable.
-    :rtype: pandas.DataFrame
+    :param rows: Positions of the rows to impute.
+    :type rows: numpy.ndarray
+    :param statistics: The statistics returned by
+        compute_regression_statistics(), or None to fit a model.
+    :type statistics: dict, optional
+    :param rng: The random number generator from which to draw the sample.
+    :type rng: numpy.random.Generator, optional
+    :param observed: Whether the dependent variable is available in each row
+        of the data, used to select the rows on which the model is fitted.
+        If None, all rows in which it is available are used.
+    :type observed: numpy.ndarray, optional
+    :return: The imputed values, in the same order as rows.
+    :rtype: numpy.ndarray
     """
-    # Perform pairwise deletion before calculating the regression
-    data_pairwise_deleted = data.copy()
-    variables = predictors.copy()
-    variables.append(dependent)
-    data_pairwise_deleted.dropna(subset=variables, inplace=True)
-    # Select sample_size random values from data_pairwise_deleted:
-    data_sampled = data_pairwise_deleted
-    if len(data_pairwise_deleted) > sample_size:
-        data_sampled = data_pairwise_deleted.sample(sample_size)
-    # Calculate the regression:
-    x = data_sampled[predictors]
-    y = data_sampled[dependent]
-    model = linear_model.LinearRegression()
-    model.fit(x, y)
-    # Extract the regression parameters from the model
-    intercept = model.intercept_
-    coefs = model.coef_
+    if statistics is None:
+        # Perform pairwise deletion before calculating the regression,
+        # reading only the needed columns:
+        variables = predictors.copy()
+        variables.append(dependent)
+        if observed is None:
+            data_pairwise_deleted = data[variables].dropna()
+        else:
+            data_pairwise_deleted = data.loc[observed, variables].dropna()
+        # Select sample_size random values from data_pairwise_deleted:
+        data_sampled = data_pairwise_deleted
+        if len(data_pairwise_deleted) > sample_size:
+            data_sampled = data_pairwise_deleted.sample(
+                sample_size, random_state=rng)
+        # Calculate the regression:
+        x = data_sampled[predictors]
+        y = data_sampled[dependent]
+        with stage('srmi.fit', len(x), x.size):
+            model = linear_model.LinearRegression()
+            model.fit(x, y)
+            # Extract the regression parameters from the model
+            intercept = model.intercept_
+            coefs = model.coef_
+    else:
+        # Solve the regression from the accumulated statistics:
+        with stage('srmi.fit'):
+            intercept, coefs, _ = solve_regression(
+                statistics, dependent, predictors)
     # Log regression equation:
-    eq = str(dependent) + ' = ' + str(intercept)
-    for idx, coef in enumerate(coefs):
-        eq += ' + ' + str(coef) + '*' + predictors[idx]
-    logging.info('Regression equation: ' + eq)
-    # Calculate standard error:
-    std_error = (model.predict(x) - y).std()
-    logging.info('Standard error: ' + str(std_error))
-    # Implementation using apply:
-    return data.apply(
-        lambda row: get_imputed_row(
-            row, dependent, predictors, intercept, coefs, False, std_error,
-            limited_predictors_combs),
-        axis=1, result_type='broadcast')
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            'Regression equation: %s', get_equation(
+                dependent, predictors, intercept, coefs))
+    # Compute the imputed values with a single matrix product:
+    with stage('srmi.apply', len(rows), len(rows) * len(predictors)):
+        return get_imputed_values(
+            data, predictors, intercept, coefs, False, None, rows)
@@ -0,0 +1,223 @@
+"""Auxiliary functions used to run independent imputations on a process
+pool.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from imputena.simple_imputation.utils import spawn_random_generators
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+
+
+# Data shared with the tasks of a worker process, set by init_worker():
+_worker_data = None
+# Shared memory block attached by a worker process. A reference is kept so
+# that the buffer remains valid while the worker is alive:
+_worker_block = None
+
+
+def get_n_workers(n_jobs, n_tasks):
+    """Auxiliary function that computes the number of worker processes to
+    use for a number of tasks.
+
+    :param n_jobs: The maximum number of worker processes. If -1, the number
+        of CPUs is used.
+    :type n_jobs: int
+    :param n_tasks: The number of tasks to run.
+    :type n_tasks: int
+    :return: The number of worker processes.
+    :rtype: int
+    :raises: ValueError
+    """
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    if not isinstance(n_jobs, int) or n_jobs < 1:
+        raise ValueError(
+            'n_jobs has to be a positive integer or -1, but is {}.'.format(
+                n_jobs))
+    return max(1, min(n_jobs, n_tasks))
+
+
+def share_dataframe(data):
+    """Auxiliary function that prepares a dataframe to be sent to the worker
+    processes. The float64 columns are copied into a shared memory block,
+    which the workers attach to instead of receiving a copy. The remaining
+    columns are pickled, once per worker.
+
+    :param data: The dataframe to share.
+    :type data: pandas.DataFrame
+    :return: The description of the shared dataframe, to be passed to
+        attach_dataframe(), and the shared memory block, which has to be
+        released with release_block() once the workers are done, or None.
+    :rtype: (dict, multiprocessing.shared_memory.SharedMemory or None)
+    """
+    float_columns = [
+        column for column in data.columns
+        if data[column].dtype == np.float64]
+    if shared_memory is None or len(float_columns) == 0 or len(data) == 0:
+        return {'data': data}, None
+    values = data[float_columns].to_numpy(dtype=np.float64)
+    block = shared_memory.SharedMemory(create=True, size=values.nbytes)
+    shared = np.ndarray(values.shape, dtype=np.float64, buffer=block.buf)
+    shared[:] = values
+    description = {
+        'block': block.name,
+        'shape': values.shape,
+        'float_columns': float_columns,
+        'other': data.drop(columns=float_columns),
+        'columns': data.columns,
+        'index': data.index}
+    return description, block
+
+
+def attach_dataframe(description):
+    """Auxiliary function that rebuilds, in a worker process, a dataframe
+    shared with share_dataframe().
+
+    :param description: The description returned by share_dataframe().
+    :type description: dict
+    :return: The shared dataframe and the shared memory block it uses, or
+        None.
+    :rtype: (pandas.DataFrame, multiprocessing.shared_memory.SharedMemory)
+    """
+    if 'data' in description:
+        return description['data'], None
+    block = shared_memory.SharedMemory(name=description['block'])
+    values = np.ndarray(
+        description['shape'], dtype=np.float64, buffer=block.buf)
+    floats = pd.DataFrame(
+        values, columns=description['float_columns'],
+        index=description['index'], copy=False)
+    if len(description['other'].columns) == 0 and list(
+            description['columns']) == description['float_columns']:
+        return floats, block
+    data = pd.concat([floats, description['other']], axis=1)
+    return data[description['columns']], block
+
+
+def release_block(block):
+    """Auxiliary function that releases a shared memory block created by
+    share_dataframe().
+
+    :param block: The block to release, or None.
+    :type block: multiprocessing.shared_memory.SharedMemory or None
+    """
+    if block is not None:
+        block.close()
+        block.unlink()
+
+
+def init_worker(description):
+    """Auxiliary function that initializes a worker process by attaching to
+    the shared dataframe.
+
+    :param description: The description returned by share_dataframe().
+    :type description: dict
+    """
+    global _worker_data, _worker_block
+    _worker_data, _worker_block = attach_dataframe(description)
+
+
+def run_task(function, rng, kwargs):
+    """Auxiliary function that runs one imputation in a worker process on
+    the shared dataframe.
+
+    :param function: The imputation function, which receives the data as
+        first argument.
+    :type function: callable
+    :param rng: The random number generator of the task.
+    :type rng: numpy.random.Generator
+    :param kwargs: Other arguments of the imputation function.
+    :type kwargs: dict
+    :return: The result of the imputation function.
+    """
+    return function(_worker_data, random_state=rng, **kwargs)
+
+
+def run_imputations(
+        function, data, imputations, n_jobs, random_state=None, **kwargs):
+    """Auxiliary function that runs several independent imputations of the
+    data and returns their results. Each imputation receives, as argument
+    random_state, its own random number generator, spawned from
+    random_state, so that the results do not depend on n_jobs. If a single
+    worker is needed (n_jobs is 1, or there is a single imputation or CPU),
+    the imputations are run one after another in the current process.
+    Otherwise, they are run on a pool of worker processes that share the
+    data.
+
+    :param function: The function performing one imputation, which receives
+        the data as first argument. It has to be defined at module level.
+    :type function: callable
+    :param data: The data to impute.
+    :type data: pandas.DataFrame
+    :param imputations: The number of imputations.
+    :type imputations: int
+    :param n_jobs: The maximum number of worker processes. If -1, the number
+        of CPUs is used.
+    :type n_jobs: int
+    :param random_state: The seed or generator from which the generators of
+        the imputations are spawned. If None, a seed is drawn from numpy's
+        global random state.
+    :type random_state: int, numpy.random.SeedSequence or
+        numpy.random.Generator, optional
+    :param kwargs: Other arguments of the imputation function.
+    :return: The results of the imputations.
+    :rtype: list
+    :raises: ValueError
+    """
+    n_workers = get_n_workers(n_jobs, imputations)
+    generators = spawn_random_generators(random_state, imputations)
+    if n_workers == 1:
+        return [
+            function(data, random_state=rng, **kwargs) for rng in generators]
+    description, block = share_dataframe(data)
+    try:
+        with ProcessPoolExecutor(
+                max_workers=n_workers, initializer=init_worker,
+                initargs=(description,)) as executor:
+            futures = [
+                executor.submit(run_task, function, rng, kwargs)
+                for rng in generators]
+            return [future.result() for future in futures]
+    finally:
+        release_block(block)
+
+
+def run_on_column_chunks(function, data, n_jobs, **kwargs):
+    """Auxiliary function that applies a function to the columns of a
+    dataframe. If n_jobs is 1, the function is applied to the whole
+    dataframe. Otherwise, the columns are split into one chunk per worker
+    process and the function is applied to each chunk on a pool of worker
+    processes.
+
+    :param function: The function, which receives a dataframe as first
+        argument and returns a dataframe with the same columns. It has to be
+        defined at module level.
+    :type function: callable
+    :param data: The dataframe.
+    :type data: pandas.DataFrame
+    :param n_jobs: The maximum number of worker processes. If -1, the number
+        of CPUs is used.
+    :type n_jobs: int
+    :param kwargs: Other arguments of the function.
+    :return: The results of the function on all columns.
+    :rtype: pandas.DataFrame
+    :raises: ValueError
+    """
+    n_workers = get_n_workers(n_jobs, len(data.columns))
+    if n_workers == 1:
+        return function(data, **kwargs)
+    chunks = [
+        data.iloc[:, locs]
+        for locs in np.array_split(np.arange(len(data.columns)), n_workers)]
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        futures = [
+            executor.submit(function, chunk, **kwargs) for chunk in chunks]
+        return pd.concat([future.result() for future in futures], axis=1)
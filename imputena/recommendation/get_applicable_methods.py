@@ -1,28 +1,32 @@
 import pandas as pd
 
-from .utils import (
-    is_series, is_dataframe, is_categorical, is_numeric,
-    contains_categorical, contains_only_categorical, is_temporal)
+from .utils import is_series, is_dataframe, get_profile
 
 
-def get_applicable_methods(data=None):
+def get_applicable_methods(data=None, profile=None):
     """Informs about the imputation methods that are applicable to a given
     data frame or series, based on the number of variables (one or
     multiple), type of data (categorical, numerical, o both), and whether
-    the data is of temporal nature.
+    the data is of temporal nature. These properties are taken from the
+    missingness profile of the data, if given.
 
     :param data: The data for which an the applicable imputation method
         should be returned.
     :type data: pandas.Series or pandas.DataFrame
+    :param profile: The missingness profile of the data. If None, it is
+        computed.
+    :type profile: MissingnessProfile, optional
     :return: The imputation methods that are applicable to the data
     :rtype: set of strings
-    :raises: TypeError
+    :raises: TypeError, ValueError
     """
     # Check that data is a Series or Dataframe:
     if not (isinstance(data, pd.Series) or isinstance(data, pd.DataFrame)):
         raise TypeError(
             'The data has to be a Series or DataFrame but is a {}.'.format(
                 type(data).__name__))
+    # Profile of the data:
+    profile = get_profile(data, profile)
     # Definition of sets:
     applicable_to_cat_only = {
         'logistic regression imputation'
@@ -76,8 +80,8 @@ def get_applicable_methods(data=None):
     # Applicability:
     res = set()
     if is_series(data):
-        if is_categorical(data):
-            if is_temporal(data):
+        if profile.is_categorical(profile.columns[0]):
+            if profile.temporal:
                 res = applicable_to_series.intersection(
                     applicable_to_cat
                 )
@@ -86,7 +90,7 @@ def get_applicable_methods(data=None):
                     applicable_to_cat.intersection(does_not_require_temp)
                 )
         else:
-            if is_temporal(data):
+            if profile.temporal:
                 res = applicable_to_series.intersection(
                     applicable_to_num
                 )
@@ -95,19 +99,19 @@ def get_applicable_methods(data=None):
                     applicable_to_num.intersection(does_not_require_temp)
                 )
     if is_dataframe(data):
-        if contains_only_categorical(data):
-            if is_temporal(data):
+        if profile.contains_only_categorical():
+            if profile.temporal:
                 res = applicable_to_cat
             else:
                 res = applicable_to_cat.intersection(does_not_require_temp)
-        elif contains_categorical(data):
-            if is_temporal(data):
+        elif profile.contains_categorical():
+            if profile.temporal:
                 res = applicable_to_cat_and_num
             else:
                 res = applicable_to_cat_and_num.intersection(
                     does_not_require_temp)
         else:
-            if is_temporal(data):
+            if profile.temporal:
                 res = applicable_to_num
             else:
                 res = applicable_to_num.intersection(does_not_require_temp)
@@ -1,12 +1,16 @@
 import pandas as pd
 
-from .utils import is_series, is_dataframe
-from imputena import *
+import imputena
+from .utils import is_series, is_dataframe, get_profile
+from .recommend_method import recommend_method
+from imputena.instrumentation import stage
 
 
-def impute_by_recommended(data=None, column=None, inplace=False):
+def impute_by_recommended(data=None, column=None, inplace=False, profile=None):
     """Imputes a series, dataframe or particular column of a dataframe with
-    the best imputation method for the given data.
+    the best imputation method for the given data. The missingness profile
+    of the data is computed once, if not given, and used both to recommend
+    the method and to restrict it to the columns with missing values.
 
     :param data: The data that should be imputed.
     :type data: pandas.Series or pandas.DataFrame
@@ -14,6 +18,9 @@ def impute_by_recommended(data=None, column=None, inplace=False):
     :type column: string, optional
     :param inplace: If True, do operation inplace and return None.
     :type inplace: bool, default False
+    :param profile: The missingness profile of the data. If None, it is
+        computed.
+    :type profile: MissingnessProfile, optional
     :rtype: pandas.Series, pandas.DataFrame, or None
     :raises: TypeError, ValueError
     """
@@ -25,43 +32,52 @@ def impute_by_recommended(data=None, column=None, inplace=False):
         raise ValueError(
             'A column can only be specified if the data is a DataFrame.')
     # Get recommended method:
-    method = recommend_method(data, column, title_only=True)
+    with stage('impute_by_recommended.recommend', len(data), data.size):
+        profile = get_profile(data, profile)
+        method = recommend_method(
+            data, column, title_only=True, profile=profile)
     # Assign a reference or copy to res, depending on inplace:
     if inplace:
         res = data
     else:
-        res = data.copy()
-    # Treatment if the data is a series:
-    if is_series(data):
-        if method == 'random sample imputation':
-            res.loc[:] = random_sample_imputation(data, inplace=inplace)
-        elif method == 'interpolation with seasonal adjustment':
-            res.loc[:] = seasonal_interpolation(data, inplace=inplace)
-        elif method == 'mean substitution':
-            res.loc[:] = mean_substitution(data, inplace=inplace)
-    # Treatment for a whole dataframe
-    elif is_dataframe(data) and column is None:
-        if method == 'most-frequent substitution':
-            res.loc[:, :] = most_frequent(data)
-        elif method == 'imputation using k-NN':
-            res.loc[:, :] = knn(data, inplace=inplace)
-    # Treatment for a column of a dataframe:
-    elif is_dataframe(data) and column is not None:
-        if method == 'logistic regression imputation':
-            res.loc[:, :] = logistic_regression(
-                data, dependent=column, inplace=inplace)
-        elif method == 'interpolation with seasonal adjustment':
-            res.loc[:, :] = seasonal_interpolation(
-                data, columns=[column], inplace=inplace)
-        elif method == 'mean substitution':
-            res.loc[:, :] = mean_substitution(
-                data, columns=[column], inplace=inplace)
-        elif method == 'linear regression imputation':
-            res.loc[:, :] = linear_regression(
-                data, dependent=column, inplace=inplace)
-        elif method == 'imputation using k-NN':
-            res.loc[:, :] = knn(
-                data, columns=[column], inplace=inplace)
+        with stage('impute_by_recommended.copy', len(data), data.size):
+            res = data.copy()
+    # Apply the recommended method:
+    with stage('impute_by_recommended.impute', len(data), data.size):
+        # Treatment if the data is a series:
+        if is_series(data):
+            if method == 'random sample imputation':
+                res.loc[:] = imputena.random_sample_imputation(
+                    data, inplace=inplace)
+            elif method == 'interpolation with seasonal adjustment':
+                res.loc[:] = imputena.seasonal_interpolation(
+                    data, inplace=inplace)
+            elif method == 'mean substitution':
+                res.loc[:] = imputena.mean_substitution(data, inplace=inplace)
+        # Treatment for a whole dataframe
+        elif is_dataframe(data) and column is None:
+            if method == 'most-frequent substitution':
+                res.loc[:, :] = imputena.most_frequent(
+                    data, columns=profile.get_columns_with_na())
+            elif method == 'imputation using k-NN':
+                res.loc[:, :] = imputena.knn(data, inplace=inplace)
+        # Treatment for a column of a dataframe:
+        elif is_dataframe(data) and column is not None:
+            if method == 'logistic regression imputation':
+                res.loc[:, :] = imputena.logistic_regression(
+                    data, dependent=column, inplace=inplace)
+            elif method == 'interpolation with seasonal adjustment':
+                res.loc[:, :] = imputena.seasonal_interpolation(
+                    data, columns=[column], inplace=inplace)
+            elif method == 'mean substitution':
+                res.loc[:, :] = imputena.mean_substitution(
+                    data, columns=[column], inplace=inplace)
+            elif method == 'linear regression imputation':
+                res.loc[:, :] = imputena.linear_regression(
+                    data, dependent=column, inplace=inplace)
+            elif method == 'imputation using k-NN':
+                res.loc[:, :] = imputena.knn(
+                    data, columns=[column], inplace=inplace)
     # Return the imputed data, or None if inplace:
     if inplace:
         return None
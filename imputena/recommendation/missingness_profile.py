@@ -0,0 +1,192 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+
+class MissingnessProfile:
+    """Profile of the missing values of a series or data frame: the number
+    of missing values of each column, whether each column is numeric or
+    categorical and whether the data is temporal. The types and the
+    temporal nature are read from the dtypes and the index when the profile
+    is created, and the counts of missing values when they are first
+    needed. The profile keeps a reference to the data and only matches that
+    same object, as long as its columns, types and counts of missing values
+    have not changed. It can be passed to get_applicable_methods(),
+    recommend_method() and impute_by_recommended() so that they do not scan
+    the data again, and it caches the correlations computed by the
+    recommendations. A series is profiled as a single column named like the
+    series, or 0 if it has no name.
+
+    :param data: The data to profile.
+    :type data: pandas.Series or pandas.DataFrame
+    :raises: TypeError
+    """
+
+    def __init__(self, data=None):
+        # Check that data is a Series or Dataframe:
+        if not (isinstance(data, pd.Series) or isinstance(data, pd.DataFrame)):
+            raise TypeError('The data has to be a Series or DataFrame.')
+        self._data = data
+        self.is_series = isinstance(data, pd.Series)
+        if self.is_series:
+            name = 0 if data.name is None else data.name
+            self.columns = pd.Index([name])
+        else:
+            self.columns = data.columns
+        self.rows = len(data)
+        self.temporal = isinstance(data.index, pd.DatetimeIndex)
+        self.numeric = self._get_numeric(data)
+        # Counts of missing values, computed when first needed:
+        self._na_counts = None
+        # Correlations of the columns with the other numeric columns,
+        # computed when a recommendation first needs them:
+        self.correlations = {}
+
+    @property
+    def na_counts(self):
+        """The number of missing values of each column, as a pandas.Series
+        indexed by column.
+        """
+        if self._na_counts is None:
+            self._na_counts = self._count_na(self._data)
+        return self._na_counts
+
+    def _get_numeric(self, data):
+        """Checks which columns of the data are numeric.
+
+        :param data: The data.
+        :type data: pandas.Series or pandas.DataFrame
+        :return: Whether each column is numeric, indexed by column.
+        :rtype: pandas.Series
+        """
+        dtypes = [data.dtype] if self.is_series else list(data.dtypes)
+        return pd.Series(
+            [is_numeric_dtype(dtype) for dtype in dtypes],
+            index=self.columns, dtype=bool)
+
+    def _count_na(self, data):
+        """Counts the missing values of each column of the data.
+
+        :param data: The data.
+        :type data: pandas.Series or pandas.DataFrame
+        :return: The number of missing values, indexed by column.
+        :rtype: pandas.Series
+        """
+        mask = data.isna().to_numpy()
+        if self.is_series:
+            mask = mask[:, None]
+        return pd.Series(
+            mask.sum(axis=0), index=self.columns, dtype=np.int64)
+
+    def add_correlations(self, column, correlations):
+        """Caches the correlations of a column with the other numeric
+        columns. The counts of missing values are computed as well, if they
+        were not yet, so that matches() detects a later change of the data
+        that would make the cached correlations wrong.
+
+        :param column: The column.
+        :param correlations: The correlations of the column.
+        :type correlations: pandas.Series
+        """
+        if self._na_counts is None:
+            self._na_counts = self._count_na(self._data)
+        self.correlations[column] = correlations
+
+    def get_pattern_counts(self):
+        """Counts the rows with each pattern of missing columns, from the
+        most to the least frequent pattern. The rows of the mask of missing
+        values are packed into bytes and compared as single values.
+
+        :return: The number of rows of each pattern, indexed by the tuple of
+            the missing columns.
+        :rtype: pandas.Series
+        """
+        mask = self._data.isna().to_numpy()
+        if self.is_series:
+            mask = mask[:, None]
+        rows = np.ascontiguousarray(np.packbits(mask, axis=1))
+        keys = rows.view(np.dtype((np.void, rows.shape[1]))).ravel()
+        _, first, counts = np.unique(
+            keys, return_index=True, return_counts=True)
+        order = np.argsort(-counts, kind='stable')
+        patterns = np.unpackbits(
+            rows[first[order]], axis=1, count=len(self.columns)).astype(bool)
+        return pd.Series(
+            counts[order], index=pd.Index(
+                [tuple(self.columns[pattern]) for pattern in patterns],
+                tupleize_cols=False),
+            dtype=np.int64)
+
+    def is_categorical(self, column):
+        """Checks whether a column contains categorical values.
+
+        :param column: The column.
+        :return: Whether the column contains categorical values.
+        :rtype: bool
+        """
+        return not self.numeric[column]
+
+    def contains_categorical(self):
+        """Checks whether at least one column contains categorical values.
+
+        :return: Whether at least one column contains categorical values.
+        :rtype: bool
+        """
+        return not self.numeric.all()
+
+    def contains_only_categorical(self):
+        """Checks whether all columns contain categorical values.
+
+        :return: Whether all columns contain categorical values.
+        :rtype: bool
+        """
+        return not self.numeric.any()
+
+    def get_na_rate(self, column):
+        """Computes the share of missing values of a column.
+
+        :param column: The column.
+        :return: The share of missing values.
+        :rtype: float
+        """
+        if self._na_counts is not None:
+            return self._na_counts[column] / self.rows
+        # Count the missing values of this column only:
+        series = self._data if self.is_series else self._data[column]
+        return series.isna().sum() / self.rows
+
+    def get_columns_with_na(self):
+        """Returns the columns that contain missing values.
+
+        :return: The columns with missing values.
+        :rtype: list
+        """
+        if self._na_counts is not None:
+            has_na = self._na_counts.to_numpy() > 0
+        else:
+            has_na = np.atleast_1d(self._data.isna().any())
+        return list(self.columns[has_na])
+
+    def matches(self, data):
+        """Checks whether the profile describes the given data: the same
+        object as the profiled data, with the same number of rows, columns
+        and types, and, if they have been computed, the same counts of
+        missing values.
+
+        :param data: The data.
+        :type data: pandas.Series or pandas.DataFrame
+        :return: Whether the profile matches the data.
+        :rtype: bool
+        """
+        if data is not self._data or len(data) != self.rows:
+            return False
+        if isinstance(data, pd.Series):
+            name = 0 if data.name is None else data.name
+            if list(self.columns) != [name]:
+                return False
+        elif not self.columns.equals(data.columns):
+            return False
+        if not self._get_numeric(data).equals(self.numeric):
+            return False
+        return self._na_counts is None or \
+            self._count_na(data).equals(self._na_counts)
@@ -2,15 +2,16 @@ import pandas as pd
 
 
 from .utils import (
-    is_series, is_dataframe, is_categorical, contains_categorical,
-    is_temporal, has_lt_10_percent_na, has_gt_80_percent_cor)
+    is_series, is_dataframe, get_profile, has_gt_80_percent_cor)
 
 
-def recommend_method(data=None, column=None, title_only=False):
+def recommend_method(data=None, column=None, title_only=False, profile=None):
     """Recommends an imputation method to use on a series, data frame,
     or particular column of a data frame. If data_only is True, only the
     title of the recommended method is returned, otherwise a description of
-    the decision process is provided as well.
+    the decision process is provided as well. The types, the temporal
+    nature and the rates of missing values of the data are taken from its
+    missingness profile, if given.
 
     :param data: The data for which an imputation method should be recommended.
     :type data: pandas.Series or pandas.DataFrame
@@ -21,9 +22,13 @@ def recommend_method(data=None, column=None, title_only=False):
         method, otherwise provide a description of the decision process as
         well.
     :type title_only: bool, default False
+    :param profile: The missingness profile of the data. If None, it is
+        computed.
+    :type profile: MissingnessProfile, optional
     :return: The title of the recommended imputation method and a
         description of the decision model if title_only is False.
     :rtype: string
+    :raises: TypeError, ValueError
     """
     # Check that data is a Series or Dataframe:
     if not (isinstance(data, pd.Series) or isinstance(data, pd.DataFrame)):
@@ -32,6 +37,8 @@ def recommend_method(data=None, column=None, title_only=False):
     if isinstance(data, pd.Series) and column is not None:
         raise ValueError('A column can only be specified if the data is a '
                          'DataFrame.')
+    # Profile of the data:
+    profile = get_profile(data, profile)
     # Initialize messages and method:
     messages = []
     method = None
@@ -39,14 +46,13 @@ def recommend_method(data=None, column=None, title_only=False):
     if is_series(data):
         # The data is a series.
         messages.append('The data is a series.')
-        series = data
         # Check if the series contains categorical values:
-        if is_categorical(series):
+        if profile.is_categorical(profile.columns[0]):
             messages.append('The series contains categorical values.')
             method = 'random sample imputation'
         else:
             messages.append('The series contains numerical values.')
-            if is_temporal(series):
+            if profile.temporal:
                 messages.append('The series is a time series.')
                 method = 'interpolation with seasonal adjustment'
             else:
@@ -59,7 +65,7 @@ def recommend_method(data=None, column=None, title_only=False):
             # Treatment for a whole dataframe.
             messages.append(
                 'You want to apply the same method to the whole data frame.')
-            if contains_categorical(data):
+            if profile.contains_categorical():
                 # The data frame contains categorical data.
                 messages.append('The data frame contains categorical data.')
                 method = 'most-frequent substitution'
@@ -71,12 +77,10 @@ def recommend_method(data=None, column=None, title_only=False):
         else:
             # Treatment for a specific column of a dataframe
             # Check if column is actually a column of data:
-            if column in data.columns:
-                series = data[column]
-            else:
+            if column not in data.columns:
                 raise ValueError(column + 'is not a column of the data.')
             # Check if the column contains categorical values:
-            if is_categorical(series):
+            if profile.is_categorical(column):
                 # The column contains categorical values.
                 messages.append(
                     'The column {} contains categorical values.'.format(
@@ -88,7 +92,7 @@ def recommend_method(data=None, column=None, title_only=False):
                     'The column {} contains numerical values.'.format(
                         column))
                 # Check if the column represents a time series:
-                if is_temporal(series):
+                if profile.temporal:
                     # The column represents a time series.
                     messages.append(
                         'The column {} represent a time series.'.format(
@@ -101,7 +105,7 @@ def recommend_method(data=None, column=None, title_only=False):
                         'series.'.format(column))
                     # Check if the column contains less than 10% missing
                     # values:
-                    if has_lt_10_percent_na(series):
+                    if profile.get_na_rate(column) < .1:
                         # The column contains less than 10% missing values.
                         messages.append(
                             'Less than 10% of the values in the '
@@ -114,7 +118,7 @@ def recommend_method(data=None, column=None, title_only=False):
                             '{} are missing.'.format(column))
                         # Check if the column has a correlation of more than
                         # 0.8 with any other column.
-                        if has_gt_80_percent_cor(data, column):
+                        if has_gt_80_percent_cor(data, column, profile):
                             # The column does have a correlation of more
                             # than 0.8 with at least one other column.
                             messages.append(
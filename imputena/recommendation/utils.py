@@ -2,9 +2,12 @@
 functions.
 """
 
+import numpy as np
 import pandas as pd
 from pandas.api.types import is_numeric_dtype
 
+from .missingness_profile import MissingnessProfile
+
 
 def is_series(data):
     """Auxiliary function that checks whether the data is a series.
@@ -28,100 +31,93 @@ def is_dataframe(data):
     return isinstance(data, pd.DataFrame)
 
 
-def is_numeric(series):
-    """Auxiliary function that checks whether a series contains numerical
-    values.
-
-    :param series: The series to check
-    :type series: pandas.Series
-    :return: Whether the series contains numerical values
-    :rtype: bool
-    """
-    return is_numeric_dtype(series)
-
-
-def is_categorical(series):
-    """Auxiliary function that checks whether a series contains categorical
-    values.
+def get_profile(data, profile=None):
+    """Auxiliary function that returns the missingness profile of the data:
+    the given profile, after checking that it matches the data, or a new
+    one.
 
-    :param series: The series to check
-    :type series: pandas.Series
-    :return: Whether the series contains categorical values
-    :rtype: bool
-    """
-    return not is_numeric(series)
-
-
-def contains_categorical(dataframe):
-    """Auxiliary function that checks whether a data frame contains categorical
-    values in at least one column.
-
-    :param dataframe: The data frame to check
-    :type dataframe: pandas.DataFrame
-    :return: Whether the data frame contains categorical values in at least
-        one column.
-    :rtype: bool
-    """
-    contains = False
-    for column in dataframe.columns:
-        if is_categorical(dataframe[column]):
-            contains = True
-            break
-    return contains
-
-
-def contains_only_categorical(dataframe):
-    """Auxiliary function that checks whether a data frame contains categorical
-    values in all columns.
-
-    :param dataframe: The data frame to check
-    :type dataframe: pandas.DataFrame
-    :return: Whether the data frame contains categorical values in at least
-        one column.
-    :rtype: bool
-    """
-    contains_only = True
-    for column in dataframe.columns:
-        if not is_categorical(dataframe[column]):
-            contains_only = False
-            break
-    return contains_only
-
-
-def is_temporal(data):
-    """Auxiliary function that checks whether a series or dataframe has a
-    datetime index is therefore temporal.
-
-    :param data: The data to check
+    :param data: The data.
     :type data: pandas.Series or pandas.DataFrame
-    :return: Whether the data has a datetime index
-    :rtype: bool
+    :param profile: The profile of the data, or None to compute it.
+    :type profile: MissingnessProfile, optional
+    :return: The profile of the data.
+    :rtype: MissingnessProfile
+    :raises: TypeError, ValueError
     """
-    return isinstance(data.index, pd.DatetimeIndex)
+    if profile is None:
+        return MissingnessProfile(data)
+    if not isinstance(profile, MissingnessProfile):
+        raise TypeError('The profile has to be a MissingnessProfile.')
+    if not profile.matches(data):
+        raise ValueError('The profile does not match the data.')
+    return profile
 
 
-def has_gt_80_percent_cor(data, column):
-    """"Auxiliary function that checks whether a specified column of a data
-    frame has a correlation of more than 0.8 with at least one other column.
+def has_gt_80_percent_cor(data, column, profile=None):
+    """Auxiliary function that checks whether a specified column of a data
+    frame has a correlation of more than 0.8 with at least one other
+    numeric column. Non-numeric columns are ignored.
 
     :param data: The data frame on which to perform the check
     :type data: pandas.DataFrame
     :param column: The column of the data frame to check
     :type column: string
+    :param profile: The missingness profile of the data, in which the
+        correlations are cached.
+    :type profile: MissingnessProfile, optional
     :return: Whether the column has a correlation of more than 0.8 with at
         least one other column.
     :rtype: bool
     """
-    return data.corr()[column].sort_values(ascending=False)[1] > 0.8
+    return bool(get_correlations(data, column, profile).max() > 0.8)
 
 
-def has_lt_10_percent_na(series):
-    """Auxiliary function that checks whether less than 10% of a series's
-    values are missing
+def get_correlations(data, column, profile=None):
+    """Auxiliary function that computes the Pearson correlations of a
+    numeric column with each other numeric column of a data frame, each one
+    over the rows in which both columns are available, as
+    pandas.DataFrame.corr() does. Only these correlations are computed,
+    instead of the whole correlation matrix, in blocks of columns. If a
+    profile is given, the correlations are cached in it and reused.
 
-    :param series: The series to check
-    :type series: pandas.Series
-    :return: Whether less than 10% of the series's values are missing
-    :rtype: bool
+    :param data: The data frame.
+    :type data: pandas.DataFrame
+    :param column: The column.
+    :type column: string
+    :param profile: The missingness profile of the data, in which the
+        correlations are cached.
+    :type profile: MissingnessProfile, optional
+    :return: The correlation of the column with each other numeric column,
+        or NA where they have less than two rows in common.
+    :rtype: pandas.Series
     """
-    return series.isna().sum() / len(series.index) < .1
\ No newline at end of file
+    if profile is not None and column in profile.correlations:
+        return profile.correlations[column]
+    others = [
+        other for other in data.columns
+        if other != column and is_numeric_dtype(data[other])]
+    correlations = pd.Series(np.nan, index=others, dtype=float)
+    if is_numeric_dtype(data[column]) and len(others) > 0:
+        y = data[column].to_numpy(dtype=float)
+        y_observed = ~np.isnan(y)
+        # Number of columns per block, so that the temporary arrays of a
+        # block have about 4 million values:
+        block = max(1, 2 ** 22 // max(len(data), 1))
+        for start in range(0, len(others), block):
+            x = data[others[start:start + block]].to_numpy(dtype=float)
+            both = ~np.isnan(x) & y_observed[:, None]
+            count = both.sum(axis=0)
+            # Center both columns on their means over the common rows:
+            y_both = np.where(both, y[:, None], 0.)
+            x_both = np.where(both, x, 0.)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                dx = np.where(both, x - x_both.sum(axis=0) / count, 0.)
+                dy = np.where(both, y[:, None] - y_both.sum(axis=0) / count,
+                              0.)
+                corr = (dx * dy).sum(axis=0) / np.sqrt(
+                    (dx ** 2).sum(axis=0) * (dy ** 2).sum(axis=0))
+            corr[count < 2] = np.nan
+            correlations.iloc[start:start + block] = np.clip(corr, -1., 1.)
+    if profile is not None:
+        profile.add_correlations(column, correlations)
+    return correlations
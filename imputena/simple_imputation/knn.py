@@ -1,14 +1,42 @@
+import copy
+
+import numpy as np
 import pandas as pd
+from sklearn import get_config
 from sklearn.impute import KNNImputer
+from sklearn.metrics.pairwise import nan_euclidean_distances
+from sklearn.neighbors import NearestNeighbors
+
+from imputena.simple_imputation.utils import get_float_dtype
+from imputena.instrumentation import stage
 
 
-def knn(data=None, columns=None, k=3, inplace=False):
+def knn(data=None, columns=None, k=3, algorithm=None, working_memory=None,
+        dtype='float64', inplace=False):
     """Performs k-nearest neighbors imputation on the data. The k nearest
     neighbors or each subject with missing data are chosen and the average
     of their values is used to impute the missing value. The operation can be
     applied to all columns, by leaving the parameter columns empty, or to
     selected columns, passed as an array of strings.
 
+    By default, the whole data frame is passed to scikit-learn's
+    KNNImputer. If columns or algorithm is set, only the rows that need
+    imputation in the selected columns are processed, in chunks whose size
+    is bounded by working_memory, against a reference set of donors. With
+    algorithm='brute', the donors are all rows in which the imputed column
+    is available and the distances are computed exactly (nan-euclidean)
+    block by block, so that the result is the same as with the default.
+    With algorithm='kd_tree' or 'ball_tree', or with a neighbor index
+    object, the donors are the complete rows, and for each pattern of
+    available columns among the rows to impute an index is built on those
+    columns of the donors and queried for the nearest neighbors.
+    Rows to impute for which no donor exists are imputed with the mean of
+    the column, as KNNImputer does. With dtype='float32', the values, the
+    distances and the other intermediate arrays are kept in single
+    precision, which halves their memory, at the cost of a relative error
+    of about 1e-6 in the imputed values, and of possibly choosing other
+    neighbors among those at almost equal distances.
+
     :param data: The data on which to perform the k-nearest neighbors
         imputation.
     :type data: pandas.DataFrame
@@ -17,6 +45,21 @@ def knn(data=None, columns=None, k=3, inplace=False):
     :param k: The number of neighbors to which the subject with missing
         values should be compared
     :type k: int, default 3
+    :param algorithm: How to search the neighbors. If None, use
+        KNNImputer on the whole data frame, or 'brute' if columns are
+        selected. If 'brute', search exactly in chunks. If 'kd_tree' or
+        'ball_tree', search with the corresponding tree built on the
+        complete rows. An unfitted neighbor index with
+        the interface of sklearn.neighbors.NearestNeighbors (fit() and
+        kneighbors()) can also be passed and is used like the trees.
+    :type algorithm: {None, 'brute', 'kd_tree', 'ball_tree'} or object,
+        default None
+    :param working_memory: The maximum size in MiB of the temporary arrays
+        (such as a chunk of the distance matrix) used by the chunked search.
+        If None, scikit-learn's working_memory setting is used.
+    :type working_memory: scalar, optional
+    :param dtype: The floating point type in which to compute.
+    :type dtype: {'float64', 'float32'}, default 'float64'
     :param inplace: If True, do operation inplace and return None.
     :type inplace: bool, default False
     :return: The series or dataframe with NA values imputed, or
@@ -27,41 +70,259 @@ def knn(data=None, columns=None, k=3, inplace=False):
     # Check if data is a dataframe:
     if not isinstance(data, pd.DataFrame):
         raise TypeError('The data has to be a DataFrame.')
+    # Check if the algorithm has a valid value:
+    if isinstance(algorithm, str):
+        if algorithm not in ['brute', 'kd_tree', 'ball_tree']:
+            raise ValueError(algorithm + ' is not a supported algorithm.')
+    elif algorithm is not None and not (
+            hasattr(algorithm, 'fit') and hasattr(algorithm, 'kneighbors')):
+        raise ValueError(
+            'The algorithm has to be a string or a neighbor index with the '
+            'methods fit() and kneighbors().')
+    # Check the floating point type:
+    dtype = get_float_dtype(dtype)
     # Assign a reference or copy to res, depending on inplace:
     if inplace:
         res = data
     else:
-        res = data.copy()
-    # The KNNImputer removes all columns that contain only empty values.
-    # Therefore, we save those values in order to add them later (otherwise
-    # problems would occur with dataframes that contain such columns:
-    empty_column_names = res.columns[res.isna().all()]
-    empty_column_indices = [
-        res.columns.get_loc(column_name) for column_name in empty_column_names]
-    empty_column_values = res.loc[:, res.isna().all()]
-    # Perform KNN:
-    knn_out_array = KNNImputer(n_neighbors=k).fit_transform(data)
-    knn_out = pd.DataFrame(knn_out_array)
-    # Add empty columns back and set indices of knn_out:
-    for i, empty_column_name in enumerate(empty_column_names):
-        knn_out.insert(
-            empty_column_indices[i], empty_column_name,
-            empty_column_values.iloc[:, i])
-    knn_out.columns = res.columns
-    knn_out.index = res.index
-    # Treatment for a whole dataframe:
-    if columns is None:
-        res.loc[:, :] = knn_out
-    # Treatment for selected columns of a dataframe:
-    else:
+        with stage('knn.copy', len(data), data.size):
+            res = data.copy()
+    # Check if each of the selected columns is actually a column of the
+    # dataframe:
+    if columns is not None:
         for column in columns:
             if column not in data.columns:
                 raise ValueError(
                     '\'' + column + '\' is not a column of the data.')
-            col_loc = data.columns.get_loc(column)
-            res[column] = knn_out.iloc[:, col_loc]
+    # Use the chunked search if requested. For selected columns, the exact
+    # chunked search is used as well, so that only the rows missing in those
+    # columns are processed:
+    if algorithm is not None or columns is not None:
+        if columns is None:
+            columns = data.columns
+        if algorithm is None:
+            algorithm = 'brute'
+        knn_chunked(data, res, columns, k, algorithm, working_memory, dtype)
+    # Treatment for a whole dataframe:
+    else:
+        # The KNNImputer removes all columns that contain only empty
+        # values. Therefore, we save those values in order to add them
+        # later (otherwise problems would occur with dataframes that
+        # contain such columns:
+        empty_mask = res.isna().all()
+        empty_column_names = res.columns[empty_mask]
+        empty_column_indices = [
+            res.columns.get_loc(column_name)
+            for column_name in empty_column_names]
+        empty_column_values = res.loc[:, empty_mask]
+        # Perform KNN:
+        values = data.to_numpy(dtype=dtype)
+        with stage('knn.fit', len(values), values.size):
+            imputer = KNNImputer(n_neighbors=k).fit(values)
+        with stage('knn.transform', len(values), values.size):
+            knn_out_array = imputer.transform(values)
+        knn_out = pd.DataFrame(knn_out_array)
+        # Add empty columns back and set indices of knn_out:
+        for i, empty_column_name in enumerate(empty_column_names):
+            knn_out.insert(
+                empty_column_indices[i], empty_column_name,
+                empty_column_values.iloc[:, i])
+        knn_out.columns = res.columns
+        knn_out.index = res.index
+        res.loc[:, :] = knn_out
     # Return the imputed data, or None if inplace:
     if inplace:
         return None
     else:
         return res
+
+
+def knn_chunked(
+        data, res, columns, k, algorithm, working_memory, dtype=np.float64):
+    """Auxiliary function that performs k-nearest neighbors imputation of
+    the selected columns of the data, processing only the rows in which
+    some of them is missing, in chunks of bounded size. The imputed values
+    are written into res.
+
+    :param data: The data on which to perform the k-nearest neighbors
+        imputation.
+    :type data: pandas.DataFrame
+    :param res: The dataframe into which the imputed values are written.
+    :type res: pandas.DataFrame
+    :param columns: Columns on which to apply the operation.
+    :type columns: array-like
+    :param k: The number of neighbors to which the subject with missing
+        values should be compared
+    :type k: int
+    :param algorithm: How to search the neighbors (see knn()).
+    :type algorithm: {'brute', 'kd_tree', 'ball_tree'} or object
+    :param working_memory: The maximum size in MiB of the temporary arrays.
+    :type working_memory: scalar or None
+    :param dtype: The floating point type in which to compute.
+    :type dtype: numpy.dtype, default numpy.float64
+    """
+    values = data.to_numpy(dtype=dtype)
+    mask = np.isnan(values)
+    # Columns that contain only empty values are left unimputed, as
+    # KNNImputer does:
+    valid = ~mask.all(axis=0)
+    col_locs = [
+        data.columns.get_loc(column) for column in columns
+        if valid[data.columns.get_loc(column)]]
+    if len(col_locs) == 0:
+        return
+    # Rows to impute:
+    rows = np.flatnonzero(mask[:, col_locs].any(axis=1))
+    if len(rows) == 0:
+        return
+    if working_memory is None:
+        working_memory = get_config()['working_memory']
+    with stage('knn.neighbors', len(rows), len(rows) * len(col_locs)):
+        if isinstance(algorithm, str) and algorithm == 'brute':
+            imputed = knn_brute(
+                values, mask, rows, col_locs, k, working_memory)
+        else:
+            imputed = knn_index(
+                values, mask, valid, rows, col_locs, k, algorithm,
+                working_memory)
+    # Write back the imputed cells:
+    for j, col_loc in enumerate(col_locs):
+        missing = mask[rows, col_loc]
+        res.iloc[rows[missing], col_loc] = imputed[missing, j]
+
+
+def get_chunk_size(row_bytes, working_memory):
+    """Auxiliary function that computes how many rows fit in a chunk.
+
+    :param row_bytes: The size in bytes of the temporary arrays of one row.
+    :type row_bytes: int
+    :param working_memory: The maximum size in MiB of the temporary arrays.
+    :type working_memory: scalar
+    :return: The number of rows per chunk, at least 1.
+    :rtype: int
+    """
+    return max(1, int(working_memory * 2 ** 20 // max(row_bytes, 1)))
+
+
+def knn_brute(values, mask, rows, col_locs, k, working_memory):
+    """Auxiliary function that computes the values imputed by k-nearest
+    neighbors for the given rows, searching the neighbors exactly among all
+    rows in which the column is available. The rows are processed in chunks
+    and, for each chunk, the nan-euclidean distances to all rows are
+    computed and the neighbors chosen in the same way as KNNImputer does.
+
+    :param values: The values of the data.
+    :type values: numpy.ndarray
+    :param mask: Whether each value is missing.
+    :type mask: numpy.ndarray
+    :param rows: Positions of the rows to impute.
+    :type rows: numpy.ndarray
+    :param col_locs: Positions of the columns to impute.
+    :type col_locs: list
+    :param k: The number of neighbors.
+    :type k: int
+    :param working_memory: The maximum size in MiB of the temporary arrays.
+    :type working_memory: scalar
+    :return: The imputed values of the columns for each row (meaningful only
+        where the value is missing).
+    :rtype: numpy.ndarray
+    """
+    imputed = np.full(
+        (len(rows), len(col_locs)), np.nan, dtype=values.dtype)
+    donors = [np.flatnonzero(~mask[:, col_loc]) for col_loc in col_locs]
+    col_means = [values[donors[j], col_loc].mean()
+                 for j, col_loc in enumerate(col_locs)]
+    chunk_size = get_chunk_size(
+        values.itemsize * len(values), working_memory)
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        dist = nan_euclidean_distances(values[chunk], values)
+        for j, col_loc in enumerate(col_locs):
+            receivers = np.flatnonzero(mask[chunk, col_loc])
+            if len(receivers) == 0:
+                continue
+            dist_donors = dist[receivers][:, donors[j]]
+            # Rows without any available value in common with the donors
+            # are imputed with the mean of the column:
+            all_nan = np.isnan(dist_donors).all(axis=1)
+            imputed[start + receivers[all_nan], j] = col_means[j]
+            receivers = receivers[~all_nan]
+            dist_donors = dist_donors[~all_nan]
+            if len(receivers) == 0:
+                continue
+            # Average the values of the nearest donors, ignoring donors at
+            # an undefined distance:
+            n_neighbors = min(k, len(donors[j]))
+            neighbors = np.argpartition(
+                dist_donors, n_neighbors - 1, axis=1)[:, :n_neighbors]
+            weights = (~np.isnan(np.take_along_axis(
+                dist_donors, neighbors, axis=1))).astype(values.dtype)
+            neighbor_values = values[donors[j], col_loc][neighbors]
+            imputed[start + receivers, j] = (
+                (neighbor_values * weights).sum(axis=1)
+                / weights.sum(axis=1))
+    return imputed
+
+
+def knn_index(
+        values, mask, valid, rows, col_locs, k, algorithm, working_memory):
+    """Auxiliary function that computes the values imputed by k-nearest
+    neighbors for the given rows, searching the neighbors among the complete
+    rows with a neighbor index. The rows are grouped by their pattern of
+    available columns, and for each pattern an index is built on those
+    columns of the complete rows and queried in chunks.
+
+    :param values: The values of the data.
+    :type values: numpy.ndarray
+    :param mask: Whether each value is missing.
+    :type mask: numpy.ndarray
+    :param valid: Whether each column contains some available value.
+    :type valid: numpy.ndarray
+    :param rows: Positions of the rows to impute.
+    :type rows: numpy.ndarray
+    :param col_locs: Positions of the columns to impute.
+    :type col_locs: list
+    :param k: The number of neighbors.
+    :type k: int
+    :param algorithm: The algorithm of sklearn.neighbors.NearestNeighbors,
+        or an unfitted neighbor index with the same interface.
+    :type algorithm: {'kd_tree', 'ball_tree'} or object
+    :param working_memory: The maximum size in MiB of the temporary arrays.
+    :type working_memory: scalar
+    :return: The imputed values of the columns for each row (meaningful only
+        where the value is missing).
+    :rtype: numpy.ndarray
+    """
+    valid_locs = np.flatnonzero(valid)
+    complete = np.flatnonzero(~mask[:, valid_locs].any(axis=1))
+    col_means = np.array([
+        np.nanmean(values[:, col_loc]) for col_loc in col_locs])
+    imputed = np.tile(col_means, (len(rows), 1))
+    if len(complete) == 0:
+        return imputed
+    targets = values[complete][:, col_locs]
+    n_neighbors = min(k, len(complete))
+    # Group the rows by their pattern of available columns:
+    observed = ~mask[rows][:, valid_locs]
+    patterns, inverse = np.unique(observed, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    chunk_size = get_chunk_size(
+        values.itemsize * (len(valid_locs) + 2 * n_neighbors),
+        working_memory)
+    for p, pattern in enumerate(patterns):
+        if not pattern.any():
+            continue
+        dims = valid_locs[pattern]
+        members = np.flatnonzero(inverse == p)
+        if isinstance(algorithm, str):
+            index = NearestNeighbors(algorithm=algorithm)
+        else:
+            index = copy.deepcopy(algorithm)
+        index.fit(values[complete][:, dims])
+        for start in range(0, len(members), chunk_size):
+            chunk = members[start:start + chunk_size]
+            neighbors = index.kneighbors(
+                values[rows[chunk]][:, dims], n_neighbors=n_neighbors,
+                return_distance=False)
+            imputed[chunk] = targets[neighbors].mean(axis=1)
+    return imputed
@@ -2,11 +2,23 @@ import pandas as pd
 import numpy as np
 from sklearn import linear_model
 import logging
+import time
+
+from imputena.simple_imputation.utils import (
+    get_predictor_patterns, compute_regression_statistics, solve_regression,
+    get_random_generator)
+from imputena.simple_imputation.regression_report import RegressionReport
+from imputena.instrumentation import stage
+
+# Logger of the regressions, whose messages are only formatted if INFO is
+# enabled:
+logger = logging.getLogger(__name__)
 
 
 def linear_regression(
         data=None, dependent=None, predictors=None, regressions='available',
-        noise=False, inplace=False):
+        noise=False, solver='sklearn', random_state=None, report=None,
+        inplace=False):
     """Performs simple or multiple linear regression imputation on the data.
     First, the regression equation for the dependent variable given the
     predictor variables is computed. For this step, all rows that contain a
@@ -25,7 +37,12 @@ def linear_regression(
     value. If the parameter predictors is omitted, all variables other than
     the dependent are used as predictors. If the parameter dependent is
     omitted, the operation is performed on all columns that contain missing
-    values.
+    values. By default, a regression model is fitted from scratch for each
+    combination of predictors. With solver='gram' or solver='pairwise',
+    the cross-product matrices of the variables are accumulated only once
+    and the regression for each combination is solved from them. The
+    fitted regressions are logged at level INFO and, if a report is
+    passed, recorded in it.
 
     :param data: The data on which to perform the linear regression imputation.
     :type data: pandas.DataFrame
@@ -44,6 +61,25 @@ def linear_regression(
     :param noise: Whether to add noise to the imputed values (stochastic
         regression imputation)
     :type noise: bool, default False
+    :param solver: If 'sklearn': Fit a regression model on the rows in which
+        the dependent variable and the predictors in use are available,
+        for each combination of predictors. If 'gram': Accumulate the
+        cross-product matrices once over the rows in which the dependent
+        variable and all predictors are available and solve each
+        combination from them. Rows whose combination cannot be solved
+        from these matrices are left unimputed. If 'pairwise': Accumulate
+        each entry of the cross-product matrices over all rows in which
+        both variables are available, which uses every observed value and
+        is intended for regressions='available'.
+    :type solver: {'sklearn', 'gram', 'pairwise'}, default 'sklearn'
+    :param random_state: The seed or generator from which to draw the noise
+        if noise=True. If None, a generator seeded from numpy's global random
+        state is used.
+    :type random_state: int, numpy.random.SeedSequence or
+        numpy.random.Generator, optional
+    :param report: The report in which to record the coefficients, the
+        number of imputed rows and the fit time of each regression.
+    :type report: RegressionReport, optional
     :param inplace: If True, do operation inplace and return None.
     :type inplace: bool, default False
     :return: The dataframe with linear regression imputation performed for the
@@ -72,34 +108,53 @@ def linear_regression(
         do_available_regressions = False
     else:
         raise ValueError(regressions + 'could not be understood')
+    # Check if the solver has a valid value:
+    if solver not in ['sklearn', 'gram', 'pairwise']:
+        raise ValueError(solver + ' is not a supported solver.')
+    # Check if the report has a valid type:
+    if report is not None and not isinstance(report, RegressionReport):
+        raise TypeError('The report has to be a RegressionReport.')
+    # Random number generator from which to draw the noise, only created
+    # if noise is added so that the deterministic imputation does not draw
+    # from numpy's global generator:
+    rng = get_random_generator(random_state) if noise else None
     # Assign a reference or copy to res, depending on inplace:
     if inplace:
         res = data
     else:
-        res = data.copy()
+        with stage('linear_regression.copy', len(data), data.size):
+            res = data.copy()
     # If dependent is not set, apply the operation to each column that contains
     # missing data:
     if dependent is None:
         for column in data.columns:
             if data[column].isna().any():
-                res.loc[:, :] = linear_regression_one_dependent(
+                linear_regression_one_dependent(
                     res, column, predictors, do_available_regressions,
-                    noise)
+                    noise, solver, rng, report)
     # Otherwise apply the operation to the dependent column only:
     else:
-        res.loc[:, :] = linear_regression_one_dependent(
-            data, dependent, predictors, do_available_regressions, noise)
+        linear_regression_one_dependent(
+            res, dependent, predictors, do_available_regressions, noise,
+            solver, rng, report)
     # Return dataframe if the operation is not to be performed inplace:
     if not inplace:
         return res
 
 
 def linear_regression_one_dependent(
-        data, dependent, predictors, do_available_regressions, noise):
+        data, dependent, predictors, do_available_regressions, noise,
+        solver='sklearn', rng=None, report=None):
     """Auxiliary function that performs linear regression imputation for the
     dependent column. The difference with linear_regression() is that in
     that function dependent can be None, in which case this function is
-    called for each column containing missing values,
+    called for each column containing missing values. All patterns of
+    missing predictors among the rows to impute are computed up front,
+    and a regression model is fitted once for each of them and applied only
+    to the rows that have that pattern. The operation is performed inplace:
+    only the imputed cells of the dependent column are written, and the
+    models are fitted only on the rows in which the dependent variable was
+    available before the operation.
 
     :param data: The data on which to perform the linear regression imputation.
     :type data: pandas.DataFrame
@@ -115,52 +170,54 @@ def linear_regression_one_dependent(
     :param noise: Whether to add noise to the imputed values (stochastic
         regression imputation)
     :type noise: bool
-    :return: The dataframe with linear regression imputation performed for the
-        incomplete variable.
-    :rtype: pandas.DataFrame
+    :param solver: How to fit the regression models (see
+        linear_regression()).
+    :type solver: {'sklearn', 'gram', 'pairwise'}, default 'sklearn'
+    :param rng: The random number generator from which to draw the noise.
+        Required if noise=True
+    :type rng: numpy.random.Generator, optional
+    :param report: The report in which to record the regressions.
+    :type report: RegressionReport, optional
     """
-    # This auxiliary function always returns a copy:
-    res = data.copy()
     # If predictors is None, all variables except for the dependent one are
     # considered predictors:
     if predictors is None:
         predictors = list(data.columns)
         predictors.remove(dependent)
-    # Predictor combination sets and lists
-    limited_predictors_combs = set()
-    predictors_combs_done = []
-    predictors_combs_todo = [tuple(predictors)]
+    # Compute the predictor combinations and the rows to impute with each:
+    patterns = get_predictor_patterns(
+        data, dependent, predictors, do_available_regressions)
+    dependent_loc = data.columns.get_loc(dependent)
+    # Rows in which the dependent variable is available:
+    observed = data[dependent].notna().to_numpy()
+    # Accumulate the statistics of all regressions at once if requested:
+    statistics = None
+    if solver != 'sklearn' and len(patterns) > 0:
+        with stage('linear_regression.statistics', len(data)):
+            statistics = compute_regression_statistics(
+                data, dependent, predictors, solver == 'pairwise')
     # Perform the operation:
-    while len(predictors_combs_todo) > 0:
-        # Select iteration predictors
-        it_predictors = predictors_combs_todo.pop(0)
+    for it_predictors, rows in patterns:
         # Log iteration beginning:
-        logging.info('Applying regression imputation with predictors: ' + str(
-            it_predictors))
-        # Perform iteration:
-        res.loc[:, :] = linear_regression_iter(
-            res, dependent, list(it_predictors), noise,
-            limited_predictors_combs)
-        # Update predictor combinations done and to do
-        predictors_combs_done.append(it_predictors)
-        if do_available_regressions:
-            predictors_combs_todo = list(
-                set(limited_predictors_combs) - set(predictors_combs_done))
-        # Log iteration end:
-        logging.info('Predictor combinations done: ' + str(
-            predictors_combs_done))
-        logging.info('Predictor combinations to do: ' + str(
-            predictors_combs_todo))
-    return res
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                'Applying regression imputation with predictors: %s on %s '
+                'rows', it_predictors, len(rows))
+        # Perform iteration, writing only the imputed cells:
+        data.iloc[rows, dependent_loc] = linear_regression_iter(
+            data, dependent, list(it_predictors), noise, rows, statistics,
+            rng, observed, report)
 
 
 def linear_regression_iter(
-        data, dependent, predictors, noise, limited_predictors_combs):
-    """Auxiliary function that performs (simple or multiple) linear
-    regression imputation on the data, for the dependent column only. In rows
-    that contain a missing value for any predictor variable, the value of the
-    dependent variable does not get imputed. The operation is always
-    performed on a copy of the data, which is returned.
+        data, dependent, predictors, noise, rows, statistics=None, rng=None,
+        observed=None, report=None):
+    """Auxiliary function that computes the (simple or multiple) linear
+    regression of the dependent variable on the predictors and returns the
+    imputed values for the given rows, in which the dependent variable is
+    missing and all predictors are available. If statistics are given,
+    the regression is solved from them instead of fitting a model on the
+    data.
 
     :param data: The data on which to perform the linear regression imputation.
     :type data: pandas.DataFrame
@@ -173,56 +230,99 @@ def linear_regression_iter(
     :param noise: Whether to add noise to the imputed value (stochastic
         regression imputation)
     :type noise: bool
-    :param limited_predictors_combs: Reference to the set which contains all
-        limited predictor combinations that are necessary to use because
-        some predictor had a missing value in some row.
-    :type limited_predictors_combs: set
-    :return: A copy of the dataframe with linear regression imputation
-        performed for the incomplete variable.
-    :rtype: pandas.DataFrame
+    :param rows: Positions of the rows to impute.
+    :type rows: numpy.ndarray
+    :param statistics: The statistics returned by
+        compute_regression_statistics(), or None to fit a model.
+    :type statistics: dict, optional
+    :param rng: The random number generator from which to draw the noise.
+        Required if noise=True
+    :type rng: numpy.random.Generator, optional
+    :param observed: Whether the dependent variable is available in each row
+        of the data, used to select the rows on which the model is fitted.
+        If None, all rows in which it is available are used.
+    :type observed: numpy.ndarray, optional
+    :param report: The report in which to record the regression.
+    :type report: RegressionReport, optional
+    :return: The imputed values, in the same order as rows.
+    :rtype: numpy.ndarray
     """
-    # Perform pairwise deletion before calculating the regression
-    data_pairwise_deleted = data.copy()
-    variables = predictors.copy()
-    variables.append(dependent)
-    data_pairwise_deleted.dropna(subset=variables, inplace=True)
-    # Calculate the regression:
-    x = data_pairwise_deleted[predictors]
-    y = data_pairwise_deleted[dependent]
-    model = linear_model.LinearRegression()
-    model.fit(x, y)
-    # Extract the regression parameters from the model
-    intercept = model.intercept_
-    coefs = model.coef_
+    start = time.perf_counter()
+    if statistics is None:
+        # Perform pairwise deletion before calculating the regression,
+        # reading only the needed columns:
+        variables = predictors.copy()
+        variables.append(dependent)
+        if observed is None:
+            data_pairwise_deleted = data[variables].dropna()
+        else:
+            data_pairwise_deleted = data.loc[observed, variables].dropna()
+        # Calculate the regression:
+        x = data_pairwise_deleted[predictors]
+        y = data_pairwise_deleted[dependent]
+        with stage('linear_regression.fit', len(x), x.size):
+            model = linear_model.LinearRegression()
+            model.fit(x, y)
+            # Extract the regression parameters from the model
+            intercept = model.intercept_
+            coefs = model.coef_
+            # Calculate standard error:
+            std_error = (model.predict(x) - y).std()
+    else:
+        # Solve the regression from the accumulated statistics:
+        with stage('linear_regression.fit'):
+            intercept, coefs, std_error = solve_regression(
+                statistics, dependent, predictors)
+    fit_time = time.perf_counter() - start
+    # Record the regression:
+    if report is not None:
+        report.add(
+            dependent, predictors, intercept, coefs, std_error, len(rows),
+            fit_time)
     # Log regression equation:
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            'Regression equation: %s', get_equation(
+                dependent, predictors, intercept, coefs))
+        logger.info('Standard error: %s', std_error)
+    # Compute the imputed values with a single matrix product:
+    with stage(
+            'linear_regression.apply', len(rows),
+            len(rows) * len(predictors)):
+        return get_imputed_values(
+            data, predictors, intercept, coefs, noise, std_error, rows, rng)
+
+
+def get_equation(dependent, predictors, intercept, coefs):
+    """Auxiliary function that formats a regression equation to be logged.
+
+    :param dependent: The dependent variable.
+    :type dependent: String
+    :param predictors: The predictor variables.
+    :type predictors: array-like
+    :param intercept: The y-intercept of the regression equation.
+    :type intercept: scalar
+    :param coefs: The coefficients of the regression equation, in the same
+        order as the predictors.
+    :type coefs: array-like
+    :return: The regression equation.
+    :rtype: String
+    """
     eq = str(dependent) + ' = ' + str(intercept)
     for idx, coef in enumerate(coefs):
-        eq += ' + ' + str(coef) + '*' + predictors[idx]
-    logging.info('Regression equation: ' + eq)
-    # Calculate standard error:
-    std_error = (model.predict(x) - y).std()
-    logging.info('Standard error: ' + str(std_error))
-    # Implementation using apply:
-    return data.apply(
-        lambda row: get_imputed_row(
-            row, dependent, predictors, intercept, coefs, noise, std_error,
-            limited_predictors_combs),
-        axis=1, result_type='broadcast')
+        eq += ' + ' + str(coef) + '*' + str(predictors[idx])
+    return eq
 
 
-def get_imputed_row(
-        row, dependent, predictors, intercept, coefs, noise, std_error,
-        limited_predictors_combs):
-    """Auxiliary function that receives a row of a DataFrame and returns the
-    same row. If the row contains a missing value for the dependent variable,
-    it gets imputed according to the regression equation specified by
-    predictors, intercept and coefs.
+def get_imputed_values(
+        data, predictors, intercept, coefs, noise, std_error, rows,
+        rng=None):
+    """Auxiliary function that computes the values to impute in the given
+    rows according to the regression equation specified by predictors,
+    intercept and coefs, using a single matrix product.
 
-    :param row: The row for which the missing value should be imputed
-    :type row: pandas.Series
-    :param dependent: The dependent variable for which the row might contain a
-        missing value
-    :type dependent: String
+    :param data: The data on which to perform the linear regression imputation.
+    :type data: pandas.DataFrame
     :param predictors: The predictor variables on which the dependent variable
         is dependent.
     :type predictors: array-like
@@ -231,40 +331,25 @@ def get_imputed_row(
     :param coefs:  The coefficients of the regression equation, in the same
         order as the predictors.
     :type coefs: array-like,
-    :param noise: Whether to add noise to the imputed value (stochastic
+    :param noise: Whether to add noise to the imputed values (stochastic
         regression imputation)
     :type noise: bool
     :param std_error: The standard error of the regression model. Required
         if noise=True
     :type std_error: scalar
-    :param limited_predictors_combs: Reference to the set which contains all
-        limited predictor combinations that are necessary to use because
-        some predictor had a missing value in some row.
-    :type limited_predictors_combs: set
-    :return: The row, with the missing value imputed if it contains one.
-    :rtype: pandas.Series
+    :param rows: Positions of the rows to impute. All predictors have to be
+        available in these rows.
+    :type rows: numpy.ndarray
+    :param rng: The random number generator from which to draw the noise.
+        Required if noise=True
+    :type rng: numpy.random.Generator, optional
+    :return: The imputed values, in the same order as rows.
+    :rtype: numpy.ndarray
     """
-    res = row.copy()
-    if pd.isnull(res[dependent]):
-        # Check whether there are predictors for which the value is NA
-        na_predictors = tuple(
-            row[predictors][row[predictors].isnull()].index.to_list())
-        # If the row contains NA values for one or several predictors,
-        # add the combination of predictors to na_predictor_combs, in order
-        # to perform regression without them:
-        if na_predictors != ():
-            limited_predictors = tuple(set(predictors) - set(na_predictors))
-            # Add the limited_predictors to the set only if the combination
-            # isn't empty:
-            if limited_predictors != ():
-                limited_predictors_combs.add(limited_predictors)
-        # If the row doesn't contain missing values for any predictor, impute:
-        else:
-            value = intercept
-            for idx, coef in enumerate(coefs):
-                value += coef * row[predictors[idx]]
-            # If noise == True, add noise (stochastic regression imputation)
-            if noise:
-                value += std_error * np.random.randn()
-            res[dependent] = value
-    return res
+    x = data.iloc[rows, data.columns.get_indexer(predictors)].to_numpy(
+        dtype=float)
+    values = intercept + x @ np.asarray(coefs, dtype=float)
+    # If noise == True, add noise (stochastic regression imputation)
+    if noise:
+        values += std_error * rng.standard_normal(len(rows))
+    return values
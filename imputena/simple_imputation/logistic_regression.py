@@ -1,13 +1,22 @@
 import pandas as pd
+import numpy as np
 from sklearn import linear_model
 from sklearn.exceptions import ConvergenceWarning
 import logging
 import warnings
 
+from imputena.simple_imputation.utils import (
+    get_predictor_patterns, get_random_generator, encode_categorical)
+from imputena.instrumentation import stage
+
+# Logger of the regressions, whose messages are only formatted if INFO is
+# enabled:
+logger = logging.getLogger(__name__)
+
 
 def logistic_regression(
         data=None, dependent=None, predictors=None, regressions='available',
-        inplace=False):
+        noise=False, random_state=None, inplace=False):
     """Performs logistic regression imputation on the data. First, the
     regression equation for the dependent variable given the predictor
     variables is computed. For this step, all rows that contain a missing
@@ -21,7 +30,10 @@ def logistic_regression(
     the parameter regressions the value 'complete'. In this case, rows in
     which a predictor variable is missing do not get imputed. If the parameter
     predictors is omitted, all variables other than the dependent are used as
-    predictors.
+    predictors. If noise=True, instead of the most probable class, each
+    missing value is imputed with a class drawn at random according to the
+    probabilities predicted by the model (stochastic logistic regression
+    imputation).
 
     :param data: The data on which to perform the logistic regression
         imputation.
@@ -38,6 +50,14 @@ def logistic_regression(
         regression model based on all predictors and leave missing values in
         rows in which some predictor value is missing itself unimputed.
     :type regressions: {'available', 'complete'}, default 'available'
+    :param noise: Whether to draw the imputed classes from the predicted
+        probabilities instead of imputing the most probable class.
+    :type noise: bool, default False
+    :param random_state: The seed or generator from which to draw the
+        classes if noise=True. If None, a generator seeded from numpy's
+        global random state is used.
+    :type random_state: int, numpy.random.SeedSequence or
+        numpy.random.Generator, optional
     :param inplace: If True, do operation inplace and return None.
     :type inplace: bool, default False
     :return: The dataframe with logistic regression imputation performed for
@@ -70,48 +90,46 @@ def logistic_regression(
         do_available_regressions = False
     else:
         raise ValueError(regressions + 'could not be understood')
+    # Random number generator from which to draw the classes, only created
+    # in the stochastic mode so that the deterministic imputation does not
+    # draw from numpy's global generator:
+    rng = get_random_generator(random_state) if noise else None
     # Assign a reference or copy to res, depending on inplace:
     if inplace:
         res = data
     else:
         res = data.copy()
-    # Predictor combination sets and lists
-    limited_predictors_combs = set()
-    predictors_combs_done = []
-    predictors_combs_todo = [tuple(predictors)]
+    # Compute the predictor combinations and the rows to impute with each:
+    patterns = get_predictor_patterns(
+        data, dependent, predictors, do_available_regressions)
+    dependent_loc = res.columns.get_loc(dependent)
+    # Rows in which the dependent variable is available, on which the models
+    # are fitted even if res is data:
+    observed = data[dependent].notna().to_numpy()
     # Perform the operation:
-    while len(predictors_combs_todo) > 0:
-        # Select iteration predictors
-        it_predictors = predictors_combs_todo.pop(0)
+    for it_predictors, rows in patterns:
         # Log iteration beginning:
-        logging.info('Applying regression imputation with predictors: ' + str(
-            it_predictors))
-        # Perform iteration:
-        res.loc[:, :] = logistic_regression_iter(
-            res, dependent, list(it_predictors),
-            limited_predictors_combs)
-        # Update predictor combinations done and to do
-        predictors_combs_done.append(it_predictors)
-        if do_available_regressions:
-            predictors_combs_todo = list(
-                set(limited_predictors_combs) - set(predictors_combs_done))
-        # Log iteration end:
-        logging.info('Predictor combinations done: ' + str(
-            predictors_combs_done))
-        logging.info('Predictor combinations to do: ' + str(
-            predictors_combs_todo))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                'Applying regression imputation with predictors: %s on %s '
+                'rows', it_predictors, len(rows))
+        # Perform iteration, writing only the imputed cells:
+        res.iloc[rows, dependent_loc] = logistic_regression_iter(
+            data, dependent, list(it_predictors), rows, observed, noise,
+            rng)
     # Return dataframe is the operation is not to be performed inplace:
     if not inplace:
         return res
 
 
 def logistic_regression_iter(
-        data, dependent, predictors, limited_predictors_combs):
-    """Auxiliary function that performs (simple or multiple) logistic
-    regression imputation on the data, for the dependent column only. In rows
-    that contain a missing value for any predictor variable, the value of the
-    dependent variable does not get imputed. The operation is always
-    performed on a copy of the data, which is returned.
+        data, dependent, predictors, rows, observed=None, noise=False,
+        rng=None):
+    """Auxiliary function that computes the (simple or multiple) logistic
+    regression of the dependent variable on the predictors and returns the
+    imputed values for the given rows, in which the dependent variable is
+    missing and all predictors are available. The values of all rows are
+    predicted in a single call to the model.
 
     :param data: The data on which to perform the logistic regression
         imputation.
@@ -122,72 +140,105 @@ def logistic_regression_iter(
     :param predictors: The predictor variables on which the dependent variable
         is dependent.
     :type predictors: array-like
-    :param limited_predictors_combs: Reference to the set which contains all
-        limited predictor combinations that are necessary to use because
-        some predictor had a missing value in some row.
-    :type limited_predictors_combs: set
-    :return: A copy of the dataframe with logistic regression imputation
-        performed for the incomplete variable.
-    :rtype: pandas.DataFrame o None
+    :param rows: Positions of the rows to impute.
+    :type rows: numpy.ndarray
+    :param observed: Whether the dependent variable is available in each row
+        of the data, used to select the rows on which the model is fitted.
+        If None, all rows in which it is available are used.
+    :type observed: numpy.ndarray, optional
+    :param noise: Whether to draw the imputed classes from the predicted
+        probabilities.
+    :type noise: bool, default False
+    :param rng: The random number generator from which to draw the classes.
+        Required if noise=True
+    :type rng: numpy.random.Generator, optional
+    :return: The imputed values, in the same order as rows.
+    :rtype: numpy.ndarray
     """
-    # Perform pairwise deletion before calculating the regression
-    data_pairwise_deleted = data.copy()
-    variables = predictors.copy()
-    variables.append(dependent)
-    data_pairwise_deleted.dropna(subset=variables, inplace=True)
     # Calculate the regression:
-    x = data_pairwise_deleted[predictors]
-    y = data_pairwise_deleted[dependent]
-    model = linear_model.LogisticRegression()
-    with warnings.catch_warnings():
-        warnings.filterwarnings('ignore', category=ConvergenceWarning)
-        model.fit(x, y)
-    # Implementation using apply:
-    return data.apply(
-        lambda row: get_imputed_row(
-            row, dependent, predictors, model, limited_predictors_combs),
-        axis=1, result_type='broadcast')
+    with stage('logistic_regression.fit'):
+        model = fit_logistic_regression(
+            data, dependent, predictors, observed)
+    # Predict the values of all rows at once, reading only the needed cells:
+    with stage(
+            'logistic_regression.apply', len(rows),
+            len(rows) * len(predictors)):
+        return predict_classes(
+            model, data.iloc[rows, data.columns.get_indexer(predictors)],
+            noise, rng)
+
+
+def predict_classes(model, x, noise, rng=None):
+    """Auxiliary function that predicts the classes of the given rows with
+    a single call to the model. If noise=True, the class of each row is
+    drawn according to the probabilities predicted for it, with one draw of
+    the random number generator for all rows.
+
+    :param model: The fitted logistic regression model.
+    :type model: sklearn.linear_model.LogisticRegression
+    :param x: The values of the predictors in the rows to impute.
+    :type x: pandas.DataFrame
+    :param noise: Whether to draw the classes from the predicted
+        probabilities instead of predicting the most probable class.
+    :type noise: bool
+    :param rng: The random number generator from which to draw the classes.
+        Required if noise=True
+    :type rng: numpy.random.Generator, optional
+    :return: The predicted classes, in the same order as the rows.
+    :rtype: numpy.ndarray
+    """
+    if not noise:
+        return model.predict(x)
+    # Draw the class of each row by comparing a uniform value with the
+    # cumulative probabilities of the classes:
+    cumulative = model.predict_proba(x).cumsum(axis=1)
+    draws = rng.random(len(cumulative)) * cumulative[:, -1]
+    classes = (draws[:, None] >= cumulative).sum(axis=1)
+    return model.classes_[np.minimum(classes, len(model.classes_) - 1)]
 
 
-def get_imputed_row(
-        row, dependent, predictors, model, limited_predictors_combs):
-    """Auxiliary function that receives a row of a DataFrame and returns the
-    same row. If the row contains a missing value for the dependent variable,
-    it gets imputed according to the regression model.
+def fit_logistic_regression(
+        data, dependent, predictors, observed=None, model=None):
+    """Auxiliary function that fits a logistic regression model of the
+    dependent variable on the predictors, using the rows in which all of
+    them are available. The model is fitted on the integer codes of the
+    classes, and its attribute classes_ holds their values.
 
-    :param row: The row for which the missing value should be imputed
-    :type row: pandas.Series
-    :param dependent: The dependent variable for which the row might contain a
-        missing value
+    :param data: The data on which to fit the model.
+    :type data: pandas.DataFrame
+    :param dependent: The dependent variable.
     :type dependent: String
     :param predictors: The predictor variables on which the dependent variable
         is dependent.
     :type predictors: array-like
-    :param model: The logistic regression model.
-    :type model: sklearn.linear_model._logistic.LogisticRegression
-    :param limited_predictors_combs: Reference to the set which contains all
-        limited predictor combinations that are necessary to use because
-        some predictor had a missing value in some row.
-    :type limited_predictors_combs: set
-    :return: The row, with the missing value imputed if it contains one.
-    :rtype: pandas.Series
+    :param observed: Whether the dependent variable is available in each row
+        of the data. If given, only those rows are used.
+    :type observed: numpy.ndarray, optional
+    :param model: The model to fit. If it was created with warm_start=True,
+        its previous solution is used as starting point. If omitted, a new
+        model is created.
+    :type model: sklearn.linear_model.LogisticRegression, optional
+    :return: The fitted logistic regression model.
+    :rtype: sklearn.linear_model.LogisticRegression
     """
-    res = row.copy()
-    if pd.isnull(res[dependent]):
-        # Check whether there are predictors for which the value is NA
-        na_predictors = tuple(
-            row[predictors][row[predictors].isnull()].index.to_list())
-        # If the row contains NA values for one or several predictors,
-        # add the combination of predictors to na_predictor_combs, in order
-        # to perform regression without them:
-        if na_predictors != ():
-            limited_predictors = tuple(set(predictors) - set(na_predictors))
-            # Add the limited_predictors to the set only if the combination
-            # isn't empty:
-            if limited_predictors != ():
-                limited_predictors_combs.add(limited_predictors)
-        # If the row doesn't contain missing values for any predictor, impute:
-        else:
-            value = model.predict(row[predictors].values.reshape(1, -1))
-            res[dependent] = value[0]
-    return res
+    # Perform pairwise deletion before calculating the regression, reading
+    # only the needed columns:
+    variables = list(predictors)
+    variables.append(dependent)
+    if observed is None:
+        data_pairwise_deleted = data[variables].dropna()
+    else:
+        data_pairwise_deleted = data.loc[observed, variables].dropna()
+    # Calculate the regression on the integer codes of the classes, sorted
+    # like the classes themselves, and map the classes of the model back to
+    # their values, so that its predictions are the values:
+    x = data_pairwise_deleted[list(predictors)]
+    codes, classes = encode_categorical(
+        data_pairwise_deleted[dependent], sort=True)
+    if model is None:
+        model = linear_model.LogisticRegression()
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', category=ConvergenceWarning)
+        model.fit(x, codes)
+    model.classes_ = np.asarray(classes)[model.classes_]
+    return model
@@ -1,13 +1,21 @@
 import pandas as pd
+import numpy as np
 import warnings
 
+from imputena.statistics import (
+    MeanState, QuantileSketch, get_series_key)
 
-def mean_substitution(data=None, method='mean', columns=None, inplace=False):
+
+def mean_substitution(
+        data=None, method='mean', columns=None, inplace=False,
+        statistics=None):
     """Fills in missing values with the average value of the same column,
     in case of a dataframe, or of the series as a whole in case of a series. If
     the data is passed as a dataframe, the operation can be applied to all
     columns, by leaving the parameter columns empty, or to selected columns,
-    passed as an array of strings.
+    passed as an array of strings. The averages can also be taken from the
+    partial statistics of the data, accumulated on several parts of it and
+    merged, instead of being computed from the data passed.
 
     :param data: The data on which to perform the mean substitution.
     :type data: pandas.Series or pandas.DataFrame
@@ -17,6 +25,11 @@ def mean_substitution(data=None, method='mean', columns=None, inplace=False):
     :type method: {'mean', 'median'}, default 'mean'
     :param inplace: If True, do operation inplace and return None.
     :type inplace: bool, default False
+    :param statistics: The partial statistics from which to take the
+        averages: a MeanState if method='mean' or a QuantileSketch if
+        method='median'. The statistics of a series are those of its name.
+        Columns without statistics are left unchanged.
+    :type statistics: MeanState or QuantileSketch, optional
     :return: The series or dataframe with NA values filled in, or
         None if inplace=True.
     :rtype: pandas.Series, pandas.DataFrame, or None
@@ -33,12 +46,34 @@ def mean_substitution(data=None, method='mean', columns=None, inplace=False):
     if method not in ['mean', 'median']:
         raise ValueError(
             method + 'is not a valid method for calculating the average.')
+    # Raise a TypeError if the statistics do not match the method:
+    state_class = MeanState if method == 'mean' else QuantileSketch
+    if statistics is not None and not isinstance(statistics, state_class):
+        raise TypeError(
+            'The statistics have to be a ' + state_class.__name__ + '.')
     # Assign a reference or copy to res, depending on inplace:
     if inplace:
         res = data
     else:
         res = data.copy()
-    if columns is None:
+    if statistics is not None:
+        # Treatment with averages taken from the partial statistics
+        averages = statistics.result()
+        if isinstance(data, pd.Series):
+            res.fillna(
+                averages.get(get_series_key(data), np.nan), inplace=True)
+        else:
+            if columns is None:
+                columns = data.columns
+            for column in columns:
+                # Raise error if the column name doesn't exist in the data:
+                if column not in data.columns:
+                    raise ValueError(
+                        '\'' + column + '\' is not a column of the data.')
+            res.fillna(
+                {column: averages[column] for column in columns
+                 if column in averages.index}, inplace=True)
+    elif columns is None:
         # Treatment for a series or all columns of a dataframe
         with warnings.catch_warnings():
             warnings.filterwarnings(
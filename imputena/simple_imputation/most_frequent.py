@@ -1,12 +1,21 @@
 import pandas as pd
+import numpy as np
 
+from imputena.simple_imputation.utils import get_most_frequent_value
+from imputena.statistics import ModeState, get_series_key
 
-def most_frequent(data=None, columns=None, inplace=False):
+
+def most_frequent(data=None, columns=None, inplace=False, statistics=None):
     """Fills in missing values with the most frequent value (mode) in the
     same column, in case of a dataframe, or in the series as a whole in case
     of a series. If the data is passed as a dataframe, the operation can be
     applied to all columns, by leaving the parameter columns empty; or to
-    selected columns, passed as an array of strings.
+    selected columns, passed as an array of strings. Only the columns with
+    missing values are considered, and the values of each are counted in a
+    single pass; in case of ties, the smallest value is used. The most
+    frequent values can also be taken from the partial statistics of the
+    data, accumulated on several parts of it and merged, instead of being
+    computed from the data passed.
 
     :param data: The data on which to perform the most frequent imputation.
     :type data: pandas.Series or pandas.DataFrame
@@ -14,6 +23,10 @@ def most_frequent(data=None, columns=None, inplace=False):
     :type columns: array-like, optional
     :param inplace: If True, do operation inplace and return None.
     :type inplace: bool, default False
+    :param statistics: The partial statistics from which to take the most
+        frequent values. The statistics of a series are those of its name.
+        Columns without statistics are left unchanged.
+    :type statistics: ModeState, optional
     :return: The series or dataframe with NA values filled in, or
         None if inplace=True.
     :rtype: pandas.Series, pandas.DataFrame, or None
@@ -26,24 +39,52 @@ def most_frequent(data=None, columns=None, inplace=False):
     if isinstance(data, pd.Series) and columns is not None:
         raise ValueError('Columns can only be selected if the data is a '
                          'DataFrame.')
+    # Raise a TypeError if the statistics are not the counts of the values:
+    if statistics is not None and not isinstance(statistics, ModeState):
+        raise TypeError('The statistics have to be a ModeState.')
     # Assign a reference or copy to res, depending on inplace:
     if inplace:
         res = data
     else:
         res = data.copy()
-    if columns is None:
-        # Treatment for a series or all columns of a dataframe
-        res.fillna(data.mode().iloc[0], inplace=True)
+    if statistics is not None:
+        # Treatment with the modes taken from the partial statistics
+        modes = statistics.result()
+        if isinstance(data, pd.Series):
+            res.fillna(modes.get(get_series_key(data), np.nan), inplace=True)
+        else:
+            if columns is None:
+                columns = data.columns
+            for column in columns:
+                # Raise error if the column name doesn't exist in the data:
+                if column not in data.columns:
+                    raise ValueError(
+                        '\'' + column + '\' is not a column of the data.'
+                    )
+            res.fillna(
+                {column: modes[column] for column in columns
+                 if column in modes.index}, inplace=True)
+    elif isinstance(data, pd.Series):
+        # Treatment for a series
+        if data.isna().any():
+            res.fillna(get_most_frequent_value(data), inplace=True)
     else:
-        # Treatment for selected columns of a dataframe
+        # Treatment for all or selected columns of a dataframe
+        if columns is None:
+            columns = data.columns
         for column in columns:
             # Raise error if the column name doesn't exist in the data:
             if column not in data.columns:
                 raise ValueError(
                     '\'' + column + '\' is not a column of the data.'
                 )
-            # Impute the missing values of the column
-            res[column].fillna(data[column].mode().iloc[0], inplace=True)
+        # Compute the most frequent value only of the columns with missing
+        # values:
+        modes = {}
+        for column in columns:
+            if data[column].isna().any():
+                modes[column] = get_most_frequent_value(data[column])
+        res.fillna(modes, inplace=True)
     # Return the imputed data, or None if inplace:
     if inplace:
         return None
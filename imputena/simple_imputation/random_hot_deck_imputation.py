@@ -1,15 +1,20 @@
 import pandas as pd
 import numpy as np
 
+from imputena.simple_imputation.utils import (
+    get_random_generator, encode_categorical)
+
 
 def random_hot_deck_imputation(
         data=None, incomplete_variable=None, deck_variables=None,
-        inplace=False):
+        random_state=None, inplace=False):
     """Performs random hot deck imputation on the data. Missing values receive
     a valid value from a donor randomly chosen from a pool. The pool is
     different for each row containing a missing value in incomplete_variable
     and consists of all rows which coincide in value with the incomplete row
-    for all of the columns in deck_variables.
+    for all of the columns in deck_variables. The pools are built with a
+    single grouping of the data by deck_variables, and the donors of all
+    incomplete rows are drawn at once.
 
     :param data: The data on which to perform the random hot deck imputation.
     :type data: pandas.DataFrame
@@ -19,6 +24,11 @@ def random_hot_deck_imputation(
     :param deck_variables: The donor has to have the same value as the row
         for these variables.
     :type deck_variables: array-like
+    :param random_state: The seed or generator from which to choose the
+        donors. If None, a generator seeded from numpy's global random state
+        is used.
+    :type random_state: int, numpy.random.SeedSequence or
+        numpy.random.Generator, optional
     :param inplace: If True, do operation inplace and return None.
     :type inplace: bool, default False
     :return: The dataframe with random hot deck imputation performed for the
@@ -38,60 +48,108 @@ def random_hot_deck_imputation(
     for column in deck_variables:
         if column not in data.columns:
             raise ValueError('\'' + column + '\' is not a column of the data.')
+    # Random number generator from which to choose the donors:
+    rng = get_random_generator(random_state)
     # Assign a reference or copy to res, depending on inplace:
     if inplace:
         res = data
     else:
         res = data.copy()
-    # Implementation using a apply:
-    res.loc[:, :] = data.apply(
-        lambda row: get_row_with_donation(
-            row, incomplete_variable, deck_variables, data),
-        axis=1, result_type='broadcast')
+    # Build the donor pools and impute all recipients with a single draw:
+    na_mask = data[incomplete_variable].isna().to_numpy()
+    if na_mask.any():
+        rows, values = get_donations(
+            data, incomplete_variable, deck_variables, na_mask, rng)
+        res.iloc[rows, res.columns.get_loc(incomplete_variable)] = values
     # Return dataframe is the operation is not to be performed inplace:
     if not inplace:
         return res
 
 
-def get_row_with_donation(row, incomplete_variable, deck_variables, data):
-    """This function imputes the value of the incomplete variable in the
-    passed row using random hot deck imputation and returns the whole row so
-    that the function can be applied to each row of a dataframe.
+def get_donations(data, incomplete_variable, deck_variables, na_mask, rng):
+    """Auxiliary function that chooses a random donor for each row with a
+    missing value in the incomplete variable. The rows are grouped once by
+    the values of the deck variables. The donors of each group are sorted
+    next to each other, so that the pool of a group is a contiguous slice of
+    the donated values, and one donor is drawn for every recipient with a
+    single call to the random number generator. Rows with a missing value
+    in some deck variable have no pool. Only the donated values are read
+    from the incomplete variable.
 
-    :param row: The row for which the missing value should be imputed
-    :type row: pandas.Series
-    :param incomplete_variable: The variable for which the row might contain a
-        missing value
+    :param data: The data on which to perform the random hot deck imputation.
+    :type data: pandas.DataFrame
+    :param incomplete_variable: The variable in which the missing values
+        should be imputed.
     :type incomplete_variable: String
     :param deck_variables: The donor has to have the same value as the row
         for these variables.
     :type deck_variables: array-like
-    :param data: The whole dataframe, used to select the donor
-    :type data: pandas.DataFrame
-    :return: The row with the missing value imputed
-    :rtype: pandas.Series
+    :param na_mask: Whether the incomplete variable is missing in each row.
+    :type na_mask: numpy.ndarray
+    :param rng: The random number generator from which to choose the donors
+    :type rng: numpy.random.Generator
+    :return: The positions of the rows that have at least one donor, and the
+        values donated to them.
+    :rtype: (numpy.ndarray, numpy.ndarray)
     """
+    # Number the pool of each row, -1 meaning that the row has no pool:
+    pools = get_pools(data, deck_variables)
+    # Sort the donors by pool and compute where each pool starts. The donors
+    # are kept as row positions, so their values are only read for the rows
+    # that receive them:
+    donor_rows = np.flatnonzero(~na_mask)
+    donor_pools = pools[donor_rows]
+    has_pool = donor_pools >= 0
+    donor_pools = donor_pools[has_pool]
+    order = np.argsort(donor_pools, kind='stable')
+    donor_rows = donor_rows[has_pool][order]
+    pool_sizes = np.bincount(donor_pools, minlength=pools.max() + 1)
+    pool_starts = np.cumsum(pool_sizes) - pool_sizes
+    # The missing value is only imputed if a donor that coincides in value
+    # for all the deck variables exists:
+    rows = np.flatnonzero(na_mask)
+    recipient_pools = pools[rows]
+    has_donor = recipient_pools >= 0
+    has_donor[has_donor] = pool_sizes[recipient_pools[has_donor]] > 0
+    rows = rows[has_donor]
+    recipient_pools = recipient_pools[has_donor]
+    # Draw a donor for every recipient at once:
+    donors = donor_rows[pool_starts[recipient_pools] + rng.integers(
+        0, pool_sizes[recipient_pools])]
+    # Map only the donated cells back to their values:
+    column = data[incomplete_variable]
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        codes, _ = encode_categorical(column)
+        return rows, pd.Categorical.from_codes(
+            codes[donors], dtype=column.dtype)
+    return rows, column.to_numpy()[donors]
 
-    res = row.copy()
-    # Since this function is applied to each row of the database,
-    # it is necessary to check whether it actually contains a missing value
-    # for the incomplete variable:
-    if pd.isna(row[incomplete_variable]):
-        # query_string will hold a query selecting all possible donors.
-        # First, the donor should not have a missing value in the variable
-        # that is to be imputed:
-        query_string = '`' + incomplete_variable + '`.notnull()'
-        # The donor should also coincide in value with the row that the
-        # operation if being performed on for all the deck variables:
-        for variable in deck_variables:
-            query_string += ' and (`' + variable + '` == \'' \
-                            + str(row[variable]) + '\')'
-        donors = data.query(query_string)
-        # The missing value is only imputed if a donor that coincides in
-        # value for all the deck variables exists:
-        if len(donors) > 0:
-            value = donors.iloc[np.random.randint(0, len(donors))][
-                data.columns.get_loc(incomplete_variable)]
-            res = row.copy()
-            res[incomplete_variable] = value
-    return res
+
+def get_pools(data, deck_variables):
+    """Auxiliary function that numbers the donor pool of each row: rows with
+    the same values of all deck variables share a pool. Each deck variable
+    is encoded as integer codes, and the codes of all of them are combined
+    into one integer key per row, so that the pools are found with integer
+    operations instead of comparing the values themselves.
+
+    :param data: The data.
+    :type data: pandas.DataFrame
+    :param deck_variables: The deck variables.
+    :type deck_variables: array-like
+    :return: The pool of each row, -1 meaning that some deck variable is
+        missing in the row, so it has no pool.
+    :rtype: numpy.ndarray
+    """
+    keys = np.zeros(len(data), dtype=np.int64)
+    missing = np.zeros(len(data), dtype=bool)
+    for variable in deck_variables:
+        codes, categories = encode_categorical(data[variable])
+        missing |= codes < 0
+        # Renumber the combined keys when they could overflow:
+        if keys.max(initial=0) >= np.iinfo(np.int64).max // (
+                len(categories) + 1):
+            keys = pd.factorize(keys)[0].astype(np.int64)
+        keys = keys * (len(categories) + 1) + codes + 1
+    pools = pd.factorize(keys)[0].astype(np.int64)
+    pools[missing] = -1
+    return pools
@@ -1,8 +1,12 @@
 import pandas as pd
 import numpy as np
 
+from imputena.simple_imputation.utils import (
+    get_random_generator, encode_categorical)
 
-def random_sample_imputation(data=None, columns=None, inplace=False):
+
+def random_sample_imputation(
+        data=None, columns=None, random_state=None, inplace=False):
     """Performs random sample imputation on the data. Missing values in each
     column are replaced by a randomly selected observed values of the same
     column, if available. The operation can be applied to a series, a whole
@@ -12,6 +16,11 @@ def random_sample_imputation(data=None, columns=None, inplace=False):
     :type data: pandas.Series or pandas.DataFrame
     :param columns: Columns on which to apply the operation.
     :type columns: array-like, optional
+    :param random_state: The seed or generator from which to draw the
+        values. If None, a generator seeded from numpy's global random state
+        is used.
+    :type random_state: int, numpy.random.SeedSequence or
+        numpy.random.Generator, optional
     :param inplace: If True, do operation inplace and return None.
     :type inplace: bool, default False
     :return: The series or dataframe with NA values filled in, or
@@ -22,6 +31,8 @@ def random_sample_imputation(data=None, columns=None, inplace=False):
     # Check if data is of the correct type:
     if not (isinstance(data, pd.Series) or isinstance(data, pd.DataFrame)):
         raise TypeError('The data has to be a Series or DataFrame.')
+    # Random number generator from which to draw the values:
+    rng = get_random_generator(random_state)
     # Assign a reference or copy to res, depending on inplace:
     if inplace:
         res = data
@@ -32,13 +43,11 @@ def random_sample_imputation(data=None, columns=None, inplace=False):
         if columns is not None:
             raise ValueError('Columns can only be selected if the data is a '
                              'DataFrame.')
-        if data.notnull().sum() > 0:
+        na_mask = data.isnull().to_numpy()
+        if not na_mask.all():
             # The operation is only applied if the column contains some
             # non-NA value.
-            number_missing = data.isnull().sum()
-            observed_values = data.loc[data.notnull()]
-            res.loc[data.isnull()] = np.random.choice(
-                observed_values, number_missing, replace=True)
+            res.loc[na_mask] = draw_observed_values(data, na_mask, rng)
     # Treatment if data is a dataframe:
     if isinstance(data, pd.DataFrame):
         if columns is None:
@@ -49,15 +58,39 @@ def random_sample_imputation(data=None, columns=None, inplace=False):
                 raise ValueError(
                     '\'' + column + '\' is not a column of the data.'
                 )
-            if data[column].notnull().sum() > 0:
+            na_mask = data[column].isnull().to_numpy()
+            if not na_mask.all():
                 # The operation is only applied if the column contains some
                 # non-NA value.
-                number_missing = data[column].isnull().sum()
-                observed_values = data.loc[data[column].notnull(), column]
-                res.loc[data[column].isnull(), column] = np.random.choice(
-                    observed_values, number_missing, replace=True)
+                res.loc[na_mask, column] = draw_observed_values(
+                    data[column], na_mask, rng)
     # Return the imputed data, or None if inplace:
     if inplace:
         return None
     else:
         return res
+
+
+def draw_observed_values(series, na_mask, rng):
+    """Auxiliary function that draws, for each missing value of a series, one
+    of its observed values at random, with a single call to the random
+    number generator. The observed values are not copied: the positions of
+    the draws are taken from the values of the series or, for a categorical
+    series, from its integer codes, and only the drawn values are mapped
+    back.
+
+    :param series: The series, with some observed value.
+    :type series: pandas.Series
+    :param na_mask: Whether each value of the series is missing.
+    :type na_mask: numpy.ndarray
+    :param rng: The random number generator from which to draw the values.
+    :type rng: numpy.random.Generator
+    :return: The drawn values, one for each missing value.
+    :rtype: array-like
+    """
+    observed = np.flatnonzero(~na_mask)
+    draws = observed[rng.integers(0, len(observed), na_mask.sum())]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, categories = encode_categorical(series)
+        return pd.Categorical.from_codes(codes[draws], dtype=series.dtype)
+    return series.to_numpy()[draws]
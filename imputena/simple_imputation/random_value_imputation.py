@@ -1,10 +1,13 @@
 import pandas as pd
 import numpy as np
 
+from imputena.simple_imputation.utils import (
+    get_random_generator, get_float_dtype)
+
 
 def random_value_imputation(
         data=None, distribution='uniform', vmin=0, vmax=1, sigma=1, mu=0,
-        columns=None, inplace=False):
+        columns=None, random_state=None, dtype='float64', inplace=False):
     """Fills in missing values with a randomly generated number. If
     distribution is uniform, a float between vmin (inclusive) and vmax (
     exclusive) will be generated. If distribution is normal, a float from a
@@ -13,7 +16,11 @@ def random_value_imputation(
     exclusive) will be drawn from a uniform distribution. If the data is
     passed as a dataframe, the operation can be applied to all columns,
     by leaving the parameter columns empty, or to selected columns, passed
-    as an array of strings.
+    as an array of strings. Only as many values as there are missing
+    cells are drawn, so that the time and memory scale with the number of
+    missing values rather than with the size of the data. With
+    dtype='float32', the uniform and normal values are drawn in single
+    precision, which halves the memory of the random values.
 
     :param data: The data on which to perform the constant value imputation
     :type data: pandas.Series or pandas.DataFrame
@@ -31,6 +38,14 @@ def random_value_imputation(
     :type mu: scalar, default 0
     :param columns: Columns on which to apply the operation.
     :type columns: array-like, optional
+    :param random_state: The seed or generator from which to draw the
+        values. If None, a generator seeded from numpy's global random state
+        is used.
+    :type random_state: int, numpy.random.SeedSequence or
+        numpy.random.Generator, optional
+    :param dtype: The floating point type in which to draw the uniform and
+        normal values.
+    :type dtype: {'float64', 'float32'}, default 'float64'
     :param inplace: If True, do operation inplace and return None.
     :type inplace: bool, default False
     :return: The series or dataframe with NA values filled in, or
@@ -48,49 +63,52 @@ def random_value_imputation(
     # Check if the distribution has a valid value:
     if distribution not in ['uniform', 'normal', 'integer']:
         raise ValueError(distribution + 'is not a supported distribution.')
+    # Check the floating point type:
+    dtype = get_float_dtype(dtype)
+    # Random number generator from which to draw the values:
+    rng = get_random_generator(random_state)
     # Assign a reference or copy to res, depending on inplace:
     if inplace:
         res = data
     else:
         res = data.copy()
-    # Treatment for a DataFrame:
+    # Positions of the rows in which each column is missing, the series
+    # being treated as a single column:
     if isinstance(data, pd.DataFrame):
         if columns is None:
             columns = data.columns
-        num_rows = len(res.index)
-        num_cols = len(columns)
-        if distribution == 'uniform':
-            rand = pd.DataFrame(
-                (vmax - vmin) * np.random.rand(num_rows, num_cols) + vmin,
-                columns=columns,
-                index=res.index)
-        if distribution == 'normal':
-            rand = pd.DataFrame(
-                sigma * np.random.randn(num_rows, num_cols) + mu,
-                columns=columns,
-                index=res.index)
-        if distribution == 'integer':
-            rand = pd.DataFrame(
-                np.random.randint(
-                    low=vmin, high=vmax, size=(num_rows, num_cols)),
-                columns=columns,
-                index=res.index)
-        res.update(rand, overwrite=False)
-    # Treatment for a Series:
-    if isinstance(data, pd.Series):
-        def get_random_value():
-            if distribution == 'uniform':
-                return (vmax - vmin) * np.random.rand() + vmin
-            if distribution == 'normal':
-                return sigma * np.random.randn() + mu
-            if distribution == 'integer':
-                return np.random.randint(low=vmin, high=vmax, size=(1, 1))
-        if inplace:
-            data.loc[:] = res.apply(
-                lambda item: get_random_value() if pd.isnull(item) else item)
+        # Check if each of the selected columns is actually a column of the
+        # dataframe:
+        for column in columns:
+            if column not in data.columns:
+                raise ValueError(
+                    '\'' + str(column) + '\' is not a column of the data.')
+        col_locs = res.columns.get_indexer(columns)
+        missing_rows = [
+            np.flatnonzero(data[column].isna().to_numpy())
+            for column in columns]
+    else:
+        col_locs = [None]
+        missing_rows = [np.flatnonzero(data.isna().to_numpy())]
+    # Draw one value for each missing cell, all of them in one call:
+    number_missing = sum(len(rows) for rows in missing_rows)
+    if distribution == 'uniform':
+        rand = (vmax - vmin) * rng.random(number_missing, dtype=dtype) + vmin
+    if distribution == 'normal':
+        rand = sigma * rng.standard_normal(number_missing, dtype=dtype) + mu
+    if distribution == 'integer':
+        rand = rng.integers(low=vmin, high=vmax, size=number_missing)
+    # Scatter the values through the missing cells of each column:
+    start = 0
+    for col_loc, rows in zip(col_locs, missing_rows):
+        if len(rows) == 0:
+            continue
+        values = rand[start:start + len(rows)]
+        start += len(rows)
+        if col_loc is None:
+            res.iloc[rows] = values
         else:
-            res = res.apply(
-                lambda item: get_random_value() if pd.isnull(item) else item)
+            res.iloc[rows, col_loc] = values
     # Return the imputed data, or None if inplace:
     if inplace:
         return None
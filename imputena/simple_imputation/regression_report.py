@@ -0,0 +1,63 @@
+import pandas as pd
+
+
+class RegressionReport:
+    """Report of the regressions fitted by an imputation. It is passed to
+    the imputation function with its report parameter and records, for each
+    pattern of available predictors, the fitted coefficients, the number of
+    imputed rows and the time spent fitting the model. The report is filled
+    whether logging is enabled or not, and nothing is formatted until it is
+    read.
+    """
+
+    def __init__(self):
+        self.regressions = []
+
+    def add(self, dependent, predictors, intercept, coefs, std_error, rows,
+            fit_time):
+        """Records a regression.
+
+        :param dependent: The dependent variable.
+        :type dependent: String
+        :param predictors: The predictor variables.
+        :type predictors: list
+        :param intercept: The y-intercept of the regression equation.
+        :type intercept: scalar
+        :param coefs: The coefficients of the regression equation, in the
+            same order as the predictors.
+        :type coefs: array-like
+        :param std_error: The standard error of the regression model.
+        :type std_error: scalar
+        :param rows: The number of rows imputed with the regression.
+        :type rows: int
+        :param fit_time: The time spent fitting the model, in seconds.
+        :type fit_time: scalar
+        """
+        self.regressions.append({
+            'dependent': dependent,
+            'predictors': tuple(predictors),
+            'intercept': intercept,
+            'coefs': dict(zip(predictors, coefs)),
+            'std_error': std_error,
+            'rows': rows,
+            'fit_time': fit_time})
+
+    def rows_imputed(self):
+        """Computes the total number of rows imputed by the regressions.
+
+        :return: The number of imputed rows.
+        :rtype: int
+        """
+        return sum(regression['rows'] for regression in self.regressions)
+
+    def to_frame(self):
+        """Returns the recorded regressions as a dataframe, with one row per
+        regression and the columns dependent, predictors, intercept, coefs,
+        std_error, rows and fit_time.
+
+        :return: The recorded regressions.
+        :rtype: pandas.DataFrame
+        """
+        return pd.DataFrame(self.regressions, columns=[
+            'dependent', 'predictors', 'intercept', 'coefs', 'std_error',
+            'rows', 'fit_time'])
@@ -1,18 +1,31 @@
 import pandas as pd
 import numpy as np
-from statsmodels.tsa.seasonal import seasonal_decompose
+from scipy import signal
+from statsmodels.tsa.tsatools import freq_to_period
+
+from imputena.parallel import run_on_column_chunks
+from imputena.simple_imputation.utils import get_float_dtype
+from imputena.instrumentation import stage
 
 
 def seasonal_interpolation(
         data=None, dec_model='multiplicative', int_method='linear',
-        int_direction='both', columns=None, inplace=False):
+        int_direction='both', columns=None, n_jobs=1, dtype='float64',
+        inplace=False):
     """Performs interpolation with seasonal adjustment on a time series or a
     data frame containing time series. First, the time series gets
     decomposed according to the decomposition model (additive or
     multiplicative). Then, the missing values are interpolated using the
     interpolation method (linear, cubic or quadratic) on a series consisting of
     only the trend and irregular components. Finally, the seasonality is
-    added back to the series.
+    added back to the series. All the columns of a data frame that contain
+    missing values are decomposed at once, and the columns without missing
+    values are skipped. The columns can be split into chunks that are
+    processed on a pool of processes by setting n_jobs. With
+    dtype='float32', the decomposition and the interpolations are computed
+    in single precision, which halves the memory of the intermediate
+    arrays, at the cost of a relative error of about 1e-6 in the imputed
+    values.
 
     :param data: The data on which to perform the seasonal interpolation.
     :type data: pandas.Series or pandas.DataFrame
@@ -25,6 +38,11 @@ def seasonal_interpolation(
     :type int_direction: {'forward', 'backward', 'both'}, default 'both'
     :param columns: Columns on which to apply the operation.
     :type columns: array-like, optional
+    :param n_jobs: The number of processes on which to process chunks of
+        the columns of a data frame. If -1, the number of CPUs is used.
+    :type n_jobs: int, default 1
+    :param dtype: The floating point type in which to compute.
+    :type dtype: {'float64', 'float32'}, default 'float64'
     :param inplace: If True, do operation inplace and return None.
     :type inplace: bool, default False
     :return: The series or dataframe with NA values interpolated, or
@@ -42,17 +60,22 @@ def seasonal_interpolation(
     # Check if dec_model has a valid value:
     if dec_model not in ['multiplicative', 'additive']:
         raise ValueError(dec_model + 'is not a supported decomposition model.')
+    # Check the floating point type:
+    dtype = get_float_dtype(dtype)
     # Assign a reference or copy to res, depending on inplace:
     if inplace:
         res = data
     else:
-        res = data.copy()
+        with stage('seasonal_interpolation.copy', len(data), data.size):
+            res = data.copy()
     # Treatment if the data is a Series:
     if isinstance(data, pd.Series):
-        # The operation is only applied if the column contains non-NA values:
-        if data.notnull().sum() > 0:
-            res[:] = seasonal_interpolate_series(
-                data, dec_model, int_method, int_direction)
+        # The operation is only applied if the series contains NA values
+        # and non-NA values:
+        if data.isna().any() and data.notna().any():
+            res[:] = seasonal_interpolate_frame(
+                data.to_frame(), dec_model, int_method, int_direction, dtype
+            ).iloc[:, 0]
     # Treatment if the data is a DataFrame:
     if isinstance(data, pd.DataFrame):
         # If no columns are given, apply the operations to all columns of
@@ -64,11 +87,18 @@ def seasonal_interpolation(
             if column not in data.columns:
                 raise ValueError(
                     '\'' + column + '\' is not a column of the data.')
-            # The operation is only applied if the column contains non-NA
-            # values:
-            if data[column].notnull().sum() > 0:
-                res[column] = seasonal_interpolate_series(
-                    data[column], dec_model, int_method, int_direction)
+        # The operation is only applied to the columns that contain NA
+        # values and non-NA values:
+        na_counts = data[columns].isna().sum()
+        columns = [
+            column for column in columns
+            if 0 < na_counts[column] < len(data)]
+        # Interpolate all of them at once, or in chunks on a process pool:
+        if len(columns) > 0:
+            res.loc[:, columns] = run_on_column_chunks(
+                seasonal_interpolate_frame, data[columns], n_jobs,
+                dec_model=dec_model, int_method=int_method,
+                int_direction=int_direction, dtype=dtype).to_numpy()
     # Return the imputed data, or None if inplace:
     if inplace:
         return None
@@ -76,14 +106,20 @@ def seasonal_interpolation(
         return res
 
 
-def seasonal_interpolate_series(data, dec_model, int_method, int_direction):
-    """Auxiliary function that interpolates a series with seasonal
-    adjustment. It always returns a copy.
+def seasonal_interpolate_frame(
+        data, dec_model, int_method, int_direction, dtype=np.float64):
+    """Auxiliary function that interpolates each column of a data frame with
+    seasonal adjustment. All columns are decomposed at once, with the same
+    computations as statsmodels.tsa.seasonal.seasonal_decompose() performed
+    on two-dimensional arrays: the trend is extracted with a centered moving
+    average and the seasonal component is the average of the detrended
+    values of each period. It always returns a copy.
 
-    :param data: The series on which to perform the operation.
-    :type data: pandas.Series
-    :param dec_model: The decomposition model to use. Passed to
-        statsmodels.tsa.seasonal.seasonal_decompose().
+    :param data: The data frame on which to perform the operation. It has to
+        have a DatetimeIndex or PeriodIndex with a frequency, and each
+        column has to contain some non-NA value.
+    :type data: pandas.DataFrame
+    :param dec_model: The decomposition model to use.
     :type dec_model: {'multiplicative', 'additive'}
     :param int_method: The interpolation model to use. Passed to
         pandas.DataFrame.interpolate()
@@ -91,37 +127,108 @@ def seasonal_interpolate_series(data, dec_model, int_method, int_direction):
     :param int_direction: Direction in which to interpolate values. Passed to
         pandas.DataFrame.interpolate()
     :type int_direction: {'forward', 'backward', 'both'}
+    :param dtype: The floating point type in which to compute.
+    :type dtype: numpy.dtype, default numpy.float64
     :return: The data interpolated with seasonal adjustment.
-    :rtype: pandas.Series
+    :rtype: pandas.DataFrame
+    :raises: ValueError
     """
-    # This function aways returns a copy. The parent function takes care of
-    # assigning its results to the same series or data frame if the
-    # operation is to be made inplace.
-    res = data.copy()
     # kwargs for the pandas interpolate() function:
     int_kwargs = {'limit_direction': int_direction}
-    # 1. Missing data index:
-    na_index = pd.isna(data)
+    # 1. Missing data mask:
+    na_mask = data.isna().to_numpy()
     # 2. Interpolate NAs:
-    temp = data.interpolate(method=int_method, **int_kwargs)
+    with stage('seasonal_interpolation.interpolate', len(data), data.size):
+        temp = data.astype(dtype).interpolate(
+            method=int_method, **int_kwargs).to_numpy(dtype=dtype)
     # 3. Decompose:
-    dr = seasonal_decompose(temp, model=dec_model)
+    with stage('seasonal_interpolation.decompose', len(data), data.size):
+        trend, seasonal, resid = decompose(
+            temp, data.index, dec_model == 'multiplicative')
     # 4. Join trend and irregular component (timeseries without seasonality):
     if dec_model == 'multiplicative':
-        data_no_seasonality = dr.trend * dr.resid
+        data_no_seasonality = trend * resid
     if dec_model == 'additive':
-        data_no_seasonality = dr.trend + dr.resid
+        data_no_seasonality = trend + resid
     # 5. Fill in NA values:
-    data_no_seasonality[na_index] = np.nan
+    data_no_seasonality[na_mask] = np.nan
     # 6. Interpolate data without seasonality:
-    data_no_seasonality_imputed = data_no_seasonality.interpolate(
-        method=int_method, **int_kwargs)
+    with stage('seasonal_interpolation.reinterpolate', len(data), data.size):
+        data_no_seasonality_imputed = pd.DataFrame(
+            data_no_seasonality, index=data.index, columns=data.columns
+        ).interpolate(method=int_method, **int_kwargs).to_numpy()
     # 7. Add back seasonality:
     if dec_model == 'multiplicative':
-        data_imputed = data_no_seasonality_imputed * dr.seasonal
+        data_imputed = data_no_seasonality_imputed * seasonal
     if dec_model == 'additive':
-        data_imputed = data_no_seasonality_imputed + dr.seasonal
+        data_imputed = data_no_seasonality_imputed + seasonal
     # 8. Merge interpolated values into original timeseries:
-    res[na_index] = data_imputed[na_index]
-    # Return the seasonally interpolated series:
-    return res
+    return data.mask(na_mask, data_imputed)
+
+
+def decompose(values, index, multiplicative):
+    """Auxiliary function that decomposes each column of a two-dimensional
+    array into trend, seasonal and irregular components, in the same way as
+    statsmodels.tsa.seasonal.seasonal_decompose() with its default
+    arguments. The period is inferred from the frequency of the index.
+
+    :param values: The values to decompose, one series per column.
+    :type values: numpy.ndarray
+    :param index: The index of the series.
+    :type index: pandas.Index
+    :param multiplicative: Whether to use the multiplicative model instead
+        of the additive one.
+    :type multiplicative: bool
+    :return: The trend, seasonal and irregular components.
+    :rtype: (numpy.ndarray, numpy.ndarray, numpy.ndarray)
+    :raises: ValueError
+    """
+    nobs = len(values)
+    if not np.all(np.isfinite(values)):
+        raise ValueError('This function does not handle missing values')
+    if multiplicative and np.any(values <= 0):
+        raise ValueError(
+            'Multiplicative seasonality is not appropriate for zero and '
+            'negative values')
+    freq = getattr(index, 'inferred_freq', None)
+    if freq is None:
+        raise ValueError(
+            'The data has to have a PeriodIndex or a DatetimeIndex with a '
+            'frequency.')
+    period = freq_to_period(freq)
+    if nobs < 2 * period:
+        raise ValueError(
+            'The data must have 2 complete cycles, which requires '
+            + str(2 * period) + ' observations, but only has '
+            + str(nobs) + '.')
+    # Trend: centered moving average over one period, with the weights
+    # split at both ends if the period is even:
+    if period % 2 == 0:
+        filt = np.array([.5] + [1] * (period - 1) + [.5]) / period
+    else:
+        filt = np.repeat(1. / period, period)
+    filt = filt.astype(values.dtype)
+    head = int(np.ceil(len(filt) / 2.) - 1)
+    tail = int(np.ceil(len(filt) / 2.) - len(filt) % 2)
+    trend = np.full(values.shape, np.nan, dtype=values.dtype)
+    trend[head:nobs - tail] = signal.convolve(
+        values, filt[:, None], mode='valid')
+    # Seasonal component: average of the detrended values of each position
+    # in the period, normalized over the period:
+    if multiplicative:
+        detrended = values / trend
+    else:
+        detrended = values - trend
+    period_averages = np.array([
+        np.nanmean(detrended[i::period], axis=0) for i in range(period)])
+    if multiplicative:
+        period_averages /= np.mean(period_averages, axis=0)
+    else:
+        period_averages -= np.mean(period_averages, axis=0)
+    seasonal = np.tile(period_averages.T, nobs // period + 1).T[:nobs]
+    # Irregular component:
+    if multiplicative:
+        resid = values / seasonal / trend
+    else:
+        resid = detrended - seasonal
+    return trend, seasonal, resid
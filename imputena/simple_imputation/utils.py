@@ -0,0 +1,319 @@
+"""Auxiliary functions used by several imputation functions.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def get_predictor_patterns(
+        data, dependent, predictors, do_available_regressions):
+    """Auxiliary function that computes, in a single pass over a boolean
+    mask of missing values, all distinct patterns of missing predictors
+    among the rows in which the dependent variable is missing. For each
+    pattern, the combination of available predictors and the positions of
+    the rows that have that pattern are returned. Patterns for which no
+    predictor is available are omitted, since those rows cannot be imputed.
+    If do_available_regressions is False, only the pattern in which all
+    predictors are available is returned. The pattern with all predictors
+    available, if present, is always the first one.
+
+    :param data: The data on which the regression imputation is performed.
+    :type data: pandas.DataFrame
+    :param dependent: The dependent variable in which the missing values
+        should be imputed.
+    :type dependent: String
+    :param predictors: The predictor variables on which the dependent variable
+        is dependent.
+    :type predictors: array-like
+    :param do_available_regressions: Whether to return the patterns for all
+        available predictor combinations or only the complete one
+    :type do_available_regressions: bool
+    :return: Pairs of available predictors and row positions, one for each
+        pattern.
+    :rtype: list of (tuple, numpy.ndarray)
+    """
+    predictors = list(predictors)
+    # Positions of the rows in which the dependent variable is missing:
+    na_dependent = data[dependent].isna().to_numpy()
+    na_rows = np.flatnonzero(na_dependent)
+    if len(na_rows) == 0:
+        return []
+    # Boolean mask of the missing predictors in those rows:
+    na_predictors = data.loc[na_dependent, predictors].isna().to_numpy()
+    # Distinct patterns, sorted so that the complete pattern comes first,
+    # and the pattern to which each row belongs:
+    patterns, inverse = np.unique(
+        na_predictors, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    # Split the row positions by pattern:
+    order = np.argsort(inverse, kind='stable')
+    splits = np.cumsum(np.bincount(inverse, minlength=len(patterns)))[:-1]
+    rows_by_pattern = np.split(na_rows[order], splits)
+    res = []
+    for pattern, rows in zip(patterns, rows_by_pattern):
+        # Only the complete pattern is used for 'complete' regressions:
+        if pattern.any() and not do_available_regressions:
+            continue
+        available_predictors = tuple(
+            predictor for predictor, is_na in zip(predictors, pattern)
+            if not is_na)
+        # Rows in which all predictors are missing cannot be imputed:
+        if available_predictors != ():
+            res.append((available_predictors, rows))
+    return res
+
+
+def compute_regression_statistics(
+        data, dependent, predictors, pairwise, chunk_size=65536):
+    """Auxiliary function that accumulates, in two passes over the data,
+    the sufficient statistics of the linear regressions of the dependent
+    variable on any subset of the predictors: the means of the variables
+    and the matrix of cross-products of their deviations from the mean
+    (X^T X and X^T y, centered). Only rows in which the dependent variable
+    is available are used. If pairwise is False, only the rows in which all
+    predictors are available are used as well (complete cases). If pairwise
+    is True, each entry of the matrix is accumulated over all rows in which
+    both variables are available (pairwise-available observations). The
+    first pass computes the means and the second one the cross-products.
+    The rows are read in chunks, so that only a chunk of the needed columns
+    is copied at a time.
+
+    :param data: The data from which to compute the statistics.
+    :type data: pandas.DataFrame
+    :param dependent: The dependent variable of the regressions.
+    :type dependent: String
+    :param predictors: All predictor variables that may be used in the
+        regressions.
+    :type predictors: array-like
+    :param pairwise: Whether to use pairwise-available observations instead
+        of complete cases.
+    :type pairwise: bool
+    :param chunk_size: The number of rows read at a time.
+    :type chunk_size: int, default 65536
+    :return: The statistics, to be passed to solve_regression().
+    :rtype: dict
+    """
+    variables = list(predictors) + [dependent]
+    # Shift each variable by its mean to keep the cross-products accurate:
+    sums = np.zeros(len(variables))
+    counts = np.zeros(len(variables))
+    for z in iter_regression_chunks(
+            data, variables, pairwise, chunk_size):
+        sums += np.nansum(z, axis=0)
+        counts += (~np.isnan(z)).sum(axis=0)
+    shift = np.divide(sums, counts, out=np.zeros(len(variables)),
+                      where=counts > 0)
+    # Number of rows in which each pair of variables is available, sums of
+    # each variable over those rows, and cross-products, accumulated over
+    # the chunks:
+    n = np.zeros((len(variables), len(variables)))
+    sums = np.zeros((len(variables), len(variables)))
+    cross = np.zeros((len(variables), len(variables)))
+    for z in iter_regression_chunks(
+            data, variables, pairwise, chunk_size):
+        observed = ~np.isnan(z)
+        z -= shift
+        z[~observed] = 0.
+        w = observed.astype(float)
+        n += w.T @ w
+        sums += z.T @ w
+        cross += z.T @ z
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = np.where(n > 0, cross - sums * sums.T / n, 0.)
+        mean = np.diag(sums) / np.diag(n) + shift
+    return {
+        'index': {variable: i for i, variable in enumerate(variables)},
+        'n': n,
+        'mean': mean,
+        'cov': cov}
+
+
+def iter_regression_chunks(data, variables, pairwise, chunk_size):
+    """Auxiliary function that yields, chunk by chunk, the values of the
+    variables in the rows used by compute_regression_statistics().
+
+    :param data: The data from which to compute the statistics.
+    :type data: pandas.DataFrame
+    :param variables: The variables, the dependent one being the last.
+    :type variables: list
+    :param pairwise: Whether to keep the rows in which some predictor is
+        missing.
+    :type pairwise: bool
+    :param chunk_size: The number of rows read at a time.
+    :type chunk_size: int
+    :return: For each chunk, a copy of the values that can be modified.
+    :rtype: generator of numpy.ndarray
+    """
+    for start in range(0, len(data), chunk_size):
+        z = data.iloc[start:start + chunk_size][variables].to_numpy(
+            dtype=float)
+        # Only rows in which the dependent variable is available are used:
+        if pairwise:
+            z = z[~np.isnan(z[:, -1])]
+        else:
+            # Only complete cases are used:
+            z = z[~np.isnan(z).any(axis=1)]
+        yield z
+
+
+def solve_regression(statistics, dependent, predictors):
+    """Auxiliary function that computes the linear regression of the
+    dependent variable on a subset of the predictors by slicing the
+    statistics computed by compute_regression_statistics(), without
+    accessing the data again.
+
+    :param statistics: The statistics returned by
+        compute_regression_statistics().
+    :type statistics: dict
+    :param dependent: The dependent variable of the regression.
+    :type dependent: String
+    :param predictors: The predictor variables of the regression. They
+        have to be a subset of the predictors used to compute the statistics.
+    :type predictors: array-like
+    :return: The intercept, the coefficients in the same order as the
+        predictors, and the standard error of the regression.
+    :rtype: (scalar, numpy.ndarray, scalar)
+    """
+    index = statistics['index']
+    x_idx = [index[predictor] for predictor in predictors]
+    y_idx = index[dependent]
+    cov = statistics['cov']
+    mean = statistics['mean']
+    sxx = cov[np.ix_(x_idx, x_idx)]
+    sxy = cov[x_idx, y_idx]
+    coefs = np.linalg.lstsq(sxx, sxy, rcond=None)[0]
+    intercept = mean[y_idx] - mean[x_idx] @ coefs
+    # Standard error of the residuals, computed from the residual sum of
+    # squares over the rows in which all variables are available:
+    all_idx = x_idx + [y_idx]
+    n = statistics['n'][np.ix_(all_idx, all_idx)].min()
+    rss = max(cov[y_idx, y_idx] - coefs @ sxy, 0.)
+    std_error = np.sqrt(rss / (n - 1)) if n > 1 else np.nan
+    return intercept, coefs, std_error
+
+
+def get_random_generator(random_state):
+    """Auxiliary function that returns the random number generator to use
+    for the random_state parameter of a stochastic imputation function.
+
+    :param random_state: If None, a generator seeded from numpy's global
+        random state, so that numpy.random.seed() keeps results
+        reproducible. If an int or a numpy.random.SeedSequence, a new
+        generator seeded with it. If a numpy.random.Generator, the
+        generator itself.
+    :type random_state: None, int, numpy.random.SeedSequence or
+        numpy.random.Generator
+    :return: The random number generator.
+    :rtype: numpy.random.Generator
+    """
+    if random_state is None:
+        return np.random.default_rng(np.random.randint(2 ** 31))
+    return np.random.default_rng(random_state)
+
+
+def spawn_random_generators(random_state, n):
+    """Auxiliary function that returns n independent random number
+    generators, spawned from a single numpy.random.SeedSequence, for n
+    independent runs of a stochastic imputation.
+
+    :param random_state: The seed from which to spawn the generators (see
+        get_random_generator()).
+    :type random_state: None, int, numpy.random.SeedSequence or
+        numpy.random.Generator
+    :param n: The number of generators.
+    :type n: int
+    :return: The random number generators.
+    :rtype: list of numpy.random.Generator
+    """
+    if isinstance(random_state, np.random.SeedSequence):
+        seed_sequence = random_state
+    elif isinstance(random_state, np.random.Generator):
+        seed_sequence = np.random.SeedSequence(
+            random_state.integers(2 ** 63, size=4))
+    elif random_state is None:
+        seed_sequence = np.random.SeedSequence(np.random.randint(2 ** 31))
+    else:
+        seed_sequence = np.random.SeedSequence(random_state)
+    return [np.random.default_rng(seed) for seed in seed_sequence.spawn(n)]
+
+
+def encode_categorical(series, sort=False):
+    """Auxiliary function that encodes the values of a series as compact
+    integer codes, so that categorical data can be grouped, compared and
+    sampled with vectorized integer operations, and only the imputed cells
+    need to be mapped back to their values. The codes of a categorical
+    series are its own codes, so no hashing is needed; other series are
+    factorized in a single hashing pass.
+
+    :param series: The series to encode.
+    :type series: pandas.Series
+    :param sort: Whether the codes should follow the order of the sorted
+        values. If the values cannot be compared, they are numbered by
+        their first appearance.
+    :type sort: bool, default False
+    :return: The code of each value, -1 meaning NA, and the values of the
+        codes, so that categories.take(codes) decodes them.
+    :rtype: (numpy.ndarray, pandas.Index)
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy().astype(np.int32)
+        categories = series.cat.categories
+        if sort and not categories.is_monotonic_increasing:
+            order = categories.argsort()
+            ranks = np.empty(len(order), dtype=np.int32)
+            ranks[order] = np.arange(len(order), dtype=np.int32)
+            codes = np.where(codes >= 0, ranks[codes], np.int32(-1))
+            categories = categories[order]
+        return codes, categories
+    try:
+        codes, categories = pd.factorize(series, sort=sort)
+    except TypeError:
+        codes, categories = pd.factorize(series)
+    return codes.astype(np.int32), categories
+
+
+def get_most_frequent_value(series):
+    """Auxiliary function that computes the most frequent value of a series,
+    like series.mode().iloc[0], in a single pass: the values are encoded as
+    integer codes, which for a categorical series are its own codes, and the
+    codes are counted with np.bincount. In case of ties, the smallest value
+    (or, for a categorical series, the first category) is chosen. Values that
+    cannot be compared are tie-broken by their first appearance.
+
+    :param series: The series.
+    :type series: pandas.Series
+    :return: The most frequent value, or NA if the series has no values.
+    """
+    codes, categories = encode_categorical(series)
+    counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+    if len(counts) == 0 or counts.max() == 0:
+        return np.nan
+    candidates = np.flatnonzero(counts == counts.max())
+    # The categories of a categorical series are already in order:
+    if len(candidates) == 1 or isinstance(
+            series.dtype, pd.CategoricalDtype):
+        return categories[candidates[0]]
+    tied = categories[candidates]
+    try:
+        return tied.min()
+    except TypeError:
+        return tied[0]
+
+
+def get_float_dtype(dtype):
+    """Auxiliary function that checks the floating point type in which a
+    method should compute.
+
+    :param dtype: The floating point type.
+    :type dtype: {'float64', 'float32'} or numpy.dtype
+    :return: The floating point type.
+    :rtype: numpy.dtype
+    :raises: ValueError
+    """
+    try:
+        checked = np.dtype(dtype)
+    except TypeError:
+        checked = None
+    if checked not in [np.dtype(np.float64), np.dtype(np.float32)]:
+        raise ValueError(str(dtype) + ' is not a supported dtype.')
+    return checked
@@ -0,0 +1,355 @@
+"""Partial statistics that can be accumulated on parts of a dataset and
+merged. They are used by the simple imputation functions and by the
+streaming imputation.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+
+# Offset that separates the bucket codes of negative, zero and positive
+# values in QuantileSketch, so that the codes are ordered like the values:
+_SIGN_OFFSET = 2 ** 40
+
+
+def as_frame(chunk):
+    """Auxiliary function that converts a chunk of data to a dataframe. A
+    series becomes a dataframe with one column named like the series, or 0
+    if the series has no name.
+
+    :param chunk: The chunk of data.
+    :type chunk: pandas.Series or pandas.DataFrame
+    :return: The chunk as a dataframe.
+    :rtype: pandas.DataFrame
+    :raises: TypeError
+    """
+    if isinstance(chunk, pd.Series):
+        return chunk.to_frame(name=get_series_key(chunk))
+    if not isinstance(chunk, pd.DataFrame):
+        raise TypeError('The data has to be a Series or DataFrame.')
+    return chunk
+
+
+def get_series_key(series):
+    """Auxiliary function that returns the key under which the statistics
+    of a series are kept: its name, or 0 if it has no name.
+
+    :param series: The series.
+    :type series: pandas.Series
+    :return: The key.
+    """
+    return 0 if series.name is None else series.name
+
+
+def get_exact_sum(values):
+    """Auxiliary function that sums some values, returning the sum as a
+    pair of floats: the sum rounded to a float and the rounded remainder.
+
+    :param values: The values.
+    :type values: array-like
+    :return: The two partial sums.
+    :rtype: list
+    """
+    try:
+        total = math.fsum(values)
+    except (ValueError, OverflowError):
+        # The values contain infinities of both signs, or their sum
+        # overflows:
+        return [float(np.sum(values)), 0.]
+    if not math.isfinite(total):
+        return [total, 0.]
+    return [total, math.fsum(np.append(values, -total))]
+
+
+class MeanState:
+    """Partial state of the means of the numeric columns of some data. It
+    keeps the sum and the number of available values of each column, so
+    that it can be updated with successive chunks of the data and merged
+    with the states of other parts of the data. Each sum is kept as a pair
+    of floats whose total is the exact sum up to a relative error of about
+    1e-32, so that the means, rounded to floats, do not depend on how the
+    data was split.
+    """
+
+    def __init__(self):
+        self.sums = {}
+        self.counts = {}
+
+    def update(self, chunk):
+        """Adds the values of a chunk of the data to the state.
+
+        :param chunk: The chunk of the data.
+        :type chunk: pandas.Series or pandas.DataFrame
+        :return: The state itself.
+        :rtype: MeanState
+        """
+        chunk = as_frame(chunk)
+        for column in chunk.columns:
+            if not is_numeric_dtype(chunk[column]):
+                continue
+            values = chunk[column].to_numpy(dtype=float)
+            values = values[~np.isnan(values)]
+            self.add_sum(column, get_exact_sum(values), len(values))
+        return self
+
+    def merge(self, other):
+        """Adds the partial state of another part of the data to the state.
+
+        :param other: The other state.
+        :type other: MeanState
+        :return: The state itself.
+        :rtype: MeanState
+        """
+        for column, partials in other.sums.items():
+            self.add_sum(column, partials, other.counts[column])
+        return self
+
+    def add_sum(self, column, partials, count):
+        """Adds a sum of values of a column to the state.
+
+        :param column: The column.
+        :param partials: The sum, as a pair of floats.
+        :type partials: list
+        :param count: The number of values.
+        :type count: int
+        """
+        if column in self.sums:
+            partials = get_exact_sum(self.sums[column] + list(partials))
+            count += self.counts[column]
+        self.sums[column] = list(partials)
+        self.counts[column] = count
+
+    def result(self):
+        """Computes the means of the columns. The mean of a column without
+        available values is NA.
+
+        :return: The mean of each numeric column.
+        :rtype: pandas.Series
+        """
+        means = {}
+        for column, partials in self.sums.items():
+            count = self.counts[column]
+            means[column] = sum(partials) / count if count > 0 else np.nan
+        return pd.Series(means, dtype=float)
+
+
+class ModeState:
+    """Partial state of the most frequent values of the columns of some
+    data. It keeps the number of occurrences of each value of each column,
+    so that it can be updated with successive chunks of the data and merged
+    with the states of other parts of the data. Its size is proportional to
+    the number of distinct values of the columns.
+    """
+
+    def __init__(self):
+        self.counts = {}
+
+    def update(self, chunk):
+        """Adds the values of a chunk of the data to the state.
+
+        :param chunk: The chunk of the data.
+        :type chunk: pandas.Series or pandas.DataFrame
+        :return: The state itself.
+        :rtype: ModeState
+        """
+        chunk = as_frame(chunk)
+        for column in chunk.columns:
+            self.add_counts(column, chunk[column].value_counts(sort=False))
+        return self
+
+    def merge(self, other):
+        """Adds the partial state of another part of the data to the state.
+
+        :param other: The other state.
+        :type other: ModeState
+        :return: The state itself.
+        :rtype: ModeState
+        """
+        for column, counts in other.counts.items():
+            self.add_counts(column, counts)
+        return self
+
+    def add_counts(self, column, counts):
+        """Adds the numbers of occurrences of some values of a column to the
+        state.
+
+        :param column: The column.
+        :param counts: The number of occurrences of each value.
+        :type counts: pandas.Series
+        """
+        if column in self.counts:
+            self.counts[column] = self.counts[column].add(
+                counts, fill_value=0)
+        else:
+            self.counts[column] = counts
+
+    def result(self):
+        """Computes the most frequent value of each column. In case of ties,
+        the smallest value is chosen, like data.mode().iloc[0] does. The
+        most frequent value of a column without available values is NA.
+
+        :return: The most frequent value of each column.
+        :rtype: pandas.Series
+        """
+        modes = {}
+        for column, counts in self.counts.items():
+            if len(counts) == 0:
+                modes[column] = np.nan
+                continue
+            candidates = list(counts.index[counts == counts.max()])
+            try:
+                candidates.sort()
+            except TypeError:
+                pass
+            modes[column] = candidates[0]
+        return pd.Series(modes, dtype=object)
+
+
+class QuantileSketch:
+    """Partial state of the medians of the numeric columns of some data.
+    The values of each column are counted in buckets of logarithmically
+    growing width, so that any value estimated from its bucket has a
+    relative error of at most relative_accuracy. The sketch can be updated
+    with successive chunks of the data and merged with the sketches of
+    other parts of the data, and its result does not depend on how the
+    data was split. Its size grows with the logarithm of the range of the
+    values, not with their number.
+
+    :param relative_accuracy: The maximum relative error of the estimated
+        values.
+    :type relative_accuracy: scalar, default 0.01
+    :raises: ValueError
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        # Check the value of relative_accuracy:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(
+                'relative_accuracy has to be between 0 and 1, but is '
+                '{}.'.format(relative_accuracy))
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+
+    def get_codes(self, values):
+        """Computes the codes of the buckets of some values. The codes are
+        ordered like the values: negative values have negative codes, zero
+        has code 0 and positive values have positive codes.
+
+        :param values: The values, without NA.
+        :type values: numpy.ndarray
+        :return: The code of the bucket of each value.
+        :rtype: numpy.ndarray
+        """
+        codes = np.zeros(len(values), dtype=np.int64)
+        nonzero = values != 0
+        magnitudes = np.abs(values[nonzero])
+        keys = np.ceil(np.log(magnitudes) / self.log_gamma).astype(np.int64)
+        signs = np.sign(values[nonzero]).astype(np.int64)
+        codes[nonzero] = signs * (_SIGN_OFFSET + keys)
+        return codes
+
+    def get_value(self, code):
+        """Estimates the values of a bucket.
+
+        :param code: The code of the bucket.
+        :type code: int
+        :return: The estimated value.
+        :rtype: float
+        """
+        if code == 0:
+            return 0.
+        sign = 1 if code > 0 else -1
+        key = sign * code - _SIGN_OFFSET
+        return sign * 2 * self.gamma ** key / (self.gamma + 1)
+
+    def update(self, chunk):
+        """Adds the values of a chunk of the data to the sketch.
+
+        :param chunk: The chunk of the data.
+        :type chunk: pandas.Series or pandas.DataFrame
+        :return: The sketch itself.
+        :rtype: QuantileSketch
+        """
+        chunk = as_frame(chunk)
+        for column in chunk.columns:
+            if not is_numeric_dtype(chunk[column]):
+                continue
+            values = chunk[column].to_numpy(dtype=float)
+            values = values[np.isfinite(values)]
+            codes, counts = np.unique(
+                self.get_codes(values), return_counts=True)
+            buckets = self.buckets.setdefault(column, {})
+            for code, count in zip(codes.tolist(), counts.tolist()):
+                buckets[code] = buckets.get(code, 0) + count
+        return self
+
+    def merge(self, other):
+        """Adds another sketch, with the same relative accuracy, to the
+        sketch.
+
+        :param other: The other sketch.
+        :type other: QuantileSketch
+        :return: The sketch itself.
+        :rtype: QuantileSketch
+        :raises: ValueError
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError(
+                'Only sketches with the same relative accuracy can be '
+                'merged.')
+        for column, other_buckets in other.buckets.items():
+            buckets = self.buckets.setdefault(column, {})
+            for code, count in other_buckets.items():
+                buckets[code] = buckets.get(code, 0) + count
+        return self
+
+    def locate_median(self, column):
+        """Finds the buckets of the values of a column that determine its
+        median: the middle value, or the two middle values if the number of
+        values is even.
+
+        :param column: The column.
+        :return: The code of the bucket of each middle value and its
+            position among the values of the bucket, or an empty list if the
+            column has no values.
+        :rtype: list of (int, int)
+        """
+        buckets = self.buckets.get(column, {})
+        total = sum(buckets.values())
+        if total == 0:
+            return []
+        ranks = [(total - 1) // 2, total // 2]
+        located = []
+        seen = 0
+        for code in sorted(buckets):
+            count = buckets[code]
+            while ranks and ranks[0] < seen + count:
+                located.append((code, ranks.pop(0) - seen))
+            seen += count
+        return located
+
+    def result(self):
+        """Estimates the median of each numeric column. The estimate of each
+        middle value has a relative error of at most relative_accuracy, so
+        if the middle values have the same sign, the estimated median m'
+        of a column with median m satisfies
+        abs(m' - m) <= relative_accuracy * abs(m). The median of a column
+        without available values is NA.
+
+        :return: The estimated median of each numeric column.
+        :rtype: pandas.Series
+        """
+        medians = {}
+        for column in self.buckets:
+            located = self.locate_median(column)
+            if len(located) == 0:
+                medians[column] = np.nan
+            else:
+                medians[column] = np.mean(
+                    [self.get_value(code) for code, _ in located])
+        return pd.Series(medians, dtype=float)
@@ -0,0 +1,358 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from imputena import (
+    constant_value_imputation, delete_listwise, delete_pairwise)
+from imputena.statistics import (
+    MeanState, ModeState, QuantileSketch)
+
+
+def impute_chunked(
+        source=None, destination=None, method='mean', columns=None, value=0,
+        threshold=None, exact=False, relative_accuracy=0.01,
+        chunk_size=100000, file_format=None):
+    """Applies a column-statistic imputation or a deletion to a dataset
+    stored in CSV or Parquet files that may not fit in memory, and writes
+    the result to another file. The dataset is read in chunks of rows: a
+    first pass accumulates the statistics of the selected columns, and a
+    second pass imputes each chunk with them and appends it to the
+    destination, so that only one chunk is in memory at a time. The
+    methods have the same semantics as the functions of the same name:
+
+    * 'mean' and 'median': mean_substitution(). The means are exact. The
+      medians are estimated with a quantile sketch whose middle values have
+      a relative error of at most relative_accuracy, or, if exact=True,
+      computed exactly with an additional pass over the dataset.
+    * 'most_frequent': most_frequent(). The number of occurrences of each
+      value is counted, so the memory used is proportional to the number
+      of distinct values of the selected columns.
+    * 'constant': constant_value_imputation().
+    * 'delete_listwise', 'delete_pairwise' and 'delete_columns':
+      delete_listwise(), delete_pairwise() and delete_columns().
+
+    Parquet files are read and written with pyarrow, which has to be
+    installed. When writing Parquet, the integer columns that are imputed
+    are written as floats, as pandas represents them when they contain
+    missing values.
+
+    :param source: The path of the CSV or Parquet file, or a list of paths.
+        A Parquet dataset may also be a directory of (partitioned) files.
+    :type source: str, path-like or list
+    :param destination: The path of the file to write.
+    :type destination: str or path-like
+    :param method: The imputation or deletion to apply.
+    :type method: {'mean', 'median', 'most_frequent', 'constant',
+        'delete_listwise', 'delete_pairwise', 'delete_columns'},
+        default 'mean'
+    :param columns: Columns on which to apply the operation. If omitted,
+        all columns are used. Required for 'delete_pairwise'.
+    :type columns: array-like, optional
+    :param value: The value with which to fill in missing values if
+        method='constant'.
+    :type value: scalar, default 0
+    :param threshold: The threshold of the deletion methods.
+    :type threshold: int, optional
+    :param exact: Whether to compute the medians exactly if
+        method='median'.
+    :type exact: bool, default False
+    :param relative_accuracy: The maximum relative error of the middle
+        values of the estimated medians if method='median'.
+    :type relative_accuracy: scalar, default 0.01
+    :param chunk_size: The number of rows of each chunk.
+    :type chunk_size: int, default 100000
+    :param file_format: The format of the source and the destination. If
+        omitted, it is inferred from the extension of the source.
+    :type file_format: {'csv', 'parquet'}, optional
+    :raises: TypeError, ValueError, ImportError
+    """
+    # Check the method and the format:
+    methods = [
+        'mean', 'median', 'most_frequent', 'constant', 'delete_listwise',
+        'delete_pairwise', 'delete_columns']
+    if method not in methods:
+        raise ValueError(method + ' is not a supported method.')
+    if file_format is None:
+        file_format = get_file_format(source)
+    if file_format not in ['csv', 'parquet']:
+        raise ValueError(file_format + ' is not a supported file format.')
+    if not isinstance(chunk_size, int) or chunk_size < 1:
+        raise ValueError(
+            'chunk_size has to be a positive integer, but is {}.'.format(
+                chunk_size))
+    # Check if each of the given columns is actually a column of the data:
+    names = get_column_names(source, file_format)
+    if columns is None:
+        if method == 'delete_pairwise':
+            raise ValueError('Columns have to be given for pairwise deletion.')
+        columns = names
+    else:
+        columns = list(columns)
+        for column in columns:
+            if column not in names:
+                raise ValueError(
+                    '\'' + column + '\' is not a column of the data.')
+    # Define the operation applied to each chunk in the second pass:
+    if method in ['mean', 'median', 'most_frequent']:
+        # First pass: accumulate the statistics of the selected columns:
+        if method == 'mean':
+            state = MeanState()
+        elif method == 'median':
+            state = QuantileSketch(relative_accuracy)
+        else:
+            state = ModeState()
+        for chunk in iter_chunks(source, file_format, chunk_size, columns):
+            state.update(chunk)
+        if method == 'median' and exact:
+            fill_values = compute_exact_medians(
+                iter_chunks(source, file_format, chunk_size, columns), state)
+        else:
+            fill_values = state.result()
+        fill_values = fill_values.dropna().to_dict()
+
+        def process(chunk):
+            constant_value_imputation(chunk, value=fill_values, inplace=True)
+            return chunk
+        filled = list(fill_values)
+    elif method == 'constant':
+        def process(chunk):
+            constant_value_imputation(
+                chunk, value=value, columns=columns, inplace=True)
+            return chunk
+        filled = columns
+    elif method == 'delete_listwise':
+        def process(chunk):
+            return delete_listwise(chunk, threshold=threshold)
+        filled = []
+    elif method == 'delete_pairwise':
+        def process(chunk):
+            return delete_pairwise(chunk, columns, threshold=threshold)
+        filled = []
+    else:
+        # First pass: count the available and missing values of the selected
+        # columns:
+        available = pd.Series(0, index=columns)
+        missing = pd.Series(0, index=columns)
+        for chunk in iter_chunks(source, file_format, chunk_size, columns):
+            available += chunk.notna().sum()
+            missing += chunk.isna().sum()
+        if threshold is None:
+            dropped = [column for column in columns if missing[column] > 0]
+        else:
+            dropped = [
+                column for column in columns
+                if available[column] < threshold]
+
+        def process(chunk):
+            return chunk.drop(columns=dropped)
+        filled = []
+    # Second pass: process each chunk and write it to the destination:
+    write_chunks(
+        (process(chunk) for chunk in iter_chunks(
+            source, file_format, chunk_size)),
+        destination, file_format, source, filled,
+        promote_bool=method in ['mean', 'median'])
+
+
+def compute_exact_medians(chunks, sketch):
+    """Auxiliary function that computes the exact medians of the numeric
+    columns from a quantile sketch of the data and an additional pass over
+    the data. The sketch locates the buckets of the middle values, so only
+    the values in those buckets need to be counted.
+
+    :param chunks: The chunks of the data.
+    :type chunks: iterable of pandas.DataFrame
+    :param sketch: The quantile sketch of the whole data.
+    :type sketch: QuantileSketch
+    :return: The median of each numeric column.
+    :rtype: pandas.Series
+    """
+    located = {
+        column: sketch.locate_median(column) for column in sketch.buckets}
+    bucket_values = {column: ModeState() for column in located}
+    for chunk in chunks:
+        for column, positions in located.items():
+            if len(positions) == 0:
+                continue
+            values = chunk[column].to_numpy(dtype=float)
+            values = values[np.isfinite(values)]
+            in_buckets = np.isin(
+                sketch.get_codes(values), [code for code, _ in positions])
+            bucket_values[column].update(
+                pd.DataFrame({column: values[in_buckets]}))
+    medians = {}
+    for column, positions in located.items():
+        if len(positions) == 0:
+            medians[column] = np.nan
+            continue
+        counts = bucket_values[column].counts[column].sort_index()
+        codes = sketch.get_codes(counts.index.to_numpy(dtype=float))
+        middle_values = []
+        for code, position in positions:
+            in_bucket = counts[codes == code]
+            cumulative = in_bucket.cumsum().to_numpy()
+            index = np.searchsorted(cumulative, position, side='right')
+            middle_values.append(in_bucket.index[index])
+        medians[column] = np.mean(middle_values)
+    return pd.Series(medians, dtype=float)
+
+
+def get_file_format(source):
+    """Auxiliary function that infers the format of a dataset from the
+    extension of its path.
+
+    :param source: The path, or a list of paths.
+    :type source: str, path-like or list
+    :return: The format.
+    :rtype: str
+    :raises: TypeError, ValueError
+    """
+    paths = get_paths(source)
+    path = os.fspath(paths[0])
+    if path.endswith(('.parquet', '.pq')) or os.path.isdir(path):
+        return 'parquet'
+    if path.endswith(('.csv', '.csv.gz', '.csv.bz2', '.csv.zip')):
+        return 'csv'
+    raise ValueError(
+        'The file format of \'' + path + '\' could not be inferred.')
+
+
+def get_paths(source):
+    """Auxiliary function that returns the list of paths of a dataset.
+
+    :param source: The path, or a list of paths.
+    :type source: str, path-like or list
+    :return: The paths.
+    :rtype: list
+    :raises: TypeError
+    """
+    if isinstance(source, (list, tuple)):
+        paths = list(source)
+    else:
+        paths = [source]
+    if len(paths) == 0 or not all(
+            isinstance(path, (str, os.PathLike)) for path in paths):
+        raise TypeError('The source has to be a path or a list of paths.')
+    return paths
+
+
+def import_pyarrow():
+    """Auxiliary function that imports the modules of pyarrow used to read
+    and write Parquet files.
+
+    :return: The modules pyarrow, pyarrow.dataset and pyarrow.parquet.
+    :rtype: tuple
+    :raises: ImportError
+    """
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError(
+            'pyarrow has to be installed to read and write Parquet files.')
+    return pyarrow, pyarrow.dataset, pyarrow.parquet
+
+
+def get_column_names(source, file_format):
+    """Auxiliary function that reads the column names of a dataset.
+
+    :param source: The path, or a list of paths.
+    :type source: str, path-like or list
+    :param file_format: The format of the dataset.
+    :type file_format: {'csv', 'parquet'}
+    :return: The column names.
+    :rtype: list
+    """
+    paths = get_paths(source)
+    if file_format == 'csv':
+        return list(pd.read_csv(paths[0], nrows=0).columns)
+    _, dataset, _ = import_pyarrow()
+    return dataset.dataset(paths, format='parquet').schema.names
+
+
+def iter_chunks(source, file_format, chunk_size, columns=None):
+    """Auxiliary function that reads a dataset in chunks of rows.
+
+    :param source: The path, or a list of paths.
+    :type source: str, path-like or list
+    :param file_format: The format of the dataset.
+    :type file_format: {'csv', 'parquet'}
+    :param chunk_size: The maximum number of rows of each chunk.
+    :type chunk_size: int
+    :param columns: The columns to read. If omitted, all columns are read.
+    :type columns: list, optional
+    :return: The chunks.
+    :rtype: iterator of pandas.DataFrame
+    """
+    paths = get_paths(source)
+    if file_format == 'csv':
+        for path in paths:
+            reader = pd.read_csv(path, usecols=columns, chunksize=chunk_size)
+            with reader:
+                for chunk in reader:
+                    if columns is not None:
+                        chunk = chunk[columns]
+                    yield chunk
+    else:
+        _, dataset, _ = import_pyarrow()
+        batches = dataset.dataset(paths, format='parquet').to_batches(
+            columns=columns, batch_size=chunk_size)
+        for batch in batches:
+            if batch.num_rows > 0:
+                yield batch.to_pandas()
+
+
+def write_chunks(
+        chunks, destination, file_format, source, filled,
+        promote_bool=False):
+    """Auxiliary function that writes chunks of rows to a file.
+
+    :param chunks: The chunks.
+    :type chunks: iterable of pandas.DataFrame
+    :param destination: The path of the file.
+    :type destination: str or path-like
+    :param file_format: The format of the file.
+    :type file_format: {'csv', 'parquet'}
+    :param source: The path of the source, whose schema is used for Parquet
+        files.
+    :type source: str, path-like or list
+    :param filled: The columns in which missing values are filled in. Their
+        integer (and, if promote_bool, boolean) types are written as floats.
+    :type filled: list
+    :param promote_bool: Whether to write the filled boolean columns as
+        floats.
+    :type promote_bool: bool, default False
+    """
+    if file_format == 'csv':
+        header = True
+        for chunk in chunks:
+            chunk.to_csv(
+                destination, mode='w' if header else 'a', header=header,
+                index=False)
+            header = False
+        if header:
+            pd.DataFrame().to_csv(destination, index=False)
+        return
+    pyarrow, dataset, parquet = import_pyarrow()
+    schema = dataset.dataset(get_paths(source), format='parquet').schema
+    for column in filled:
+        index = schema.get_field_index(column)
+        field = schema.field(index)
+        if pyarrow.types.is_integer(field.type) or (
+                promote_bool and pyarrow.types.is_boolean(field.type)):
+            schema = schema.set(index, field.with_type(pyarrow.float64()))
+    writer = None
+    try:
+        for chunk in chunks:
+            chunk_schema = pyarrow.schema(
+                [schema.field(column) for column in chunk.columns])
+            table = pyarrow.Table.from_pandas(
+                chunk, schema=chunk_schema, preserve_index=False)
+            if writer is None:
+                writer = parquet.ParquetWriter(destination, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
@@ -46,8 +46,6 @@ setuptools.setup(
     classifiers=[
         'Development Status :: 5 - Production/Stable',
         'Natural Language :: English',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
         'License :: OSI Approved :: MIT License',
@@ -57,11 +55,15 @@ setuptools.setup(
         'Intended Audience :: Healthcare Industry',
         'Intended Audience :: Financial and Insurance Industry'
     ],
-    python_requires='>=3.5',
+    python_requires='>=3.7',
     install_requires=[
         'pandas',
         'numpy',
         'statsmodels',
+        'scipy',
         'sklearn'
     ],
+    extras_require={
+        'parquet': ['pyarrow'],
+    },
 )
@@ -0,0 +1,64 @@
+import unittest
+
+from imputena import KNNImputer, knn
+
+from test.example_data import *
+
+
+class TestKNNImputer(unittest.TestCase):
+
+    # Positive tests ----------------------------------------------------------
+
+    def test_KNNI_fit_transform(self):
+        """
+        Positive test
+
+        data: Correct data frame (divcols)
+
+        Checks that the imputer imputes the same values as knn().
+        """
+        # 1. Arrange
+        df = generate_example_df_divcols()
+        # 2. Act
+        df2 = KNNImputer().fit_transform(df)
+        df3 = knn(df)
+        # 3. Assert
+        self.assertEqual(df.isna().sum().sum(), 18)
+        self.assertTrue(np.allclose(df2, df3, equal_nan=True))
+
+    def test_KNNI_transform_batch(self):
+        """
+        Positive test
+
+        data: Correct data frame (divcols), batch of one row
+        columns: ['e']
+
+        Checks that the batch gets imputed in column 'e' only, with the
+        neighbors taken from the training data.
+        """
+        # 1. Arrange
+        df = generate_example_df_divcols()
+        imputer = KNNImputer(columns=['e']).fit(df)
+        # 2. Act
+        batch = imputer.transform(df.iloc[[0]])
+        # 3. Assert
+        self.assertFalse(pd.isna(batch.loc[1, 'e']))
+        self.assertTrue(pd.isna(batch.loc[1, 'f']))
+        self.assertAlmostEqual(batch.loc[1, 'e'], knn(df).loc[1, 'e'])
+
+    # Negative tests ----------------------------------------------------------
+
+    def test_KNNI_wrong_type(self):
+        """
+        Negative test
+
+        data: array (unsupported type)
+
+        Checks that fit() raises a TypeError if the data is passed as an
+        array.
+        """
+        # 1. Arrange
+        data = [2, 4, np.nan, 1]
+        # 2. Act & 3. Assert
+        with self.assertRaises(TypeError):
+            KNNImputer().fit(data)
@@ -0,0 +1,126 @@
+import unittest
+import os
+import tempfile
+
+from imputena import LinearRegressionImputer, linear_regression
+
+from test.example_data import *
+
+
+class TestLinearRegressionImputer(unittest.TestCase):
+
+    # Positive tests ----------------------------------------------------------
+
+    def test_LRI_fit_transform(self):
+        """
+        Positive test
+
+        data: Correct data frame (sales)
+        dependent: 'sales'
+
+        The data frame sales contains 4 NA values in the column 'sales'.
+        The imputer should impute 3 of them.
+
+        Checks that the original data frame remains unmodified and that the
+        returned data frame contains 1 NA value in the column 'sales'.
+        """
+        # 1. Arrange
+        df = generate_df_sales()
+        # 2. Act
+        df2 = LinearRegressionImputer('sales').fit_transform(df)
+        # 3. Assert
+        self.assertEqual(df['sales'].isna().sum(), 4)
+        self.assertEqual(df2['sales'].isna().sum(), 1)
+
+    def test_LRI_same_as_function(self):
+        """
+        Positive test
+
+        data: Correct data frame (sales)
+        regressions: 'complete'
+
+        Checks that the imputer imputes the same values as
+        linear_regression() when both use all predictors.
+        """
+        # 1. Arrange
+        df = generate_df_sales()
+        imputer = LinearRegressionImputer('sales', regressions='complete')
+        # 2. Act
+        df2 = imputer.fit_transform(df)
+        df3 = linear_regression(df, 'sales', regressions='complete')
+        # 3. Assert
+        self.assertTrue(
+            np.allclose(df2['sales'], df3['sales'], equal_nan=True))
+
+    def test_LRI_transform_batch(self):
+        """
+        Positive test
+
+        data: Correct data frame (sales), batch of one row with 'year' missing
+
+        Checks that, after saving and loading the imputer, the batch gets
+        imputed with the regression on 'advertising' learned from the
+        training data.
+        """
+        # 1. Arrange
+        df = generate_df_sales()
+        imputer = LinearRegressionImputer('sales').fit(df)
+        batch = pd.DataFrame(
+            {'year': [np.nan], 'advertising': [40.0], 'sales': [np.nan]})
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'imputer.pkl')
+            imputer.save(path)
+            loaded = LinearRegressionImputer.load(path)
+        complete = df.dropna()
+        x = np.column_stack([np.ones(len(complete)), complete['advertising']])
+        beta = np.linalg.lstsq(x, complete['sales'], rcond=None)[0]
+        # 2. Act
+        batch2 = loaded.transform(batch)
+        # 3. Assert
+        self.assertAlmostEqual(batch2.loc[0, 'sales'], beta @ [1, 40])
+
+    # Negative tests ----------------------------------------------------------
+
+    def test_LRI_wrong_dependent(self):
+        """
+        Negative test
+
+        data: Correct data frame (sales)
+        dependent: 'z' (not a column of sales)
+
+        Checks that fit() raises a ValueError if the dependent variable
+        doesn't exist in the data.
+        """
+        # 1. Arrange
+        df = generate_df_sales()
+        # 2. Act & 3. Assert
+        with self.assertRaises(ValueError):
+            LinearRegressionImputer('z').fit(df)
+
+    def test_LRI_missing_column_in_batch(self):
+        """
+        Negative test
+
+        data: Correct data frame (sales), batch without column 'year'
+
+        Checks that transform() raises a ValueError if a predictor is
+        missing from the batch.
+        """
+        # 1. Arrange
+        df = generate_df_sales()
+        imputer = LinearRegressionImputer('sales').fit(df)
+        # 2. Act & 3. Assert
+        with self.assertRaises(ValueError):
+            imputer.transform(df.drop(columns='year'))
+
+    def test_LRI_wrong_solver(self):
+        """
+        Negative test
+
+        solver: 'sklearn' (not supported by the imputer)
+
+        Checks that the constructor raises a ValueError.
+        """
+        # 1. Arrange & 2. Act & 3. Assert
+        with self.assertRaises(ValueError):
+            LinearRegressionImputer('sales', solver='sklearn')
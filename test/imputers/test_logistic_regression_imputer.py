@@ -0,0 +1,109 @@
+import unittest
+
+from imputena import LogisticRegressionImputer, logistic_regression
+
+from test.example_data import *
+
+
+class TestLogisticRegressionImputer(unittest.TestCase):
+
+    # Positive tests ----------------------------------------------------------
+
+    def test_LogRI_fit_transform(self):
+        """
+        Positive test
+
+        data: Correct data frame (breast cancer)
+        dependent: 'class'
+
+        Checks that the imputer imputes the same values as
+        logistic_regression().
+        """
+        # 1. Arrange
+        df = generate_df_breast_cancer()
+        # 2. Act
+        df2 = LogisticRegressionImputer('class').fit_transform(df)
+        df3 = logistic_regression(df, 'class')
+        # 3. Assert
+        self.assertEqual(df.isna().sum().sum(), 15)
+        self.assertTrue(df2.equals(df3))
+
+    def test_LogRI_transform_batch(self):
+        """
+        Positive test
+
+        data: Correct data frame (breast cancer), batch of two rows
+
+        The batch contains one row with all predictors and one row with
+        'size' missing.
+
+        Checks that both rows get imputed.
+        """
+        # 1. Arrange
+        df = generate_df_breast_cancer()
+        imputer = LogisticRegressionImputer('class').fit(df)
+        batch = df.iloc[[4, 10]].copy()
+        # 2. Act
+        batch2 = imputer.transform(batch)
+        # 3. Assert
+        self.assertEqual(batch2['class'].isna().sum(), 0)
+
+    def test_LogRI_models_fitted_once(self):
+        """
+        Positive test
+
+        data: Correct data frame (breast cancer)
+        dependent: 'class'
+
+        Checks that fit() learns a model for each of the 63 combinations of
+        the 6 predictors, that the imputer does not keep the training data,
+        and that transform() does not learn any further model.
+        """
+        # 1. Arrange
+        df = generate_df_breast_cancer()
+        imputer = LogisticRegressionImputer('class').fit(df)
+        models = dict(imputer.models_)
+        # 2. Act
+        imputer.transform(df)
+        # 3. Assert
+        self.assertEqual(len(models), 63)
+        self.assertFalse(hasattr(imputer, 'training_data_'))
+        self.assertEqual(imputer.models_, models)
+
+    def test_LogRI_noise(self):
+        """
+        Positive test
+
+        data: Correct data frame (breast cancer)
+        noise: True
+        random_state: 42
+
+        Checks that the imputer with noise imputes the same values as
+        logistic_regression() with the same seed.
+        """
+        # 1. Arrange
+        df = generate_df_breast_cancer()
+        imputer = LogisticRegressionImputer(
+            'class', noise=True, random_state=42)
+        # 2. Act
+        df2 = imputer.fit_transform(df)
+        df3 = logistic_regression(df, 'class', noise=True, random_state=42)
+        # 3. Assert
+        self.assertTrue(df2.equals(df3))
+
+    # Negative tests ----------------------------------------------------------
+
+    def test_LogRI_wrong_dependent(self):
+        """
+        Negative test
+
+        data: Correct data frame (breast cancer)
+        dependent: 'z' (not a column of the data)
+
+        Checks that fit() raises a ValueError.
+        """
+        # 1. Arrange
+        df = generate_df_breast_cancer()
+        # 2. Act & 3. Assert
+        with self.assertRaises(ValueError):
+            LogisticRegressionImputer('z').fit(df)
@@ -0,0 +1,149 @@
+import unittest
+import os
+import tempfile
+
+from imputena import MeanImputer, Imputer
+
+from test.example_data import *
+
+
+class TestMeanImputer(unittest.TestCase):
+
+    # Positive tests ----------------------------------------------------------
+
+    def test_MI_fit_transform(self):
+        """
+        Positive test
+
+        data: Correct dataframe (divcols)
+
+        Checks that the original dataframe remains unmodified and that the
+        returned dataframe contains 10 NA values, 8 less than the original.
+        """
+        # 1. Arrange
+        df = generate_example_df_divcols()
+        # 2. Act
+        df2 = MeanImputer().fit_transform(df)
+        # 3. Assert
+        self.assertEqual(df.isna().sum().sum(), 18)
+        self.assertEqual(df2.isna().sum().sum(), 10)
+
+    def test_MI_transform_batch(self):
+        """
+        Positive test
+
+        data: Correct dataframe (divcols), batch of its first two rows
+
+        Checks that the missing values of the batch are filled in with the
+        means of the training data, not of the batch.
+        """
+        # 1. Arrange
+        df = generate_example_df_divcols()
+        imputer = MeanImputer().fit(df)
+        # 2. Act
+        batch = imputer.transform(df.iloc[:2])
+        # 3. Assert
+        self.assertAlmostEqual(batch.loc[1, 'e'], df['e'].mean())
+        self.assertAlmostEqual(batch.loc[2, 'h'], df['h'].mean())
+
+    def test_MI_transform_inplace(self):
+        """
+        Positive test
+
+        data: Correct dataframe (divcols)
+        method: 'median'
+        columns: ['e', 'f']
+        inplace: True
+
+        Checks that the data frame contains 15 NA values after the operation.
+        """
+        # 1. Arrange
+        df = generate_example_df_divcols()
+        imputer = MeanImputer('median', columns=['e', 'f']).fit(df)
+        # 2. Act
+        res = imputer.transform(df, inplace=True)
+        # 3. Assert
+        self.assertIsNone(res)
+        self.assertEqual(df.isna().sum().sum(), 15)
+
+    def test_MI_save_load(self):
+        """
+        Positive test
+
+        data: Correct dataframe (divcols)
+
+        Checks that an imputer loaded from a file imputes the same values as
+        the imputer that was saved.
+        """
+        # 1. Arrange
+        df = generate_example_df_divcols()
+        imputer = MeanImputer().fit(df)
+        # 2. Act
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'imputer.pkl')
+            imputer.save(path)
+            loaded = Imputer.load(path)
+        # 3. Assert
+        self.assertIsInstance(loaded, MeanImputer)
+        self.assertTrue(
+            loaded.transform(df).equals(imputer.transform(df)))
+
+    # Negative tests ----------------------------------------------------------
+
+    def test_MI_not_fitted(self):
+        """
+        Negative test
+
+        Checks that transform() raises a ValueError if the imputer has not
+        been fitted.
+        """
+        # 1. Arrange
+        df = generate_example_df_divcols()
+        # 2. Act & 3. Assert
+        with self.assertRaises(ValueError):
+            MeanImputer().transform(df)
+
+    def test_MI_wrong_method(self):
+        """
+        Negative test
+
+        method: 'z' (not a valid value)
+
+        Checks that the constructor raises a ValueError if the method is not
+        valid.
+        """
+        # 1. Arrange & 2. Act & 3. Assert
+        with self.assertRaises(ValueError):
+            MeanImputer('z')
+
+    def test_MI_wrong_column(self):
+        """
+        Negative test
+
+        data: Correct dataframe (divcols)
+        columns: ['a', 'z'] ('z' is not a column of divcols)
+
+        Checks that fit() raises a ValueError if a column doesn't exist.
+        """
+        # 1. Arrange
+        df = generate_example_df_divcols()
+        # 2. Act & 3. Assert
+        with self.assertRaises(ValueError):
+            MeanImputer(columns=['a', 'z']).fit(df)
+
+    def test_MI_load_wrong_class(self):
+        """
+        Negative test
+
+        Checks that load() raises a TypeError if the file contains an
+        imputer of another class.
+        """
+        # 1. Arrange
+        from imputena import MostFrequentImputer
+        imputer = MeanImputer().fit(generate_example_df_divcols())
+        # 2. Act & 3. Assert
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'imputer.pkl')
+            imputer.save(path)
+            with self.assertRaises(TypeError):
+                MostFrequentImputer.load(path)
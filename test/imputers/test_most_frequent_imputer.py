@@ -0,0 +1,77 @@
+import unittest
+
+from imputena import MostFrequentImputer
+
+from test.example_data import *
+
+
+class TestMostFrequentImputer(unittest.TestCase):
+
+    # Positive tests ----------------------------------------------------------
+
+    def test_MFI_fit_transform(self):
+        """
+        Positive test
+
+        data: Correct dataframe (hotdeck)
+
+        Checks that the original dataframe remains unmodified and that the
+        returned dataframe contains no NA values.
+        """
+        # 1. Arrange
+        df = generate_example_df_hotdeck()
+        # 2. Act
+        df2 = MostFrequentImputer().fit_transform(df)
+        # 3. Assert
+        self.assertEqual(df.isna().sum().sum(), 3)
+        self.assertEqual(df2.isna().sum().sum(), 0)
+
+    def test_MFI_transform_batch(self):
+        """
+        Positive test
+
+        data: Training series, batch series containing only NA values
+
+        Checks that the missing values of the batch are filled in with the
+        mode of the training series.
+        """
+        # 1. Arrange
+        series = pd.Series(['a', 'b', 'b', None, 'c'])
+        imputer = MostFrequentImputer().fit(series)
+        # 2. Act
+        batch = imputer.transform(pd.Series([None, None]))
+        # 3. Assert
+        self.assertEqual(list(batch), ['b', 'b'])
+
+    # Negative tests ----------------------------------------------------------
+
+    def test_MFI_wrong_type(self):
+        """
+        Negative test
+
+        data: array (unsupported type)
+
+        Checks that fit() raises a TypeError if the data is passed as an
+        array.
+        """
+        # 1. Arrange
+        data = [2, 4, np.nan, 1]
+        # 2. Act & 3. Assert
+        with self.assertRaises(TypeError):
+            MostFrequentImputer().fit(data)
+
+    def test_MFI_col_for_series(self):
+        """
+        Negative test
+
+        data: Correct series (example series)
+        columns: ['a'] (series can't have columns)
+
+        Checks that fit() raises a ValueError if columns are selected for a
+        series.
+        """
+        # 1. Arrange
+        ser = generate_example_series()
+        # 2. Act & 3. Assert
+        with self.assertRaises(ValueError):
+            MostFrequentImputer(columns=['a']).fit(ser)
@@ -39,6 +39,91 @@ class TestMICE(unittest.TestCase):
         self.assertEqual(dfs[1].isna().sum().sum(), 0)
         self.assertEqual(dfs[2].isna().sum().sum(), 0)
 
+    def test_MICE_n_jobs(self):
+        """
+        Positive test
+
+        data: Correct data frame (breast cancer)
+        n_jobs: 2
+
+        The data frame breast cancer contains 15 NA values.
+        mice() should impute all of them.
+
+        Checks that the original dataframe remains unmodified, that mice
+        returns 3 dataframes and that each of those contains no NA values.
+        """
+        # 1. Arrange
+        df = generate_df_breast_cancer()
+        # 2. Act
+        dfs = mice(df, n_jobs=2)
+        # 3. Assert
+        self.assertEqual(df.isna().sum().sum(), 15)
+        self.assertEqual(len(dfs), 3)
+        self.assertEqual(dfs[0].isna().sum().sum(), 0)
+        self.assertEqual(dfs[1].isna().sum().sum(), 0)
+        self.assertEqual(dfs[2].isna().sum().sum(), 0)
+
+    def test_MICE_random_state(self):
+        """
+        Positive test
+
+        data: Correct data frame (breast cancer)
+        random_state: 42
+
+        Checks that the imputations with the same seed are equal whether
+        they are run on one or on two processes.
+        """
+        # 1. Arrange
+        df = generate_df_breast_cancer()
+        # 2. Act
+        dfs = mice(df, random_state=42)
+        dfs2 = mice(df, n_jobs=2, random_state=42)
+        # 3. Assert
+        self.assertEqual(len(dfs2), 3)
+        for df2, df3 in zip(dfs, dfs2):
+            self.assertTrue(df2.equals(df3))
+
+    def test_MICE_max_iter(self):
+        """
+        Positive test
+
+        data: Correct data frame (breast cancer)
+        max_iter: 20
+
+        Checks that the imputations with several sweeps contain no NA values
+        and that, with a tolerance of 0, they differ from the imputations
+        with one sweep.
+        """
+        # 1. Arrange
+        df = generate_df_breast_cancer()
+        # 2. Act
+        dfs = mice(df, random_state=42)
+        dfs2 = mice(df, random_state=42, max_iter=20, tol=0)
+        # 3. Assert
+        self.assertEqual(df.isna().sum().sum(), 15)
+        for df2, df3 in zip(dfs, dfs2):
+            self.assertEqual(df3.isna().sum().sum(), 0)
+            self.assertFalse(df2.equals(df3))
+
+    def test_MICE_convergence(self):
+        """
+        Positive test
+
+        data: Correct data frame (breast cancer)
+        max_iter: 100
+
+        Checks that the sweeps stop once the imputed values converge, so
+        that the imputations are equal to those with a maximum of 200 sweeps.
+        """
+        # 1. Arrange
+        df = generate_df_breast_cancer()
+        # 2. Act
+        dfs = mice(df, random_state=42, max_iter=100)
+        dfs2 = mice(df, random_state=42, max_iter=200)
+        # 3. Assert
+        for df2, df3 in zip(dfs, dfs2):
+            self.assertTrue(df2.equals(df3))
+
     # Negative tests ----------------------------------------------------------
 
     def test_MICE_wrong_type(self):
@@ -55,3 +140,35 @@ class TestMICE(unittest.TestCase):
         # 2. Act & 3. Assert
         with self.assertRaises(TypeError):
             mice(data)
+
+    def test_MICE_wrong_n_jobs(self):
+        """
+        Negative test
+
+        data: Correct data frame (breast cancer)
+        n_jobs: 0 (not a valid value)
+
+        Checks that the function raises a ValueError if n_jobs is not a
+        positive integer or -1.
+        """
+        # 1. Arrange
+        df = generate_df_breast_cancer()
+        # 2. Act & 3. Assert
+        with self.assertRaises(ValueError):
+            mice(df, n_jobs=0)
+
+    def test_MICE_wrong_max_iter(self):
+        """
+        Negative test
+
+        data: Correct data frame (breast cancer)
+        max_iter: 0 (not a valid value)
+
+        Checks that the function raises a ValueError if max_iter is not a
+        positive integer.
+        """
+        # 1. Arrange
+        df = generate_df_breast_cancer()
+        # 2. Act & 3. Assert
+        with self.assertRaises(ValueError):
+            mice(df, max_iter=0)
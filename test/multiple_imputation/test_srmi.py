@@ -87,6 +87,74 @@ class TestSRMI(unittest.TestCase):
         self.assertEqual(dfs[1].isna().sum().sum(), 3)
         self.assertEqual(dfs[2].isna().sum().sum(), 3)
 
+    def test_SRMI_gram_solver(self):
+        """
+        Positive test
+
+        data: Correct data frame (sales)
+        solver: 'gram'
+
+        The data frame sales contains 8 NA values.
+        srmi() should impute 5 of them.
+
+        Checks that the original dataframe remains unmodified, that srmi
+        returns 3 dataframes and that each of those contains 3 NA values.
+        """
+        # 1. Arrange
+        df = generate_df_sales()
+        # 2. Act
+        dfs = srmi(df, solver='gram')
+        # 3. Assert
+        self.assertEqual(df.isna().sum().sum(), 8)
+        self.assertEqual(len(dfs), 3)
+        self.assertEqual(dfs[0].isna().sum().sum(), 3)
+        self.assertEqual(dfs[1].isna().sum().sum(), 3)
+        self.assertEqual(dfs[2].isna().sum().sum(), 3)
+
+    def test_SRMI_n_jobs(self):
+        """
+        Positive test
+
+        data: Correct data frame (sales)
+        n_jobs: 2
+
+        Checks that the imputations run on two processes are reproducible
+        by seeding numpy's global random state, and that each of them
+        contains 3 NA values.
+        """
+        # 1. Arrange
+        df = generate_df_sales()
+        # 2. Act
+        np.random.seed(0)
+        dfs = srmi(df, n_jobs=2)
+        np.random.seed(0)
+        dfs2 = srmi(df, n_jobs=2)
+        # 3. Assert
+        self.assertEqual(len(dfs), 3)
+        for df2, df3 in zip(dfs, dfs2):
+            self.assertEqual(df2.isna().sum().sum(), 3)
+            self.assertTrue(df2.equals(df3))
+
+    def test_SRMI_random_state(self):
+        """
+        Positive test
+
+        data: Correct data frame (sales)
+        random_state: 42
+
+        Checks that the imputations with the same seed are equal whether
+        they are run on one or on two processes.
+        """
+        # 1. Arrange
+        df = generate_df_sales()
+        # 2. Act
+        dfs = srmi(df, random_state=42)
+        dfs2 = srmi(df, n_jobs=2, random_state=42)
+        # 3. Assert
+        self.assertEqual(len(dfs2), 3)
+        for df2, df3 in zip(dfs, dfs2):
+            self.assertTrue(df2.equals(df3))
+
     # Negative tests ----------------------------------------------------------
 
     def test_SRMI_wrong_type(self):
@@ -1,6 +1,6 @@
 import unittest
 
-from imputena import impute_by_recommended
+from imputena import impute_by_recommended, MissingnessProfile
 
 from test.example_data import *
 
@@ -29,6 +29,25 @@ class TestImputeByRecommended(unittest.TestCase):
         self.assertEqual(df.isna().sum().sum(), 15)
         self.assertEqual(df2.isna().sum().sum(), 0)
 
+    def test_IBR_df_cat_profile(self):
+        """
+        Positive test
+
+        data: Correct dataframe (df_breast_cancer)
+        profile: Missingness profile of df_breast_cancer
+
+        Checks that the dataframe imputed with the profile equals the one
+        imputed without it.
+        """
+        # 1. Arrange
+        df = generate_df_breast_cancer()
+        profile = MissingnessProfile(df)
+        # 2. Act
+        df2 = impute_by_recommended(df, profile=profile)
+        # 3. Assert
+        self.assertEqual(df2.isna().sum().sum(), 0)
+        self.assertTrue(df2.equals(impute_by_recommended(df)))
+
     def test_IBR_df_num(self):
         """
         Positive test
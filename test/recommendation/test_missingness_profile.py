@@ -0,0 +1,141 @@
+import unittest
+
+from imputena import MissingnessProfile
+
+from test.example_data import *
+
+
+class TestMissingnessProfile(unittest.TestCase):
+
+    # Positive tests ----------------------------------------------------------
+
+    def test_MP_df(self):
+        """
+        Positive test
+
+        data: Correct data frame (example_df)
+
+        The data frame contains 4 rows, of which row 1 is missing 'y', row
+        2 is missing 'x' and rows 3 and 4 are complete.
+
+        Checks the counts of missing values, the types of the columns and
+        the counts of the patterns.
+        """
+        # 1. Arrange
+        df = generate_example_df()
+        # 2. Act
+        profile = MissingnessProfile(df)
+        # 3. Assert
+        self.assertEqual(profile.na_counts.to_dict(), {'x': 1, 'y': 1, 'z': 0})
+        self.assertFalse(profile.contains_categorical())
+        self.assertFalse(profile.temporal)
+        self.assertEqual(profile.get_columns_with_na(), ['x', 'y'])
+        self.assertEqual(profile.get_na_rate('x'), .25)
+        self.assertEqual(
+            profile.get_pattern_counts().to_dict(),
+            {(): 2, ('x',): 1, ('y',): 1})
+
+    def test_MP_df_lazy(self):
+        """
+        Positive test
+
+        data: Correct data frame (example_df) and series (example_series)
+
+        Checks that the rates of missing values and the columns with missing
+        values are correct when they are requested before the counts of
+        missing values have been computed.
+        """
+        # 1. Arrange
+        df = generate_example_df()
+        ser = generate_example_series()
+        # 2. Act
+        profile = MissingnessProfile(df)
+        profile_ser = MissingnessProfile(ser)
+        # 3. Assert
+        self.assertEqual(profile.get_na_rate('x'), .25)
+        self.assertEqual(profile.get_columns_with_na(), ['x', 'y'])
+        self.assertEqual(
+            profile_ser.get_na_rate(profile_ser.columns[0]),
+            ser.isna().mean())
+        self.assertEqual(
+            profile_ser.get_columns_with_na(), list(profile_ser.columns))
+
+    def test_MP_df_categorical(self):
+        """
+        Positive test
+
+        data: Correct data frame (df_breast_cancer)
+
+        Checks that the profile reports the categorical column 'class' and
+        that the patterns cover all rows.
+        """
+        # 1. Arrange
+        df = generate_df_breast_cancer()
+        # 2. Act
+        profile = MissingnessProfile(df)
+        # 3. Assert
+        self.assertTrue(profile.contains_categorical())
+        self.assertFalse(profile.contains_only_categorical())
+        self.assertTrue(profile.is_categorical('class'))
+        self.assertEqual(profile.get_pattern_counts().sum(), len(df))
+
+    def test_MP_series(self):
+        """
+        Positive test
+
+        data: Correct series (airgap)
+
+        Checks that the series is profiled as a single temporal column.
+        """
+        # 1. Arrange
+        ts = generate_ts_airgap()
+        # 2. Act
+        profile = MissingnessProfile(ts)
+        # 3. Assert
+        self.assertTrue(profile.is_series)
+        self.assertTrue(profile.temporal)
+        self.assertEqual(profile.na_counts.iloc[0], ts.isna().sum())
+        self.assertTrue(profile.matches(ts))
+        self.assertFalse(profile.matches(ts.to_frame()))
+
+    def test_MP_matches(self):
+        """
+        Positive test
+
+        data: Correct data frame (example_df)
+
+        Checks that the profile only matches the profiled object, and no
+        longer matches it once a missing value has been filled in place
+        after the counts of missing values were computed.
+        """
+        # 1. Arrange
+        df = generate_example_df()
+        profile = MissingnessProfile(df)
+        # 2. Act
+        matches_copy = profile.matches(df.copy())
+        matches_before = profile.matches(df)
+        na_count = profile.na_counts.sum()
+        df.loc[1, 'y'] = 0
+        matches_after = profile.matches(df)
+        # 3. Assert
+        self.assertFalse(matches_copy)
+        self.assertTrue(matches_before)
+        self.assertEqual(na_count, 2)
+        self.assertFalse(matches_after)
+
+    # Negative tests ----------------------------------------------------------
+
+    def test_MP_wrong_type(self):
+        """
+        Negative test
+
+        data: array (unsupported type)
+
+        Checks that the constructor raises a TypeError if the data is passed
+        as an array.
+        """
+        # 1. Arrange
+        data = [2, 4, np.nan, 1]
+        # 2. Act & 3. Assert
+        with self.assertRaises(TypeError):
+            MissingnessProfile(data)
@@ -1,6 +1,6 @@
 import unittest
 
-from imputena import recommend_method
+from imputena import recommend_method, MissingnessProfile
 
 from test.example_data import *
 
@@ -201,6 +201,73 @@ class TestRecommendMethod(unittest.TestCase):
         # 3. Assert
         self.assertEqual(method, 'interpolation with seasonal adjustment')
 
+    def test_recommend_method_df_col_profile(self):
+        """
+        Positive test
+
+        data: Correct dataframe (df_sales)
+        column: 'sales'
+        profile: Missingness profile of df_sales
+
+        Checks that the method recommended with the profile equals the one
+        recommended without it.
+        """
+        # 1. Arrange
+        df = generate_df_sales()
+        profile = MissingnessProfile(df)
+        # 2. Act
+        method = recommend_method(
+            df, 'sales', title_only=True, profile=profile)
+        # 3. Assert
+        self.assertEqual(
+            method, recommend_method(df, 'sales', title_only=True))
+
+    def test_recommend_method_df_col_high_corr_categorical(self):
+        """
+        Positive test
+
+        data: Correct dataframe (example_df_high_corr) with a categorical
+            column
+        column: 'b'
+
+        Checks that the categorical column is ignored by the correlation
+        check, so that linear regression imputation is still recommended.
+        """
+        # 1. Arrange
+        df = generate_example_df_high_corr()
+        df['c'] = 'x'
+        # 2. Act
+        method = recommend_method(df, 'b', title_only=True)
+        # 3. Assert
+        self.assertEqual(method, 'linear regression imputation')
+
+    def test_recommend_method_df_col_cached_correlations(self):
+        """
+        Positive test
+
+        data: Correct dataframe (example_df_divcols)
+        column: 'h'
+        profile: Missingness profile of example_df_divcols
+
+        Checks that the correlations of the column are cached in the
+        profile, equal the pairwise correlations of pandas, and are reused
+        by a repeated recommendation.
+        """
+        # 1. Arrange
+        df = generate_example_df_divcols()
+        profile = MissingnessProfile(df)
+        # 2. Act
+        method = recommend_method(
+            df, 'h', title_only=True, profile=profile)
+        correlations = profile.correlations['h']
+        repeated = recommend_method(
+            df, 'h', title_only=True, profile=profile)
+        # 3. Assert
+        self.assertEqual(method, repeated)
+        self.assertIs(profile.correlations['h'], correlations)
+        pd.testing.assert_series_equal(
+            correlations, df.corr()['h'].drop('h'), check_names=False)
+
     # Negative tests ----------------------------------------------------------
 
     def test_recommend_method_wrong_type(self):
@@ -249,3 +316,43 @@ class TestRecommendMethod(unittest.TestCase):
         # 2. Act & 3. Assert
         with self.assertRaises(ValueError):
             recommend_method(df, column='z')
+
+    def test_recommend_method_wrong_profile(self):
+        """
+        Negative test
+
+        data: Correct data frame (df_breast_cancer)
+        profile: Missingness profile of df_sales (other data)
+
+        Checks that the function raises a ValueError if the profile does not
+        match the data, and a TypeError if it is not a MissingnessProfile.
+        """
+        # 1. Arrange
+        df = generate_df_breast_cancer()
+        profile = MissingnessProfile(generate_df_sales())
+        # 2. Act & 3. Assert
+        with self.assertRaises(ValueError):
+            recommend_method(df, profile=profile)
+        with self.assertRaises(TypeError):
+            recommend_method(df, profile=[])
+
+    def test_recommend_method_modified_data_profile(self):
+        """
+        Negative test
+
+        data: Correct dataframe (example_df_divcols), imputed in place
+            after a recommendation with its profile
+        column: 'h'
+        profile: Missingness profile of example_df_divcols
+
+        Checks that the function raises a ValueError instead of reusing the
+        cached correlations and counts of missing values of the profile.
+        """
+        # 1. Arrange
+        df = generate_example_df_divcols()
+        profile = MissingnessProfile(df)
+        recommend_method(df, 'h', profile=profile)
+        df['h'] = df['h'].fillna(0)
+        # 2. Act & 3. Assert
+        with self.assertRaises(ValueError):
+            recommend_method(df, 'h', profile=profile)
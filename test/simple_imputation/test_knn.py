@@ -1,4 +1,5 @@
 import unittest
+from sklearn.neighbors import NearestNeighbors
 
 from imputena import knn
 
@@ -68,6 +69,27 @@ class TestKNN(unittest.TestCase):
         self.assertEqual(df.isna().sum().sum(), 2)
         self.assertEqual(df2.isna().sum().sum(), 1)
 
+    def test_KNN_columns_values(self):
+        """
+        Positive test
+
+        data: Correct data frame (divcols)
+        columns: ['f', 'h']
+
+        Checks that the selected columns receive the same values as when the
+        whole data frame is imputed and that the other columns remain
+        unmodified.
+        """
+        # 1. Arrange
+        df = generate_example_df_divcols()
+        # 2. Act
+        df2 = knn(df)
+        df3 = knn(df, columns=['f', 'h'])
+        # 3. Assert
+        self.assertTrue(np.allclose(df2[['f', 'h']], df3[['f', 'h']]))
+        self.assertTrue(df3.drop(columns=['f', 'h']).equals(
+            df.drop(columns=['f', 'h'])))
+
     def test_KNN_k(self):
         """
         Positive test
@@ -89,6 +111,93 @@ class TestKNN(unittest.TestCase):
         self.assertEqual(df.isna().sum().sum(), 2)
         self.assertEqual(df2.isna().sum().sum(), 0)
 
+    def test_KNN_brute(self):
+        """
+        Positive test
+
+        data: Correct data frame (divcols)
+        algorithm: 'brute'
+        working_memory: 0.0001 (one row per chunk)
+
+        The data frame (divcols) contains 18 NA values, 10 of them in a
+        column that contains only NA values.
+
+        Checks that the exact search in chunks returns the same data frame
+        as the default.
+        """
+        # 1. Arrange
+        df = generate_example_df_divcols()
+        # 2. Act
+        df2 = knn(df)
+        df3 = knn(df, algorithm='brute', working_memory=0.0001)
+        # 3. Assert
+        self.assertEqual(df.isna().sum().sum(), 18)
+        self.assertEqual(df3.isna().sum().sum(), 10)
+        self.assertTrue(np.allclose(df2, df3, equal_nan=True))
+
+    def test_KNN_kd_tree(self):
+        """
+        Positive test
+
+        data: Correct data frame (sales)
+        algorithm: 'kd_tree'
+
+        The data frame (sales) contains 8 NA values.
+        knn() should impute all of them.
+
+        Checks that the original data frame remains unmodified and that the
+        returned data frame contains no NA values.
+        """
+        # 1. Arrange
+        df = generate_df_sales()
+        # 2. Act
+        df2 = knn(df, algorithm='kd_tree')
+        # 3. Assert
+        self.assertEqual(df.isna().sum().sum(), 8)
+        self.assertEqual(df2.isna().sum().sum(), 0)
+
+    def test_KNN_neighbor_index(self):
+        """
+        Positive test
+
+        data: Correct data frame (sales)
+        algorithm: NearestNeighbors(algorithm='ball_tree')
+
+        Checks that a neighbor index object returns the same data frame as
+        the corresponding algorithm name.
+        """
+        # 1. Arrange
+        df = generate_df_sales()
+        # 2. Act
+        df2 = knn(df, algorithm='ball_tree')
+        df3 = knn(df, algorithm=NearestNeighbors(algorithm='ball_tree'))
+        # 3. Assert
+        self.assertTrue(df2.equals(df3))
+
+    def test_KNN_float32(self):
+        """
+        Positive test
+
+        data: Data frame with 1000 rows of 5 random continuous columns and
+            10% of NA values
+        dtype: 'float32'
+
+        Checks that the values imputed in single precision deviate from
+        those imputed in double precision by a relative error of less than
+        1e-4.
+        """
+        # 1. Arrange
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame(
+            rng.normal(10, 3, (1000, 5)), columns=list('abcde'))
+        df = df.mask(rng.random(df.shape) < .1)
+        # 2. Act
+        df2 = knn(df)
+        df3 = knn(df, dtype='float32')
+        # 3. Assert
+        self.assertEqual(df3.isna().sum().sum(), 0)
+        self.assertTrue(np.allclose(df3, df2, rtol=1e-4, atol=0))
+
     # Negative tests ----------------------------------------------------------
 
     def test_KNN_wrong_type(self):
@@ -123,3 +232,35 @@ class TestKNN(unittest.TestCase):
         # 2. Act & 3. Assert
         with self.assertRaises(ValueError):
             knn(df, columns=['x', 'a'])
+
+    def test_KNN_wrong_dtype(self):
+        """
+        Negative test
+
+        data: Correct data frame (example_df)
+        dtype: 'int32' (not a floating point type)
+
+        Checks that the function raises a ValueError if dtype is not a
+        supported floating point type.
+        """
+        # 1. Arrange
+        df = generate_example_df()
+        # 2. Act & 3. Assert
+        with self.assertRaises(ValueError):
+            knn(df, dtype='int32')
+
+    def test_KNN_wrong_algorithm(self):
+        """
+        Negative test
+
+        data: Correct data frame (example_df)
+        algorithm: 'kdtree' (not a supported algorithm)
+
+        Checks that the function raises a ValueError if the algorithm is not
+        supported.
+        """
+        # 1. Arrange
+        df = generate_example_df()
+        # 2. Act & 3. Assert
+        with self.assertRaises(ValueError):
+            knn(df, algorithm='kdtree')
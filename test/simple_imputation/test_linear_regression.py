@@ -1,7 +1,7 @@
 import unittest
 import logging
 
-from imputena import linear_regression
+from imputena import linear_regression, RegressionReport
 
 from test.example_data import *
 
@@ -141,6 +141,231 @@ class TestLinearRegression(unittest.TestCase):
         self.assertEqual(df.isna().sum().sum(), 8)
         self.assertEqual(df2.isna().sum().sum(), 3)
 
+    def test_LR_values(self):
+        """
+        Positive test
+
+        data: Correct data frame (sales)
+        regressions: 'complete'
+
+        The only row of the data frame sales in which 'sales' can be imputed
+        from both predictors is row 10 (year 1989, advertising 58).
+
+        Checks that the imputed value equals the prediction of the least
+        squares regression computed on the complete rows.
+        """
+        # 1. Arrange
+        df = generate_df_sales()
+        complete = df.dropna()
+        x = np.column_stack([
+            np.ones(len(complete)), complete[['advertising', 'year']]])
+        beta = np.linalg.lstsq(x, complete['sales'], rcond=None)[0]
+        # 2. Act
+        df2 = linear_regression(
+            df, 'sales', ['advertising', 'year'], 'complete')
+        # 3. Assert
+        self.assertAlmostEqual(
+            df2.loc[10, 'sales'], beta @ [1, 58, 1989], places=5)
+
+    def test_LR_available_values(self):
+        """
+        Positive test
+
+        data: Correct data frame (sales)
+        regressions: 'available'
+
+        In row 4 of the data frame sales, 'year' is missing, so 'sales' has
+        to be imputed with a regression on 'advertising' only.
+
+        Checks that the imputed value equals the prediction of the least
+        squares regression of 'sales' on 'advertising' computed on the rows
+        in which both are observed.
+        """
+        # 1. Arrange
+        df = generate_df_sales()
+        observed = df[['advertising', 'sales']].dropna()
+        x = np.column_stack([np.ones(len(observed)), observed['advertising']])
+        beta = np.linalg.lstsq(x, observed['sales'], rcond=None)[0]
+        # 2. Act
+        df2 = linear_regression(df, 'sales', ['advertising', 'year'])
+        # 3. Assert
+        self.assertAlmostEqual(df2.loc[4, 'sales'], beta @ [1, 30], places=5)
+
+    def test_LR_available_patterns(self):
+        """
+        Positive test
+
+        data: Data frame with the predictor patterns (a, b), (b), (a) and
+            none among the rows in which 'y' is missing
+        regressions: 'available'
+
+        Checks that each pattern is imputed with the regression on its
+        available predictors, that the row without predictors is left
+        missing, and that the stochastic imputation with a fixed seed,
+        which draws the noise of the patterns in the order of np.unique,
+        returns pinned values.
+        """
+        # 1. Arrange
+        df = pd.DataFrame({
+            'y': [1., 2., 3., 4., 5., 6., np.nan, np.nan, np.nan, np.nan],
+            'a': [1., 2., 3., 5., 5., 7., 2., np.nan, 4., np.nan],
+            'b': [2., 1., 4., 3., 6., 5., 3., 3., np.nan, np.nan]})
+        # 2. Act
+        df2 = linear_regression(df, 'y', regressions='available')
+        df3 = linear_regression(
+            df, 'y', regressions='available', noise=True, random_state=0)
+        # 3. Assert
+        self.assertTrue(np.allclose(
+            df2['y'].iloc[6:], [2.12693, 3.085714, 3.637584, np.nan],
+            equal_nan=True))
+        self.assertTrue(np.allclose(
+            df3['y'].iloc[6:], [2.15244, 3.756522, 3.5927, np.nan],
+            equal_nan=True))
+
+    def test_LR_gram_solver(self):
+        """
+        Positive test
+
+        data: Correct data frame (sales)
+        solver: 'gram'
+
+        The regression based on all predictors is fitted on the same rows by
+        both solvers.
+
+        Checks that the values imputed with solver='gram' equal those
+        imputed with solver='sklearn' when regressions='complete'.
+        """
+        # 1. Arrange
+        df = generate_df_sales()
+        # 2. Act
+        df2 = linear_regression(df, 'sales', regressions='complete')
+        df3 = linear_regression(
+            df, 'sales', regressions='complete', solver='gram')
+        # 3. Assert
+        self.assertEqual(df3['sales'].isna().sum(), 3)
+        self.assertTrue(
+            np.allclose(df2['sales'], df3['sales'], equal_nan=True))
+
+    def test_LR_pairwise_solver(self):
+        """
+        Positive test
+
+        data: Correct data frame (divcols)
+        solver: 'pairwise'
+
+        The data frame divcols contains 18 NA values, 10 of them in column
+        'c', which contains only NA values. No row is complete.
+
+        Checks that the returned data frame contains 10 NA values.
+        """
+        # 1. Arrange
+        df = generate_example_df_divcols()
+        # 2. Act
+        df2 = linear_regression(df, solver='pairwise')
+        # 3. Assert
+        self.assertEqual(df.isna().sum().sum(), 18)
+        self.assertEqual(df2.isna().sum().sum(), 10)
+
+    def test_LR_noise_random_state(self):
+        """
+        Positive test
+
+        data: Correct data frame (sales)
+        noise: True
+        random_state: 42
+
+        Checks that two stochastic regression imputations with the same seed
+        return the same data frame, and that a different seed changes the
+        imputed values.
+        """
+        # 1. Arrange
+        df = generate_df_sales()
+        # 2. Act
+        df2 = linear_regression(df, 'sales', noise=True, random_state=42)
+        df3 = linear_regression(df, 'sales', noise=True, random_state=42)
+        df4 = linear_regression(df, 'sales', noise=True, random_state=43)
+        # 3. Assert
+        self.assertTrue(df2.equals(df3))
+        self.assertFalse(df2.equals(df4))
+
+    def test_LR_no_noise_global_state(self):
+        """
+        Positive test
+
+        data: Correct data frame (sales)
+        noise: False
+
+        Checks that the deterministic regression imputation does not draw
+        from numpy's global random number generator.
+        """
+        # 1. Arrange
+        df = generate_df_sales()
+        np.random.seed(0)
+        expected = np.random.random()
+        np.random.seed(0)
+        # 2. Act
+        linear_regression(df, 'sales')
+        # 3. Assert
+        self.assertEqual(np.random.random(), expected)
+
+    def test_LR_inplace_values(self):
+        """
+        Positive test
+
+        data: Correct data frame (divcols)
+        solver: 'pairwise'
+        inplace: True
+
+        Checks that the imputation performed inplace imputes the same values
+        as the one returning a copy, and that only missing cells change.
+        """
+        # 1. Arrange
+        df = generate_example_df_divcols()
+        df2 = df.copy()
+        # 2. Act
+        df3 = linear_regression(df, solver='pairwise')
+        linear_regression(df2, solver='pairwise', inplace=True)
+        # 3. Assert
+        self.assertTrue(df2.equals(df3))
+        self.assertTrue(df2[df.notna()].equals(df[df.notna()]))
+
+    def test_LR_report(self):
+        """
+        Positive test
+
+        data: Correct data frame (sales)
+        report: Empty RegressionReport
+
+        The data frame sales contains 4 NA values in the column 'sales', of
+        which 1 is imputed from both predictors, 1 from 'advertising' only
+        and 1 from 'year' only.
+
+        Checks that the report records the three regressions with the number
+        of rows imputed by each, and the coefficients of the least squares
+        regression on both predictors.
+        """
+        # 1. Arrange
+        df = generate_df_sales()
+        report = RegressionReport()
+        complete = df.dropna()
+        x = np.column_stack([
+            np.ones(len(complete)), complete[['advertising', 'year']]])
+        beta = np.linalg.lstsq(x, complete['sales'], rcond=None)[0]
+        # 2. Act
+        linear_regression(
+            df, 'sales', ['advertising', 'year'], report=report)
+        # 3. Assert
+        frame = report.to_frame().set_index('predictors')
+        self.assertEqual(report.rows_imputed(), 3)
+        self.assertEqual(len(frame), 3)
+        self.assertTrue((frame['rows'] == 1).all())
+        full = frame.loc[[('advertising', 'year')]].iloc[0]
+        self.assertAlmostEqual(full['intercept'], beta[0], places=5)
+        self.assertAlmostEqual(
+            full['coefs']['advertising'], beta[1], places=5)
+        self.assertAlmostEqual(full['coefs']['year'], beta[2], places=5)
+        self.assertTrue((report.to_frame()['fit_time'] >= 0).all())
+
     # Negative tests ----------------------------------------------------------
 
     def test_LR_wrong_type(self):
@@ -205,3 +430,35 @@ class TestLinearRegression(unittest.TestCase):
         # 2. Act & 3. Assert
         with self.assertRaises(ValueError):
             linear_regression(df, 'sales', ['advertising', 'year'], 'z')
+
+    def test_LR_wrong_report(self):
+        """
+        Negative test
+
+        data: Correct data frame (sales)
+        report: [] (not a RegressionReport)
+
+        Checks that the function raises a TypeError if the report is not a
+        RegressionReport.
+        """
+        # 1. Arrange
+        df = generate_df_sales()
+        # 2. Act & 3. Assert
+        with self.assertRaises(TypeError):
+            linear_regression(df, 'sales', report=[])
+
+    def test_LR_wrong_solver(self):
+        """
+        Negative test
+
+        data: Correct data frame (sales)
+        solver: 'z' (not a valid value)
+
+        Checks that the function raises a ValueError if the value passed for
+        the parameter solver is not valid.
+        """
+        # 1. Arrange
+        df = generate_df_sales()
+        # 2. Act & 3. Assert
+        with self.assertRaises(ValueError):
+            linear_regression(df, 'sales', solver='z')
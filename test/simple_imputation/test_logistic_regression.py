@@ -91,6 +91,77 @@ class TestLogisticRegression(unittest.TestCase):
         self.assertEqual(df.isna().sum().sum(), 15)
         self.assertEqual(df2.isna().sum().sum(), 12)
 
+    def test_logistic_regression_noise(self):
+        """
+        Positive test
+
+        data: Correct data frame (df_breast_cancer)
+        noise: True
+        random_state: 42
+
+        The data frame (df_breast_cancer) contains 15 NA values.
+        logistic_regression() should impute 7 of them.
+
+        Checks that the returned data frame contains 8 NA values, that the
+        imputed values are classes observed in the data and that two
+        imputations with the same seed are equal.
+        """
+        # 1. Arrange
+        df = generate_df_breast_cancer()
+        # 2. Act
+        df2 = logistic_regression(
+            df, 'class', ['thickness', 'uniformity'], noise=True,
+            random_state=42)
+        df3 = logistic_regression(
+            df, 'class', ['thickness', 'uniformity'], noise=True,
+            random_state=42)
+        # 3. Assert
+        self.assertEqual(df2.isna().sum().sum(), 8)
+        self.assertTrue(set(df2['class'].dropna()).issubset(
+            set(df['class'].dropna())))
+        self.assertTrue(df2.equals(df3))
+
+    def test_logistic_regression_no_noise_global_state(self):
+        """
+        Positive test
+
+        data: Correct data frame (df_breast_cancer)
+        noise: False
+
+        Checks that the deterministic logistic regression imputation does
+        not draw from numpy's global random number generator.
+        """
+        # 1. Arrange
+        df = generate_df_breast_cancer()
+        np.random.seed(0)
+        expected = np.random.random()
+        np.random.seed(0)
+        # 2. Act
+        logistic_regression(df, 'class', ['thickness', 'uniformity'])
+        # 3. Assert
+        self.assertEqual(np.random.random(), expected)
+
+    def test_logistic_regression_categorical(self):
+        """
+        Positive test
+
+        data: Correct data frame (df_breast_cancer), with class as a
+            categorical column
+
+        Checks that the imputed values are equal to those imputed when the
+        column has an object dtype and that the column keeps its dtype.
+        """
+        # 1. Arrange
+        df = generate_df_breast_cancer()
+        df2 = df.copy()
+        df2['class'] = pd.Categorical(df2['class'])
+        # 2. Act
+        df3 = logistic_regression(df, 'class', ['thickness', 'uniformity'])
+        df4 = logistic_regression(df2, 'class', ['thickness', 'uniformity'])
+        # 3. Assert
+        self.assertEqual(df4['class'].dtype, df2['class'].dtype)
+        self.assertTrue(df3['class'].equals(df4['class'].astype(object)))
+
     # Negative tests ----------------------------------------------------------
 
     def test_logistic_regression_wrong_type(self):
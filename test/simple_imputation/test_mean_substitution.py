@@ -1,6 +1,6 @@
 import unittest
 
-from imputena import mean_substitution
+from imputena import mean_substitution, MeanState, QuantileSketch
 
 from test.example_data import *
 
@@ -216,6 +216,47 @@ class TestMeanSubstitution(unittest.TestCase):
         # 3. Assert
         self.assertEqual(ser.isna().sum(), 0)
 
+    def test_MS_df_statistics(self):
+        """
+        Positive test
+
+        data: Correct dataframe (divcols)
+        statistics: MeanState merged from two partitions of the data
+
+        Checks that the dataframe is filled in with the means of the whole
+        data.
+        """
+        # 1. Arrange
+        df = generate_example_df_divcols()
+        statistics = MeanState().update(df.iloc[:4]).merge(
+            MeanState().update(df.iloc[4:]))
+        # 2. Act
+        df2 = mean_substitution(df, statistics=statistics)
+        # 3. Assert
+        pd.testing.assert_frame_equal(df2, mean_substitution(df))
+
+    def test_MS_series_statistics(self):
+        """
+        Positive test
+
+        data: Correct series (example series)
+        method: 'median'
+        statistics: QuantileSketch of the series
+
+        Checks that the series contains no NA values and that they are
+        filled in with the median up to the accuracy of the sketch.
+        """
+        # 1. Arrange
+        ser = generate_example_series()
+        statistics = QuantileSketch(relative_accuracy=0.001).update(ser)
+        # 2. Act
+        ser2 = mean_substitution(ser, method='median', statistics=statistics)
+        # 3. Assert
+        self.assertEqual(ser2.isna().sum(), 0)
+        median = ser.median()
+        for value in ser2[ser.isna()]:
+            self.assertLessEqual(abs(value - median), 0.001 * abs(median))
+
     # Negative tests ----------------------------------------------------------
 
     def test_MS_wrong_type(self):
@@ -296,3 +337,21 @@ class TestMeanSubstitution(unittest.TestCase):
         # 2. Act & 3. Assert
         with self.assertRaises(ValueError):
             mean_substitution(ser, method='z')
+
+    def test_MS_wrong_statistics(self):
+        """
+        Negative test
+
+        data: Correct dataframe (divcols)
+        method: 'median'
+        statistics: MeanState (does not match the method)
+
+        Checks that the function raises a TypeError if the statistics do not
+        correspond to the method.
+        """
+        # 1. Arrange
+        df = generate_example_df_divcols()
+        statistics = MeanState().update(df)
+        # 2. Act & 3. Assert
+        with self.assertRaises(TypeError):
+            mean_substitution(df, method='median', statistics=statistics)
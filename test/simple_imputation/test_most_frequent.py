@@ -1,6 +1,6 @@
 import unittest
 
-from imputena import most_frequent
+from imputena import most_frequent, ModeState
 
 from test.example_data import *
 
@@ -110,6 +110,71 @@ class TestMostFrequent(unittest.TestCase):
         # 3. Assert
         self.assertEqual(ser.isna().sum(), 0)
 
+    def test_MF_df_statistics(self):
+        """
+        Positive test
+
+        data: Correct dataframe (breast cancer)
+        columns: ['uniformity', 'class']
+        statistics: ModeState merged from three partitions of the data
+
+        Checks that the selected columns are filled in with the most
+        frequent values of the whole data.
+        """
+        # 1. Arrange
+        df = generate_df_breast_cancer()
+        statistics = ModeState()
+        for part in [df.iloc[:10], df.iloc[10:20], df.iloc[20:]]:
+            statistics.merge(ModeState().update(part))
+        # 2. Act
+        df2 = most_frequent(
+            df, columns=['uniformity', 'class'], statistics=statistics)
+        # 3. Assert
+        pd.testing.assert_frame_equal(
+            df2, most_frequent(df, columns=['uniformity', 'class']))
+
+    def test_MF_df_ties(self):
+        """
+        Positive test
+
+        data: Dataframe with a numeric, an object and a categorical column,
+            each with two equally frequent values
+
+        Checks that the ties are broken like data.mode().iloc[0]: the
+        smallest value, or the first category of a categorical column.
+        """
+        # 1. Arrange
+        df = pd.DataFrame({
+            'a': [2, 1, np.nan, 2, 1],
+            'b': ['y', 'x', None, 'x', 'y'],
+            'c': pd.Categorical(
+                ['q', 'p', None, 'q', 'p'], categories=['q', 'p'])})
+        # 2. Act
+        df2 = most_frequent(df)
+        # 3. Assert
+        self.assertEqual(df2.loc[2, 'a'], 1)
+        self.assertEqual(df2.loc[2, 'b'], 'x')
+        self.assertEqual(df2.loc[2, 'c'], 'q')
+
+    def test_MF_df_complete_columns_skipped(self):
+        """
+        Positive test
+
+        data: Dataframe with a column with missing values and a complete
+            column of unhashable values (lists)
+
+        Checks that only the column with missing values is counted, so the
+        complete column does not need to be hashed.
+        """
+        # 1. Arrange
+        df = pd.DataFrame({
+            'a': [1, np.nan, 1, 3], 'b': [[1], [2], [3], [4]]})
+        # 2. Act
+        df2 = most_frequent(df)
+        # 3. Assert
+        self.assertEqual(df2.loc[1, 'a'], 1)
+        self.assertEqual(df2.isna().sum().sum(), 0)
+
     # Negative tests ----------------------------------------------------------
 
     def test_MF_wrong_type(self):
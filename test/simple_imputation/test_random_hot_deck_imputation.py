@@ -44,6 +44,79 @@ class TestRandomHotDeckImputation(unittest.TestCase):
         # 3. Assert
         self.assertEqual(df.isna().sum().sum(), 1)
 
+    def test_RHDI_random_state(self):
+        """
+        Positive test
+
+        data: Correct dataframe (hotdeck)
+        random_state: 42
+
+        Checks that two imputations with the same seed return the same
+        dataframe.
+        """
+        # 1. Arrange
+        df = generate_example_df_hotdeck()
+        # 2. Act
+        df2 = random_hot_deck_imputation(
+            df, incomplete_variable='a', deck_variables=['b'],
+            random_state=42)
+        df3 = random_hot_deck_imputation(
+            df, incomplete_variable='a', deck_variables=['b'],
+            random_state=42)
+        # 3. Assert
+        self.assertEqual(df2.isna().sum().sum(), 1)
+        self.assertTrue(df2.equals(df3))
+
+    def test_RHDI_donor_pools(self):
+        """
+        Positive test
+
+        data: Correct dataframe (hotdeck)
+        incomplete_variable: a
+        deck_variables: ['b']
+
+        Checks that each imputed value was donated by a row with the same
+        value for the variable b, for several seeds.
+        """
+        # 1. Arrange
+        df = generate_example_df_hotdeck()
+        # 2. Act
+        dfs = [
+            random_hot_deck_imputation(
+                df, incomplete_variable='a', deck_variables=['b'],
+                random_state=seed)
+            for seed in range(10)]
+        # 3. Assert
+        for df2 in dfs:
+            self.assertIn(df2.loc[2, 'a'], [3.1, 8.0])
+            self.assertIn(df2.loc[3, 'a'], [5.7, 1.2])
+
+    def test_RHDI_categorical(self):
+        """
+        Positive test
+
+        data: Correct dataframe (hotdeck), with b as a categorical column
+        incomplete_variable: b
+        deck_variables: ['a', 'd']
+
+        Checks that the missing value of the categorical column is donated
+        by the only row with the same deck values and that the column keeps
+        its dtype.
+        """
+        # 1. Arrange
+        df = generate_example_df_hotdeck()
+        df['b'] = pd.Categorical(df['b'])
+        df.loc[2, 'a'] = 8.0
+        df.loc[2, 'd'] = 'm'
+        df.loc[2, 'b'] = np.nan
+        # 2. Act
+        df2 = random_hot_deck_imputation(
+            df, incomplete_variable='b', deck_variables=['a', 'd'],
+            random_state=0)
+        # 3. Assert
+        self.assertEqual(df2.loc[2, 'b'], 'x')
+        self.assertEqual(df2['b'].dtype, df['b'].dtype)
+
     # Negative tests ----------------------------------------------------------
 
     def test_RHDI_no_donors(self):
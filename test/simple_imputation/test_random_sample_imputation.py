@@ -112,6 +112,46 @@ class TestRandomSampleImputation(unittest.TestCase):
         # 3. Assert
         self.assertEqual(ser.isna().sum(), 0)
 
+    # Positive tests for the random state -----------------------------------
+
+    def test_RSI_random_state(self):
+        """
+        Positive test
+
+        data: Correct dataframe (divcols)
+        random_state: 42
+
+        Checks that two imputations with the same seed return the same
+        dataframe.
+        """
+        # 1. Arrange
+        df = generate_example_df_divcols()
+        # 2. Act
+        df2 = random_sample_imputation(df, random_state=42)
+        df3 = random_sample_imputation(df, random_state=42)
+        # 3. Assert
+        self.assertEqual(df2.isna().sum().sum(), 10)
+        self.assertTrue(df2.equals(df3))
+
+    def test_RSI_categorical(self):
+        """
+        Positive test
+
+        data: Categorical series with 2 NA values
+
+        Checks that the missing values are filled in with observed
+        categories and that the series keeps its dtype.
+        """
+        # 1. Arrange
+        ser = pd.Series(pd.Categorical(
+            ['a', None, 'b', 'b', None], categories=['c', 'b', 'a']))
+        # 2. Act
+        ser2 = random_sample_imputation(ser, random_state=0)
+        # 3. Assert
+        self.assertEqual(ser2.isna().sum(), 0)
+        self.assertTrue(set(ser2).issubset({'a', 'b'}))
+        self.assertEqual(ser2.dtype, ser.dtype)
+
     # Negative tests ----------------------------------------------------------
 
     def test_RSI_wrong_type(self):
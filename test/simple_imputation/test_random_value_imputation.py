@@ -78,6 +78,61 @@ class TestRandomValueImputation(unittest.TestCase):
         self.assertEqual(df.isna().sum().sum(), 18)
         self.assertEqual(df2.isna().sum().sum(), 0)
 
+    def test_RVI_df_float32(self):
+        """
+        Positive test
+
+        data: Correct dataframe (example_df)
+        vmin: 2
+        vmax: 3
+        dtype: 'float32'
+
+        Checks that the values drawn in single precision lie between vmin
+        (inclusive) and vmax (exclusive).
+        """
+        # 1. Arrange
+        df = generate_example_df()
+        na_mask = df.isna()
+        # 2. Act
+        df2 = random_value_imputation(
+            df, vmin=2, vmax=3, random_state=42, dtype='float32')
+        # 3. Assert
+        imputed = df2[na_mask].stack()
+        self.assertEqual(df2.isna().sum().sum(), 0)
+        self.assertTrue(((imputed >= 2) & (imputed < 3)).all())
+
+    def test_RVI_df_sparse(self):
+        """
+        Positive test
+
+        data: Data frame with 1000 rows of 3 columns, of which only 4 cells
+            are missing
+        columns: ['a', 'b']
+        vmin: 2
+        vmax: 3
+
+        Checks that only the missing cells of the selected columns are
+        filled in, with values between vmin and vmax, and that the other
+        cells remain unmodified.
+        """
+        # 1. Arrange
+        df = pd.DataFrame(
+            np.arange(3000, dtype=float).reshape(1000, 3),
+            columns=['a', 'b', 'c'])
+        df.iloc[[5, 700], 0] = np.nan
+        df.iloc[[1, 999], 1] = np.nan
+        df.iloc[[3], 2] = np.nan
+        na_mask = df.isna()
+        # 2. Act
+        df2 = random_value_imputation(
+            df, vmin=2, vmax=3, columns=['a', 'b'], random_state=42)
+        # 3. Assert
+        imputed = df2[na_mask[['a', 'b']]][['a', 'b']].stack()
+        self.assertEqual(len(imputed), 4)
+        self.assertTrue(((imputed >= 2) & (imputed < 3)).all())
+        self.assertTrue(df2.isna().equals(na_mask & (df.columns == 'c')))
+        self.assertTrue(df2[~na_mask].equals(df[~na_mask]))
+
     # Positive tests for data as a series -------------------------------------
 
     def test_RVI_series_returning(self):
@@ -149,6 +204,26 @@ class TestRandomValueImputation(unittest.TestCase):
         self.assertEqual(ser.isna().sum().sum(), 3)
         self.assertEqual(ser2.isna().sum().sum(), 0)
 
+    def test_RVI_series_random_state(self):
+        """
+        Positive test
+
+        data: Correct series (example series)
+        random_state: numpy.random.Generator seeded with 42
+
+        Checks that the values drawn from a generator equal those drawn from
+        the same seed passed as an int.
+        """
+        # 1. Arrange
+        ser = generate_example_series()
+        # 2. Act
+        ser2 = random_value_imputation(
+            ser, 'normal', random_state=np.random.default_rng(42))
+        ser3 = random_value_imputation(ser, 'normal', random_state=42)
+        # 3. Assert
+        self.assertEqual(ser2.isna().sum().sum(), 0)
+        self.assertTrue(ser2.equals(ser3))
+
     # Negative tests ----------------------------------------------------------
 
     def test_RVI_wrong_type(self):
@@ -182,6 +257,38 @@ class TestRandomValueImputation(unittest.TestCase):
         with self.assertRaises(ValueError):
             random_value_imputation(ser, columns=['z'])
 
+    def test_RVI_wrong_dtype(self):
+        """
+        Negative test
+
+        data: Correct series (example series)
+        dtype: 'int32' (not a floating point type)
+
+        Checks that the function raises a ValueError if dtype is not a
+        supported floating point type.
+        """
+        # 1. Arrange
+        ser = generate_example_series()
+        # 2. Act & 3. Assert
+        with self.assertRaises(ValueError):
+            random_value_imputation(ser, dtype='int32')
+
+    def test_RVI_df_wrong_column(self):
+        """
+        Negative test
+
+        data: Correct dataframe (divcols)
+        columns: ['z'] ('z' doesn't exist as a column in the data)
+
+        Checks that the function raises a ValueError if one of the specified
+        columns doesn't exist in the dataframe.
+        """
+        # 1. Arrange
+        df = generate_example_df_divcols()
+        # 2. Act & 3. Assert
+        with self.assertRaises(ValueError):
+            random_value_imputation(df, columns=['z'])
+
     def test_RVI_df_invalid_distribution(self):
         """
         Negative test
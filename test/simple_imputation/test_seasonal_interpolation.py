@@ -69,6 +69,72 @@ class TestSeasonalInterpolation(unittest.TestCase):
         self.assertEqual(df.isna().sum().sum(), 144+13)
         self.assertEqual(df2.isna().sum().sum(), 144+0)
 
+    def test_SI_df_several_series(self):
+        """
+        Positive test
+
+        data: Data frame with three series (airgap, airgap with another
+            pattern of NA values, and airgap without NA values)
+
+        Checks that each column interpolated together with the others equals
+        the series interpolated on its own, and that the column without NA
+        values remains unmodified.
+        """
+        # 1. Arrange
+        ts = generate_ts_airgap()
+        ts2 = ts.shift(3).bfill() * 2
+        ts2.iloc[[10, 50, 51]] = np.nan
+        ts3 = ts.interpolate()
+        df = pd.DataFrame({'a': ts, 'b': ts2, 'c': ts3})
+        # 2. Act
+        df2 = seasonal_interpolation(df)
+        # 3. Assert
+        self.assertTrue(np.allclose(df2['a'], seasonal_interpolation(ts)))
+        self.assertTrue(np.allclose(df2['b'], seasonal_interpolation(ts2)))
+        self.assertTrue(df2['c'].equals(ts3))
+
+    def test_SI_df_n_jobs(self):
+        """
+        Positive test
+
+        data: Data frame with two series (airgap and airgap doubled)
+        n_jobs: 2
+
+        Checks that processing the columns on two processes returns the same
+        data frame as processing them in the current process.
+        """
+        # 1. Arrange
+        ts = generate_ts_airgap()
+        df = pd.DataFrame({'a': ts, 'b': ts * 2})
+        # 2. Act
+        df2 = seasonal_interpolation(df)
+        df3 = seasonal_interpolation(df, n_jobs=2)
+        # 3. Assert
+        self.assertEqual(df3.isna().sum().sum(), 0)
+        self.assertTrue(df2.equals(df3))
+
+    def test_SI_df_float32(self):
+        """
+        Positive test
+
+        data: Correct data frame (example_df_ts)
+        dtype: 'float32'
+
+        Checks that the values interpolated in single precision deviate from
+        those interpolated in double precision by a relative error of less
+        than 1e-4.
+        """
+        # 1. Arrange
+        df = generate_example_df_ts()
+        # 2. Act
+        df2 = seasonal_interpolation(df)
+        df3 = seasonal_interpolation(df, dtype='float32')
+        # 3. Assert
+        self.assertEqual(df3.isna().sum().sum(), 144+0)
+        self.assertTrue(np.allclose(
+            df3.to_numpy(dtype=float), df2.to_numpy(dtype=float),
+            rtol=1e-4, atol=0, equal_nan=True))
+
     # Positive tests for data as a series -------------------------------------
 
     def test_SI_series_returning(self):
@@ -264,3 +330,34 @@ class TestSeasonalInterpolation(unittest.TestCase):
         # 2. Act & 3. Assert
         with self.assertRaises(ValueError):
             seasonal_interpolation(df, dec_model='z')
+
+    def test_SI_wrong_dtype(self):
+        """
+        Negative test
+
+        data: Correct data frame (example_df_ts)
+        dtype: 'int32' (not a floating point type)
+
+        Checks that the function raises a ValueError if dtype is not a
+        supported floating point type.
+        """
+        # 1. Arrange
+        df = generate_example_df_ts()
+        # 2. Act & 3. Assert
+        with self.assertRaises(ValueError):
+            seasonal_interpolation(df, dtype='int32')
+
+    def test_SI_no_frequency(self):
+        """
+        Negative test
+
+        data: Correct series (airgap) with a RangeIndex (no frequency)
+
+        Checks that the function raises a ValueError if the period of the
+        series cannot be inferred from its index.
+        """
+        # 1. Arrange
+        ts = generate_ts_airgap().reset_index(drop=True)
+        # 2. Act & 3. Assert
+        with self.assertRaises(ValueError):
+            seasonal_interpolation(ts)
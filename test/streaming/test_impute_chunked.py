@@ -0,0 +1,223 @@
+import unittest
+import os
+import tempfile
+
+from imputena import (
+    impute_chunked, mean_substitution, most_frequent, delete_columns)
+
+from test.example_data import *
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class TestImputeChunked(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.directory.name, 'data.csv')
+        self.destination = os.path.join(self.directory.name, 'imputed.csv')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    # Positive tests ----------------------------------------------------------
+
+    def test_IC_mean(self):
+        """
+        Positive test
+
+        data: Correct dataframe (divcols), in a CSV file
+        method: 'mean'
+        chunk_size: 3
+
+        Checks that the imputed file is equal to the result of
+        mean_substitution() on the whole dataframe.
+        """
+        # 1. Arrange
+        df = generate_example_df_divcols()
+        df.to_csv(self.source, index=False)
+        # 2. Act
+        impute_chunked(
+            self.source, self.destination, method='mean', chunk_size=3)
+        # 3. Assert
+        df2 = pd.read_csv(self.destination)
+        df3 = mean_substitution(df).reset_index(drop=True)
+        pd.testing.assert_frame_equal(df2, df3, check_dtype=False)
+
+    def test_IC_median_exact(self):
+        """
+        Positive test
+
+        data: Correct dataframe (divcols), in a CSV file
+        method: 'median'
+        columns: ['e', 'f', 'h']
+        exact: True
+        chunk_size: 3
+
+        Checks that the imputed file is equal to the result of
+        mean_substitution() with method='median' on the whole dataframe.
+        """
+        # 1. Arrange
+        df = generate_example_df_divcols()
+        df.to_csv(self.source, index=False)
+        # 2. Act
+        impute_chunked(
+            self.source, self.destination, method='median',
+            columns=['e', 'f', 'h'], exact=True, chunk_size=3)
+        # 3. Assert
+        df2 = pd.read_csv(self.destination)
+        df3 = mean_substitution(
+            df, method='median', columns=['e', 'f', 'h']).reset_index(
+            drop=True)
+        pd.testing.assert_frame_equal(df2, df3, check_dtype=False)
+
+    def test_IC_median_sketch(self):
+        """
+        Positive test
+
+        data: Dataframe with 10000 random values, in a CSV file
+        method: 'median'
+        relative_accuracy: 0.01
+
+        Checks that the estimated median used to fill in the missing values
+        has a relative error of at most 1%.
+        """
+        # 1. Arrange
+        rng = np.random.default_rng(0)
+        values = rng.lognormal(size=10000)
+        values[:100] = np.nan
+        pd.DataFrame({'x': values}).to_csv(self.source, index=False)
+        # 2. Act
+        impute_chunked(
+            self.source, self.destination, method='median', chunk_size=999)
+        # 3. Assert
+        median = np.nanmedian(values)
+        df2 = pd.read_csv(self.destination)
+        self.assertEqual(df2['x'].isna().sum(), 0)
+        self.assertLessEqual(abs(df2.loc[0, 'x'] - median), 0.01 * median)
+
+    def test_IC_most_frequent(self):
+        """
+        Positive test
+
+        data: Correct dataframe (breast cancer), in a CSV file
+        method: 'most_frequent'
+        chunk_size: 50
+
+        Checks that the imputed file is equal to the result of
+        most_frequent() on the whole dataframe.
+        """
+        # 1. Arrange
+        df = generate_df_breast_cancer()
+        df.to_csv(self.source, index=False)
+        # 2. Act
+        impute_chunked(
+            self.source, self.destination, method='most_frequent',
+            chunk_size=50)
+        # 3. Assert
+        df2 = pd.read_csv(self.destination)
+        df3 = most_frequent(pd.read_csv(self.source))
+        pd.testing.assert_frame_equal(df2, df3, check_dtype=False)
+
+    def test_IC_delete_columns(self):
+        """
+        Positive test
+
+        data: Correct dataframe (divcols), in a CSV file
+        method: 'delete_columns'
+        threshold: 8
+        chunk_size: 4
+
+        Checks that the imputed file is equal to the result of
+        delete_columns() on the whole dataframe.
+        """
+        # 1. Arrange
+        df = generate_example_df_divcols()
+        df.to_csv(self.source, index=False)
+        # 2. Act
+        impute_chunked(
+            self.source, self.destination, method='delete_columns',
+            threshold=8, chunk_size=4)
+        # 3. Assert
+        df2 = pd.read_csv(self.destination)
+        df3 = delete_columns(df, threshold=8).reset_index(drop=True)
+        pd.testing.assert_frame_equal(df2, df3, check_dtype=False)
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_IC_parquet(self):
+        """
+        Positive test
+
+        data: Correct dataframe (divcols), in two Parquet files
+        method: 'mean'
+        chunk_size: 3
+
+        Checks that the imputed file is equal to the result of
+        mean_substitution() on the whole dataframe.
+        """
+        # 1. Arrange
+        df = generate_example_df_divcols().reset_index(drop=True)
+        sources = [
+            os.path.join(self.directory.name, 'part-0.parquet'),
+            os.path.join(self.directory.name, 'part-1.parquet')]
+        df.iloc[:6].to_parquet(sources[0], index=False)
+        df.iloc[6:].to_parquet(sources[1], index=False)
+        destination = os.path.join(self.directory.name, 'imputed.parquet')
+        # 2. Act
+        impute_chunked(sources, destination, method='mean', chunk_size=3)
+        # 3. Assert
+        df2 = pd.read_parquet(destination)
+        pd.testing.assert_frame_equal(
+            df2, mean_substitution(df), check_dtype=False)
+
+    # Negative tests ----------------------------------------------------------
+
+    def test_IC_wrong_method(self):
+        """
+        Negative test
+
+        data: Correct dataframe (divcols), in a CSV file
+        method: 'mode' (not a valid value)
+
+        Checks that the function raises a ValueError if the method is not
+        supported.
+        """
+        # 1. Arrange
+        generate_example_df_divcols().to_csv(self.source, index=False)
+        # 2. Act & 3. Assert
+        with self.assertRaises(ValueError):
+            impute_chunked(self.source, self.destination, method='mode')
+
+    def test_IC_wrong_column(self):
+        """
+        Negative test
+
+        data: Correct dataframe (divcols), in a CSV file
+        columns: ['z'] ('z' is not a column of the data)
+
+        Checks that the function raises a ValueError if one of the columns
+        doesn't exist in the data.
+        """
+        # 1. Arrange
+        generate_example_df_divcols().to_csv(self.source, index=False)
+        # 2. Act & 3. Assert
+        with self.assertRaises(ValueError):
+            impute_chunked(self.source, self.destination, columns=['z'])
+
+    def test_IC_wrong_file_format(self):
+        """
+        Negative test
+
+        source: File with the extension .xlsx (unsupported format)
+
+        Checks that the function raises a ValueError if the format of the
+        file cannot be inferred.
+        """
+        # 1. Arrange
+        source = os.path.join(self.directory.name, 'data.xlsx')
+        # 2. Act & 3. Assert
+        with self.assertRaises(ValueError):
+            impute_chunked(source, self.destination)
@@ -0,0 +1,132 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import imputena
+
+
+def run_python(code):
+    """Runs code in a new Python process and returns what it prints."""
+    return subprocess.run(
+        [sys.executable, '-c', code], check=True, capture_output=True,
+        text=True).stdout.strip()
+
+
+# Prints the top-level packages imported by the statements that follow
+# pandas, so that the dependencies of imputena itself are measured:
+MODULES_AFTER = """
+import sys
+import pandas
+before = set(sys.modules)
+{}
+new = set(sys.modules) - before
+print(' '.join(sorted({{name.split('.')[0] for name in new}})))
+"""
+
+# Prints which of the heavy dependencies are loaded after the statements:
+HEAVY_LOADED = """
+import sys
+{}
+print(' '.join(
+    name for name in ['sklearn', 'statsmodels', 'scipy']
+    if name in sys.modules))
+"""
+
+# Prints the time taken by the statements that follow pandas:
+TIME_AFTER = """
+import time
+import pandas
+start = time.perf_counter()
+{}
+print(time.perf_counter() - start)
+"""
+
+
+class TestImport(unittest.TestCase):
+
+    # Positive tests ----------------------------------------------------------
+
+    def test_import_budget(self):
+        """
+        Positive test
+
+        Checks that importing imputena in a new process does not load
+        scikit-learn, statsmodels or scipy. This check runs by default,
+        while the time of the import is only checked on request (see
+        test_import_time).
+        """
+        # 1. Arrange
+        code = HEAVY_LOADED.format('import imputena')
+        # 2. Act
+        loaded = run_python(code)
+        # 3. Assert
+        self.assertEqual(loaded, '')
+
+    @unittest.skipUnless(
+        os.environ.get('IMPUTENA_TIMING_TESTS'),
+        'timing tests run only if IMPUTENA_TIMING_TESTS is set')
+    def test_import_time(self):
+        """
+        Positive test
+
+        Checks that importing imputena takes less than 0.5 seconds once
+        pandas is loaded. As it depends on the load of the machine, it only
+        runs if the environment variable IMPUTENA_TIMING_TESTS is set.
+        """
+        # 1. Arrange
+        code = TIME_AFTER.format('import imputena')
+        # 2. Act
+        elapsed = float(run_python(code))
+        # 3. Assert
+        self.assertLess(elapsed, 0.5)
+
+    def test_import_light_function(self):
+        """
+        Positive test
+
+        Checks that accessing locf and mean_substitution does not load
+        scikit-learn or statsmodels, while accessing knn loads scikit-learn.
+        """
+        # 1. Arrange
+        code_light = MODULES_AFTER.format(
+            'import imputena\nimputena.locf\nimputena.mean_substitution')
+        code_knn = MODULES_AFTER.format('import imputena\nimputena.knn')
+        # 2. Act
+        modules_light = run_python(code_light).split()
+        modules_knn = run_python(code_knn).split()
+        # 3. Assert
+        self.assertNotIn('sklearn', modules_light)
+        self.assertNotIn('statsmodels', modules_light)
+        self.assertIn('sklearn', modules_knn)
+
+    def test_import_all(self):
+        """
+        Positive test
+
+        Checks that every name listed in __all__ can be resolved and is
+        listed by dir().
+        """
+        # 1. Arrange
+        names = imputena.__all__
+        # 2. Act
+        values = [getattr(imputena, name) for name in names]
+        # 3. Assert
+        for name, value in zip(names, values):
+            self.assertTrue(callable(value))
+            self.assertIn(name, dir(imputena))
+
+    # Negative tests ----------------------------------------------------------
+
+    def test_import_wrong_name(self):
+        """
+        Negative test
+
+        Checks that accessing a name that imputena does not define raises an
+        AttributeError.
+        """
+        # 1. Arrange
+        name = 'not_a_method'
+        # 2. Act & 3. Assert
+        with self.assertRaises(AttributeError):
+            getattr(imputena, name)
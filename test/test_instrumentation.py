@@ -0,0 +1,160 @@
+import unittest
+
+import numpy as np
+
+from imputena import (
+    linear_regression, mice, seasonal_interpolation, profiling)
+from imputena.instrumentation import stage
+
+from test.example_data import *
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    # Positive tests ----------------------------------------------------------
+
+    def test_profiling_linear_regression(self):
+        """
+        Positive test
+
+        data: Correct data frame (sales)
+
+        The column 'sales' is imputed with three regressions, each on one
+        row.
+
+        Checks that the report records the copy of the data and the fit and
+        the application of each regression, with their times, memory and
+        rows.
+        """
+        # 1. Arrange
+        df = generate_df_sales()
+        # 2. Act
+        with profiling() as report:
+            linear_regression(df, 'sales', ['advertising', 'year'])
+        # 3. Assert
+        summary = report.summary()
+        self.assertEqual(summary.loc['linear_regression.copy', 'runs'], 1)
+        self.assertEqual(summary.loc['linear_regression.fit', 'runs'], 3)
+        self.assertEqual(summary.loc['linear_regression.apply', 'runs'], 3)
+        self.assertEqual(summary.loc['linear_regression.apply', 'rows'], 3)
+        frame = report.to_frame()
+        self.assertTrue((frame['wall_time'] >= 0).all())
+        self.assertTrue((frame['cpu_time'] >= 0).all())
+        self.assertTrue((frame['peak_memory'] >= 0).all())
+
+    def test_profiling_mice(self):
+        """
+        Positive test
+
+        data: Correct data frame (sales)
+        imputations: 2
+
+        Checks that the report records the stages of both imputations.
+        """
+        # 1. Arrange
+        df = generate_df_sales()
+        # 2. Act
+        with profiling() as report:
+            mice(df, imputations=2, random_state=0)
+        # 3. Assert
+        summary = report.summary()
+        self.assertEqual(summary.loc['mice.copy', 'runs'], 2)
+        self.assertEqual(summary.loc['mice.cross_products', 'runs'], 2)
+        self.assertEqual(summary.loc['mice.linear_regression', 'runs'], 6)
+
+    def test_profiling_seasonal_interpolation(self):
+        """
+        Positive test
+
+        data: Correct series (airgap)
+
+        Checks that the report records each step of the seasonal
+        interpolation on all rows of the series.
+        """
+        # 1. Arrange
+        ts = generate_ts_airgap()
+        # 2. Act
+        with profiling() as report:
+            seasonal_interpolation(ts)
+        # 3. Assert
+        summary = report.summary()
+        for step in ['interpolate', 'decompose', 'reinterpolate']:
+            self.assertEqual(
+                summary.loc['seasonal_interpolation.' + step, 'rows'],
+                len(ts))
+
+    def test_profiling_nested_stages(self):
+        """
+        Positive test
+
+        Stage 'inner' allocates 8 MB inside stage 'outer'.
+
+        Checks that the inner stage is recorded with the outer one as its
+        parent, and that the peak memory of both stages includes the 8 MB.
+        """
+        # 1. Arrange
+        size = 2 ** 20
+        # 2. Act
+        with profiling() as report:
+            with stage('outer'):
+                with stage('inner', rows=size):
+                    values = np.ones(size)
+                    del values
+        # 3. Assert
+        records = {record['stage']: record for record in report.to_records()}
+        self.assertEqual(records['inner']['parent'], 'outer')
+        self.assertIsNone(records['outer']['parent'])
+        self.assertEqual(records['inner']['rows'], size)
+        self.assertGreaterEqual(records['inner']['peak_memory'], 8 * size)
+        self.assertGreaterEqual(records['outer']['peak_memory'], 8 * size)
+        self.assertLess(records['inner']['memory_delta'], 8 * size)
+
+    def test_profiling_without_memory(self):
+        """
+        Positive test
+
+        memory: False
+
+        Checks that the stages are recorded without their memory.
+        """
+        # 1. Arrange
+        df = generate_df_sales()
+        # 2. Act
+        with profiling(memory=False) as report:
+            linear_regression(df, 'sales', ['advertising', 'year'])
+        # 3. Assert
+        frame = report.to_frame()
+        self.assertGreater(len(frame), 0)
+        self.assertTrue(frame['peak_memory'].isna().all())
+
+    def test_no_profiling(self):
+        """
+        Positive test
+
+        Checks that the stages run outside of a profiling block are not
+        recorded.
+        """
+        # 1. Arrange
+        df = generate_df_sales()
+        with profiling() as report:
+            pass
+        # 2. Act
+        linear_regression(df, 'sales', ['advertising', 'year'])
+        # 3. Assert
+        self.assertEqual(report.to_records(), [])
+
+    # Negative tests ----------------------------------------------------------
+
+    def test_nested_profiling(self):
+        """
+        Negative test
+
+        Checks that opening a profiling block inside another one raises a
+        RuntimeError.
+        """
+        # 1. Arrange
+        with profiling():
+            # 2. Act & 3. Assert
+            with self.assertRaises(RuntimeError):
+                with profiling():
+                    pass
@@ -0,0 +1,147 @@
+import unittest
+
+from imputena import MeanState, ModeState, QuantileSketch
+
+from test.example_data import *
+
+
+class TestPartialStatistics(unittest.TestCase):
+
+    # Positive tests ----------------------------------------------------------
+
+    def test_PS_mean_partitions(self):
+        """
+        Positive test
+
+        data: Dataframe with 10000 random values
+        partitions: 1, 7 and 100 chunks
+
+        Checks that the merged means are equal whatever the partition and
+        equal to the means of the whole data up to rounding.
+        """
+        # 1. Arrange
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame(
+            {'x': rng.normal(size=10000) * 1e6, 'y': rng.random(10000)})
+        df.loc[rng.random(10000) < 0.1, 'x'] = np.nan
+        # 2. Act
+        results = []
+        for n_parts in [1, 7, 100]:
+            state = MeanState()
+            for part in np.array_split(df, n_parts):
+                state.merge(MeanState().update(part))
+            results.append(state.result())
+        # 3. Assert
+        for result in results[1:]:
+            pd.testing.assert_series_equal(result, results[0], rtol=0)
+        pd.testing.assert_series_equal(results[0], df.mean(), rtol=1e-12)
+
+    def test_PS_mode_partitions(self):
+        """
+        Positive test
+
+        data: Correct dataframe (breast cancer)
+        partitions: 1 and 4 chunks
+
+        Checks that the merged most frequent values are equal whatever the
+        partition and equal to the first row of data.mode().
+        """
+        # 1. Arrange
+        df = generate_df_breast_cancer()
+        # 2. Act
+        state = ModeState().update(df)
+        state2 = ModeState()
+        for part in np.array_split(df, 4):
+            state2.merge(ModeState().update(part))
+        # 3. Assert
+        for column in df.columns:
+            self.assertEqual(state.result()[column], state2.result()[column])
+            self.assertEqual(
+                state.result()[column], df[column].mode().iloc[0])
+
+    def test_PS_sketch_error_bound(self):
+        """
+        Positive test
+
+        data: Series with 10001 random values of both signs
+        relative_accuracy: 0.01
+
+        Checks that the medians estimated from sketches of different
+        partitions are equal and that their relative error is at most 1%.
+        """
+        # 1. Arrange
+        rng = np.random.default_rng(1)
+        ser = pd.Series(rng.normal(loc=3, size=10001), name='x')
+        # 2. Act
+        sketch = QuantileSketch().update(ser)
+        sketch2 = QuantileSketch()
+        for part in np.array_split(ser, 9):
+            sketch2.merge(QuantileSketch().update(part))
+        # 3. Assert
+        median = ser.median()
+        self.assertEqual(sketch.result()['x'], sketch2.result()['x'])
+        self.assertLessEqual(
+            abs(sketch.result()['x'] - median), 0.01 * abs(median))
+
+    def test_PS_sketch_empty_column(self):
+        """
+        Positive test
+
+        data: Correct dataframe (divcols)
+
+        Checks that the median of the column without values is NA and that
+        the median of a column without missing values is within 1%.
+        """
+        # 1. Arrange
+        df = generate_example_df_divcols()
+        # 2. Act
+        medians = QuantileSketch().update(df).result()
+        # 3. Assert
+        self.assertTrue(np.isnan(medians['c']))
+        self.assertLessEqual(
+            abs(medians['d'] - df['d'].median()), 0.01 * df['d'].median())
+
+    # Negative tests ----------------------------------------------------------
+
+    def test_PS_sketch_wrong_accuracy(self):
+        """
+        Negative test
+
+        relative_accuracy: 1.5 (not a valid value)
+
+        Checks that the sketch raises a ValueError if the relative accuracy
+        is not between 0 and 1.
+        """
+        # 2. Act & 3. Assert
+        with self.assertRaises(ValueError):
+            QuantileSketch(relative_accuracy=1.5)
+
+    def test_PS_sketch_merge_different_accuracy(self):
+        """
+        Negative test
+
+        sketches: Two sketches with relative accuracies 0.01 and 0.02
+
+        Checks that merging sketches with different accuracies raises a
+        ValueError.
+        """
+        # 1. Arrange
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        sketch2 = QuantileSketch(relative_accuracy=0.02)
+        # 2. Act & 3. Assert
+        with self.assertRaises(ValueError):
+            sketch.merge(sketch2)
+
+    def test_PS_wrong_type(self):
+        """
+        Negative test
+
+        data: array (unsupported type)
+
+        Checks that updating a state with an array raises a TypeError.
+        """
+        # 1. Arrange
+        data = [2, 4, np.nan, 1]
+        # 2. Act & 3. Assert
+        with self.assertRaises(TypeError):
+            MeanState().update(data)